@@ -0,0 +1,83 @@
+"""
+GET conditionnels (ETag / Last-Modified) pour les vues DRF
+
+Chaque vue décorée fournit une fonction de version peu coûteuse (une requête
+d'agrégat sur des colonnes updated_at, ou des générations lues dans le cache). Si le client renvoie l'ETag ou la
+date reçus et que la version n'a pas changé, la réponse est un 304 vide :
+le queryset de la page et le serializer ne sont pas exécutés.
+
+    @conditional_get(lambda view, request, *args, **kwargs: (version, last_modified))
+    def retrieve(self, request, *args, **kwargs):
+        ...
+
+L'ETag dépend de l'URL complète (pagination, filtres) et de l'utilisateur :
+les listes dépendent du rôle. If-Modified-Since n'est utilisé qu'en l'absence
+de If-None-Match, et seulement pour une ressource unique (last_modified=True) :
+pour une liste, une suppression ne change pas le max(updated_at), seul l'ETag
+(qui compte aussi les lignes) la détecte.
+"""
+import functools
+import hashlib
+
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def make_etag(request, version):
+    """ETag faible : empreinte de l'URL, de l'utilisateur et de la version"""
+    key = f'{request.get_full_path()}|{getattr(request.user, "pk", "")}|{version!r}'
+    return f'W/"{hashlib.sha1(key.encode()).hexdigest()[:32]}"'
+
+
+def not_modified(request, etag, last_modified):
+    """
+    Vrai si la copie du client est à jour (RFC 9110, section 13.2.2)
+
+    Args:
+        etag: L'ETag courant
+        last_modified: La date de dernière modification (datetime) ou None
+    """
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        # Comparaison faible : W/"x" et "x" désignent la même version
+        tags = {tag.removeprefix('W/') for tag in parse_etags(if_none_match)}
+        return '*' in tags or etag.removeprefix('W/') in tags
+    if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    if if_modified_since is not None and last_modified is not None:
+        return int(last_modified.timestamp()) <= if_modified_since
+    return False
+
+
+def conditional_get(version_func, last_modified=False):
+    """
+    Décorateur d'action DRF (GET) : ETag, Last-Modified et 304
+
+    Args:
+        version_func: (view, request, *args, **kwargs) -> (version, datetime ou None)
+        last_modified: Accepter If-Modified-Since (ressource unique uniquement)
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            version, modified = version_func(view, request, *args, **kwargs)
+            etag = make_etag(request, version)
+
+            # Ressource introuvable (version None) : la vue répond elle-même (404)
+            if version is not None and not_modified(request, etag, modified if last_modified else None):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                response = method(view, request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+
+            response['ETag'] = etag
+            if modified is not None:
+                response['Last-Modified'] = http_date(modified.timestamp())
+            # Revalidation à chaque lecture, réponses propres à l'utilisateur
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ['Authorization'])
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,297 @@
+"""
+Métriques au format texte Prometheus (GET /metrics)
+
+Le registre tient des compteurs et des histogrammes étiquetés par action
+('tournaments-list', 'join-requests-accept', 'matches-my'...) :
+    - http_requests_total{action, method, status}
+    - http_request_duration_seconds{action} (histogramme)
+    - http_request_db_queries{action} (histogramme du nombre de requêtes SQL)
+    - http_request_db_seconds_total{action}
+    - http_response_bytes_total{action}
+et, lus au moment de l'export, les compteurs des caches :
+    - clerk_token_cache_hits_total / _misses_total (tokens déjà vérifiés)
+    - response_cache_hits_total{endpoint} / _misses_total (tournaments/cache.py)
+
+Les valeurs sont rangées par thread (threading.local) : un incrément ne
+prend aucun verrou, l'export additionne les threads. Les valeurs d'un
+thread terminé sont reportées dans un total commun : le nombre de dicts
+suit le nombre de threads vivants, pas le nombre de threads créés.
+
+Plusieurs processus (gunicorn) : avec METRICS_DIR, chaque processus écrit
+son état dans METRICS_DIR/<pid>.json (au plus toutes les
+METRICS_FLUSH_INTERVAL secondes, écriture atomique) et /metrics additionne
+tous les fichiers. Les fichiers des processus arrêtés restent comptés (les
+compteurs ne reculent pas) : vider le dossier au démarrage du service.
+"""
+import hmac
+import json
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+COUNTER = 'counter'
+HISTOGRAM = 'histogram'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+
+class Metric:
+    """Un compteur ou un histogramme déclaré dans le registre"""
+
+    def __init__(self, registry, kind, name, documentation, labelnames, buckets=()):
+        self.registry = registry
+        self.kind = kind
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+
+    def _labels(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def inc(self, amount=1, **labels):
+        self.registry._add((self.name, self._labels(labels)), amount)
+
+    def observe(self, value, **labels):
+        """Histogramme : compte l'observation dans son premier seau (cumulé à l'export)"""
+        key = self._labels(labels)
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        self.registry._add((f'{self.name}_bucket', key + (index,)), 1)
+        self.registry._add((f'{self.name}_sum', key), value)
+        self.registry._add((f'{self.name}_count', key), 1)
+
+
+class MetricsRegistry:
+    """
+    Registre de métriques d'un processus
+
+    Chaque thread incrémente son propre dict ; seule la création d'un dict
+    (première métrique d'un thread) prend le verrou, et reporte alors dans
+    _retired les dicts des threads terminés.
+    """
+
+    def __init__(self):
+        self.metrics = {}
+        self.collectors = []
+        self._shards = []  # (thread, dict de ses valeurs)
+        self._retired = {}  # valeurs des threads terminés
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flushed_at = 0.0
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._declare(Metric(self, COUNTER, name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._declare(Metric(self, HISTOGRAM, name, documentation, labelnames, buckets))
+
+    def _declare(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def collector(self, func):
+        """Décorateur : func() -> [(metric, labels dict, valeur)] lu à chaque export"""
+        self.collectors.append(func)
+        return func
+
+    def _add(self, key, amount):
+        shard = getattr(self._local, 'values', None)
+        if shard is None:
+            shard = self._local.values = {}
+            with self._lock:
+                self._retire_finished_threads()
+                self._shards.append((threading.current_thread(), shard))
+        shard[key] = shard.get(key, 0) + amount
+
+    def _retire_finished_threads(self):
+        """Reporte les valeurs des threads terminés dans _retired (verrou tenu)"""
+        alive = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                alive.append((thread, shard))
+                continue
+            for key, amount in shard.items():
+                self._retired[key] = self._retired.get(key, 0) + amount
+        self._shards = alive
+
+    def reset(self):
+        """Remet toutes les valeurs à zéro (tests)"""
+        with self._lock:
+            self._retired.clear()
+            for _, shard in self._shards:
+                shard.clear()
+
+    def snapshot(self):
+        """
+        Valeurs du processus : les threads additionnés, puis les collecteurs
+
+        Returns:
+            dict: {(nom, valeurs des étiquettes): valeur}
+        """
+        with self._lock:
+            shards = [self._retired.copy()] + [shard.copy() for _, shard in self._shards]
+        values = {}
+        for shard in shards:
+            for key, amount in shard.items():
+                values[key] = values.get(key, 0) + amount
+        for collect in self.collectors:
+            for metric, labels, amount in collect():
+                key = (metric.name, metric._labels(labels))
+                values[key] = values.get(key, 0) + amount
+        return values
+
+    # --- Multi-processus (METRICS_DIR) ---
+
+    def _path(self, directory, pid=None):
+        return os.path.join(directory, f'{pid or os.getpid()}.json')
+
+    def flush(self, force=False):
+        """Écrit l'état du processus dans METRICS_DIR (au plus toutes les METRICS_FLUSH_INTERVAL s)"""
+        directory = settings.METRICS_DIR
+        if not directory:
+            return
+        now = time.monotonic()
+        if not force and now - self._flushed_at < settings.METRICS_FLUSH_INTERVAL:
+            return
+        if not self._flush_lock.acquire(blocking=force):
+            return  # un autre thread écrit déjà
+        try:
+            self._flushed_at = now
+            rows = [[name, list(labels), amount] for (name, labels), amount in self.snapshot().items()]
+            path = self._path(directory)
+            with open(f'{path}.tmp', 'w') as f:
+                json.dump(rows, f)
+            os.replace(f'{path}.tmp', path)
+        finally:
+            self._flush_lock.release()
+
+    def aggregate(self):
+        """Valeurs de tous les processus (METRICS_DIR), ou du seul processus courant"""
+        directory = settings.METRICS_DIR
+        if not directory:
+            return self.snapshot()
+        self.flush(force=True)
+        values = {}
+        for filename in os.listdir(directory):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(directory, filename)) as f:
+                    rows = json.load(f)
+            except (OSError, ValueError):
+                continue  # fichier en cours de remplacement
+            for name, labels, amount in rows:
+                key = (name, tuple(labels))
+                values[key] = values.get(key, 0) + amount
+        return values
+
+    # --- Format texte ---
+
+    def render(self):
+        """Toutes les métriques au format d'exposition texte Prometheus"""
+        values = self.aggregate()
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            if metric.kind == COUNTER:
+                for (name, labels), amount in sorted(values.items()):
+                    if name == metric.name:
+                        lines.append(_sample(name, metric.labelnames, labels, amount))
+            else:
+                lines.extend(self._render_histogram(metric, values))
+        return '\n'.join(lines) + '\n'
+
+    def _render_histogram(self, metric, values):
+        series = sorted(labels for name, labels in values if name == f'{metric.name}_count')
+        for labels in series:
+            cumulative = 0
+            for index, bound in enumerate(metric.buckets + (float('inf'),)):
+                cumulative += values.get((f'{metric.name}_bucket', labels + (index,)), 0)
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                yield _sample(f'{metric.name}_bucket', metric.labelnames + ('le',), labels + (le,), cumulative)
+            yield _sample(f'{metric.name}_sum', metric.labelnames, labels, values[(f'{metric.name}_sum', labels)])
+            yield _sample(f'{metric.name}_count', metric.labelnames, labels, values[(f'{metric.name}_count', labels)])
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _sample(name, labelnames, labels, amount):
+    if labelnames:
+        pairs = ','.join(f'{label}="{_escape(value)}"' for label, value in zip(labelnames, labels))
+        name = f'{name}{{{pairs}}}'
+    return f'{name} {amount:g}' if isinstance(amount, float) else f'{name} {amount}'
+
+
+registry = MetricsRegistry()
+
+REQUESTS = registry.counter('http_requests_total', 'Requêtes HTTP', ['action', 'method', 'status'])
+LATENCY = registry.histogram('http_request_duration_seconds', 'Durée des requêtes HTTP', ['action'])
+DB_QUERIES = registry.histogram('http_request_db_queries', 'Requêtes SQL par requête HTTP', ['action'],
+                                buckets=QUERY_BUCKETS)
+DB_SECONDS = registry.counter('http_request_db_seconds_total', 'Temps passé en SQL', ['action'])
+RESPONSE_BYTES = registry.counter('http_response_bytes_total', 'Taille des réponses', ['action'])
+TOKEN_CACHE_HITS = registry.counter('clerk_token_cache_hits_total', 'Tokens Clerk servis par le cache')
+TOKEN_CACHE_MISSES = registry.counter('clerk_token_cache_misses_total', 'Tokens Clerk vérifiés')
+RESPONSE_CACHE_HITS = registry.counter('response_cache_hits_total', 'Réponses servies par le cache', ['endpoint'])
+RESPONSE_CACHE_MISSES = registry.counter('response_cache_misses_total', 'Réponses calculées', ['endpoint'])
+
+
+@registry.collector
+def cache_counters():
+    """Compteurs des caches, tenus par les caches eux-mêmes"""
+    from clerk_auth.utils import token_cache
+    from tournaments.cache import response_cache
+
+    token_stats = token_cache.stats()
+    samples = [
+        (TOKEN_CACHE_HITS, {}, token_stats['hits']),
+        (TOKEN_CACHE_MISSES, {}, token_stats['misses']),
+    ]
+    for endpoint, stats in response_cache.stats().items():
+        samples.append((RESPONSE_CACHE_HITS, {'endpoint': endpoint}, stats['hits']))
+        samples.append((RESPONSE_CACHE_MISSES, {'endpoint': endpoint}, stats['misses']))
+    return samples
+
+
+def observe_request(action, method, status, seconds, queries, db_seconds, response_bytes):
+    """Enregistre une requête HTTP terminée (RequestMonitoringMiddleware)"""
+    REQUESTS.inc(action=action, method=method, status=status)
+    LATENCY.observe(seconds, action=action)
+    DB_QUERIES.observe(queries, action=action)
+    DB_SECONDS.inc(db_seconds, action=action)
+    RESPONSE_BYTES.inc(response_bytes, action=action)
+    registry.flush()
+
+
+def operator_allowed(presented):
+    """
+    Accès aux outils d'exploitation (/metrics, profils) : le jeton présenté
+    est METRICS_TOKEN ; sans jeton configuré, DEBUG uniquement
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        return settings.DEBUG
+    return hmac.compare_digest((presented or '').encode(), token.encode())
+
+
+def bearer_token(request):
+    """Le jeton de l'en-tête Authorization: Bearer, ou None"""
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    return token if scheme == 'Bearer' else None
+
+
+def metrics_view(request):
+    """GET /metrics : protégé par METRICS_TOKEN (Authorization: Bearer) ; sans jeton, DEBUG uniquement"""
+    if not operator_allowed(bearer_token(request)):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,184 @@
+"""
+Instrumentation des requêtes : en-tête Server-Timing et journal des lenteurs
+
+RequestMonitoringMiddleware mesure chaque requête :
+    - db : requêtes SQL (nombre et durée), via connection.execute_wrapper()
+    - auth : vérification du token Clerk et chargement de l'utilisateur
+      (resolve_clerk_principal, SQL compris)
+    - app : le reste, hors SQL et hors authentification (middlewares,
+      permissions, code de la vue, sérialiseurs, pagination, rendu JSON)
+    - total : la requête entière
+
+Les mesures sont renvoyées dans l'en-tête Server-Timing (visible dans les
+outils de développement du navigateur) si SERVER_TIMING est vrai.
+
+Une requête plus longue que SLOW_REQUEST_MS, ou qui contient une requête SQL
+plus longue que SLOW_QUERY_MS, est écrite dans le logger
+'TeamSportFinder.slow' : une ligne JSON avec l'action (ViewSet.action), les
+mesures et le SQL normalisé des requêtes lentes.
+
+Chaque requête est aussi comptée dans les métriques (TeamSportFinder/metrics.py).
+"""
+import json
+import logging
+import re
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+from TeamSportFinder.metrics import observe_request
+
+logger = logging.getLogger('TeamSportFinder.slow')
+
+# Valeurs littérales du SQL brut et listes de paramètres (IN, VALUES)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'(?<![\w."])-?\d+(?:\.\d+)?\b')
+_PLACEHOLDERS = re.compile(r'%s(?:\s*,\s*%s)+')
+_ROWS = re.compile(r'\(\?\)(?:\s*,\s*\(\?\))+')
+_SPACES = re.compile(r'\s+')
+
+
+def normalize_sql(sql):
+    """
+    SQL sans valeurs : les requêtes de même forme ont le même texte
+
+    normalize_sql("SELECT * FROM t WHERE id IN (%s, %s) AND n > 3")
+    -> "SELECT * FROM t WHERE id IN (?) AND n > ?"
+    """
+    sql = _STRING.sub('?', sql)
+    sql = _PLACEHOLDERS.sub('?', sql).replace('%s', '?')
+    sql = _NUMBER.sub('?', sql)
+    sql = _ROWS.sub('(?)', sql)
+    return _SPACES.sub(' ', sql).strip()
+
+
+class RequestMetrics:
+    """Mesures d'une requête HTTP (durées en millisecondes)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.action = None
+        self.route = 'unmatched'
+        self.queries = 0
+        self.db_ms = 0.0
+        self.auth_ms = 0.0
+        self.auth_db_ms = 0.0
+        self.total_ms = 0.0
+        self.slow_queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        """execute_wrapper : compte et chronomètre chaque requête SQL"""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.queries += 1
+            self.db_ms += elapsed
+            if elapsed >= settings.SLOW_QUERY_MS:
+                self.slow_queries.append({'sql': normalize_sql(sql), 'ms': round(elapsed, 2)})
+
+    @property
+    def app_ms(self):
+        # Tout ce qui n'est ni SQL ni authentification ; le SQL de
+        # l'authentification est compté dans auth et dans db
+        return max(self.total_ms - self.db_ms - (self.auth_ms - self.auth_db_ms), 0.0)
+
+    def server_timing(self):
+        """Valeur de l'en-tête Server-Timing"""
+        return ', '.join([
+            f'db;dur={self.db_ms:.1f};desc="{self.queries} SQL"',
+            f'auth;dur={self.auth_ms:.1f}',
+            f'app;dur={self.app_ms:.1f}',
+            f'total;dur={self.total_ms:.1f}',
+        ])
+
+    def as_dict(self, request, response):
+        return {
+            'method': request.method,
+            'path': request.path,
+            'action': self.action,
+            'status': response.status_code,
+            'total_ms': round(self.total_ms, 2),
+            'db_ms': round(self.db_ms, 2),
+            'queries': self.queries,
+            'auth_ms': round(self.auth_ms, 2),
+            'app_ms': round(self.app_ms, 2),
+            'slow_queries': self.slow_queries,
+        }
+
+
+def request_metrics(request):
+    """Les mesures de la requête Django, ou None hors du middleware"""
+    return getattr(request, '_metrics', None)
+
+
+@contextmanager
+def timed_auth(request):
+    """Ajoute la durée du bloc (et de son SQL) à la mesure auth de la requête"""
+    metrics = request_metrics(request)
+    if metrics is None:
+        yield
+        return
+    start, db_start = time.perf_counter(), metrics.db_ms
+    try:
+        yield
+    finally:
+        metrics.auth_ms += (time.perf_counter() - start) * 1000
+        metrics.auth_db_ms += metrics.db_ms - db_start
+
+
+def view_action_name(view_func, method):
+    """'TournamentViewSet.list', 'MatchViewSet.my' ou le nom de la fonction vue"""
+    cls = getattr(view_func, 'cls', None)
+    if cls is None:
+        return getattr(view_func, '__name__', None)
+    actions = getattr(view_func, 'actions', None) or {}
+    return f'{cls.__name__}.{actions.get(method.lower(), method.lower())}'
+
+
+def route_name(view_func, method):
+    """Étiquette des métriques : basename du router et action ('tournaments-list', 'matches-my')"""
+    basename = (getattr(view_func, 'initkwargs', None) or {}).get('basename')
+    actions = getattr(view_func, 'actions', None) or {}
+    if basename is None or method.lower() not in actions:
+        return getattr(view_func, '__name__', 'unknown')
+    return f"{basename}-{actions[method.lower()].replace('_', '-')}"
+
+
+class RequestMonitoringMiddleware:
+    """
+    Mesure chaque requête (en premier dans MIDDLEWARE : l'authentification
+    Clerk et tous les autres middlewares sont inclus)
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = request._metrics = RequestMetrics()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(metrics))
+            response = self.get_response(request)
+        metrics.total_ms = (time.perf_counter() - metrics.started) * 1000
+
+        if settings.SERVER_TIMING:
+            response['Server-Timing'] = metrics.server_timing()
+        if metrics.total_ms >= settings.SLOW_REQUEST_MS or metrics.slow_queries:
+            logger.warning(json.dumps(metrics.as_dict(request, response), default=str))
+        observe_request(
+            metrics.route, request.method, response.status_code, metrics.total_ms / 1000,
+            metrics.queries, metrics.db_ms / 1000,
+            0 if response.streaming else len(response.content),
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = request_metrics(request)
+        if metrics is not None:
+            metrics.action = view_action_name(view_func, request.method)
+            metrics.route = route_name(view_func, request.method)
+        return None
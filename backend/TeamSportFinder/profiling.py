@@ -0,0 +1,170 @@
+"""
+Profilage à la demande d'une requête (PROFILING_ENABLED, DEBUG par défaut)
+
+    X-Profile: 1 (ou ?profile=1)            cProfile -> <id>.prof
+        (pstats, snakeviz, python manage.py profile_endpoint)
+    X-Profile: sample (ou ?profile=sample)  échantillonnage des piles -> <id>.collapsed
+        (format « collapsed » de flamegraph.pl, speedscope)
+
+La réponse indique X-Profile-Id et X-Profile-Url ; le fichier se télécharge
+sur GET /profiles/<fichier>. Seuls les PROFILE_KEEP derniers fichiers sont
+gardés dans PROFILE_DIR.
+
+Accès comme /metrics (metrics.operator_allowed) : la requête profilée et le
+téléchargement présentent METRICS_TOKEN dans X-Profile-Token (Authorization
+reste le token Clerk de l'utilisateur) ; sans METRICS_TOKEN, DEBUG uniquement. Une
+demande de profil sans jeton valide est servie sans profil.
+
+ProfilingMiddleware est le premier middleware : le profil couvre tous les
+middlewares, l'authentification, la vue, l'ORM et les serializers.
+"""
+import cProfile
+import functools
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponseForbidden
+
+from TeamSportFinder.metrics import operator_allowed
+
+CPROFILE = 'prof'
+SAMPLE = 'collapsed'
+
+MODES = {'1': CPROFILE, 'true': CPROFILE, 'cprofile': CPROFILE, 'sample': SAMPLE}
+FILENAME = re.compile(r'^[0-9a-f]{32}\.(prof|collapsed)$')
+
+
+def requested_mode(request):
+    """CPROFILE, SAMPLE ou None (profilage désactivé ou non demandé)"""
+    if not settings.PROFILING_ENABLED:
+        return None
+    value = request.headers.get('X-Profile') or request.GET.get('profile') or ''
+    mode = MODES.get(value.strip().lower())
+    if mode is None or not operator_allowed(request.headers.get('X-Profile-Token')):
+        return None
+    return mode
+
+
+@functools.lru_cache(maxsize=None)
+def _path_prefixes():
+    return sorted({str(settings.BASE_DIR), *(path for path in sys.path if path)}, key=len, reverse=True)
+
+
+@functools.lru_cache(maxsize=4096)
+def frame_label(code):
+    """'fonction (chemin:ligne)' sans ';' (séparateur du format collapsed)"""
+    path = code.co_filename
+    for prefix in _path_prefixes():
+        if path.startswith(prefix + os.sep):
+            path = path[len(prefix) + 1:]
+            break
+    return f'{code.co_name} ({path}:{code.co_firstlineno})'.replace(';', ',')
+
+
+class StackSampler:
+    """
+    Échantillonne la pile d'un thread toutes les PROFILE_SAMPLE_INTERVAL secondes
+
+    Le coût ne dépend pas du nombre d'appels (contrairement à cProfile) :
+    les durées relatives restent fidèles pour le code très appelé (ORM, serializers).
+    """
+
+    def __init__(self, thread_id=None, interval=None):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval or settings.PROFILE_SAMPLE_INTERVAL
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path):
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f'{stack} {count}\n')
+
+
+def profile_path(filename):
+    return os.path.join(settings.PROFILE_DIR, filename)
+
+
+def prune_profiles():
+    """Garde les PROFILE_KEEP fichiers les plus récents"""
+    directory = settings.PROFILE_DIR
+    files = sorted(
+        (entry for entry in os.scandir(directory) if FILENAME.match(entry.name)),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True,
+    )
+    for entry in files[settings.PROFILE_KEEP:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+class ProfilingMiddleware:
+    """Profile la requête si elle le demande (voir le docstring du module)"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = requested_mode(request)
+        if mode is None:
+            return self.get_response(request)
+
+        os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+        filename = f'{uuid.uuid4().hex}.{mode}'
+        started = time.perf_counter()
+        if mode == CPROFILE:
+            profiler = cProfile.Profile()
+            response = profiler.runcall(self.get_response, request)
+            profiler.dump_stats(profile_path(filename))
+        else:
+            with StackSampler() as sampler:
+                response = self.get_response(request)
+            sampler.write(profile_path(filename))
+        prune_profiles()
+
+        response['X-Profile-Id'] = filename.split('.')[0]
+        response['X-Profile-Url'] = f'/profiles/{filename}'
+        response['X-Profile-Duration'] = f'{(time.perf_counter() - started) * 1000:.1f}'
+        return response
+
+
+def profile_download(request, filename):
+    """
+    GET /profiles/<fichier> : un profil enregistré (PROFILING_ENABLED uniquement,
+    jeton dans X-Profile-Token)
+    """
+    if not settings.PROFILING_ENABLED or not FILENAME.match(filename):
+        raise Http404
+    if not operator_allowed(request.headers.get('X-Profile-Token')):
+        return HttpResponseForbidden()
+    try:
+        return FileResponse(open(profile_path(filename), 'rb'), as_attachment=True, filename=filename)
+    except FileNotFoundError:
+        raise Http404
@@ -0,0 +1,64 @@
+"""
+Rendu et lecture JSON rapides (orjson), avec repli sur la bibliothèque standard
+
+FastJSONRenderer et FastJSONParser sont les classes par défaut de
+REST_FRAMEWORK. orjson encode nativement les dict (ReturnDict compris),
+UUID, datetime, date et time ; les autres types (Decimal, timedelta, lazy
+strings, QuerySet...) passent par le JSONEncoder de DRF. Sans orjson, ou
+si la requête demande une indentation (Accept: application/json; indent=4),
+ce sont les classes de DRF qui s'exécutent.
+
+Différences avec le JSONRenderer de DRF, pour les valeurs brutes (pas celles
+des serializers, déjà converties en texte) :
+    - datetime : microsecondes gardées (comme DateTimeField), UTC en 'Z'
+    - NaN et Infinity deviennent null au lieu d'une erreur
+
+Comparaison sur les listes : python manage.py benchmark_json
+"""
+import codecs
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    orjson = None
+
+# Échappés par DRF : valides en JSON mais pas dans du JavaScript
+_LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer encodé par orjson (même sortie compacte en UTF-8)"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (orjson is None or self.ensure_ascii or not self.compact
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        content = orjson.dumps(data, default=self.encoder_class().default,
+                               option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+        for separator, escaped in _LINE_SEPARATORS:
+            if separator in content:
+                content = content.replace(separator, escaped)
+        return content
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser décodé par orjson (UTF-8 ; NaN et Infinity refusés comme chez DRF)"""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
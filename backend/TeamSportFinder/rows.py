@@ -0,0 +1,208 @@
+"""
+Listes en lecture seule construites depuis values() au lieu d'instances
+
+Un serializer de liste (ModelSerializer) crée une instance par ligne puis
+passe chaque champ par get_attribute, SerializerMethodField compris. Le
+plan d'un serializer (row_plan) est calculé une fois par classe : pour
+chaque champ, la colonne de values() à lire et la conversion à appliquer
+(to_representation du champ DRF, donc le même JSON).
+
+Les champs sont déduits de leur source ('team_a.name' -> 'team_a__name') ;
+les SerializerMethodField et les propriétés du modèle sont décrits par le
+serializer dans values_fields :
+
+    values_fields = {
+        'organizer_name': 'organizer__full_name',            # colonne
+        'tournament_id': Column('tournament_id', str),       # colonne + conversion
+        'distance_km': Column('distance_km', optional=True), # annotation absente -> None
+        'is_full': lambda row: row['current_capacity'] >= row['max_capacity'],
+    }
+
+Une fonction reçoit la ligne values() : elle ne lit que des colonnes du plan.
+
+Les vues choisissent les actions servies ainsi avec ValuesRowsMixin.
+Comparaison avec les serializers : python manage.py benchmark_serializers
+"""
+import functools
+
+from django.db.models import QuerySet
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+
+class Column:
+    """
+    Colonne de values() d'un champ et sa conversion (appliquée aux valeurs non nulles)
+
+    Sans convert, la conversion est celle du champ DRF (field) s'il est donné.
+    """
+
+    def __init__(self, lookup, convert=None, optional=False, field=None):
+        self.lookup = lookup
+        self.convert = convert
+        self.optional = optional
+        self.field = field
+
+    def converter(self):
+        if self.convert is not None or self.field is None:
+            return self.convert
+        if isinstance(self.field, serializers.DateTimeField):
+            return _datetime_converter(self.field)
+        return self.field.to_representation
+
+
+def _datetime_converter(field):
+    """
+    DateTimeField.to_representation avec le fuseau lu une fois par liste
+    (et non à chaque ligne) ; les autres cas passent par le champ
+    """
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if isinstance(value, str) or value.utcoffset() is None:
+            return field.to_representation(value)
+        try:
+            value = value.astimezone(field_timezone).isoformat()
+        except OverflowError:
+            return field.to_representation(value)
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+
+
+def _column_getter(lookup, convert):
+    if convert is None:
+        return lambda row: row[lookup]
+
+    def get(row):
+        value = row[lookup]
+        return None if value is None else convert(value)
+    return get
+
+
+def _missing(row):
+    return None
+
+
+class _Computed:
+    """Champ calculé sur la ligne, converti par le champ DRF (propriété du modèle)"""
+
+    def __init__(self, func, field):
+        convert = None if isinstance(field, serializers.SerializerMethodField) else field.to_representation
+
+        def get(row):
+            value = func(row)
+            return None if value is None or convert is None else convert(value)
+        self.get = get
+
+
+class RowPlan:
+    """
+    Plan précompilé d'un serializer de liste
+
+    Args:
+        serializer_class: serializer dont la sortie est reproduite
+            (ses values_fields complètent les champs déduits)
+    """
+
+    def __init__(self, serializer_class):
+        fields = serializer_class().fields
+        overrides = getattr(serializer_class, 'values_fields', {})
+        self.fields = []  # (nom, Column ou _Computed)
+        for name, field in fields.items():
+            spec = overrides.get(name)
+            if spec is None:
+                if isinstance(field, serializers.SerializerMethodField) or not field.source_attrs:
+                    raise ValueError(f"{serializer_class.__name__}.{name} : à décrire dans values_fields")
+                spec = Column('__'.join(field.source_attrs), field=field)
+            elif isinstance(spec, str):
+                method_field = isinstance(field, serializers.SerializerMethodField)
+                spec = Column(spec, field=None if method_field else field)
+            elif callable(spec) and not isinstance(spec, Column):
+                spec = _Computed(spec, field)
+            self.fields.append((name, spec))
+
+    def values(self, queryset):
+        """
+        Le queryset réduit aux colonnes du plan (les annotations optionnelles
+        absentes du queryset ne sont pas demandées)
+
+        Returns:
+            QuerySet: lignes dict, même filtre et même ordre
+        """
+        annotations = queryset.query.annotations
+        lookups = [
+            spec.lookup for _, spec in self.fields
+            if isinstance(spec, Column) and (not spec.optional or spec.lookup in annotations)
+        ]
+        # Les jointures viennent des colonnes ; les préchargements ne servent pas
+        return queryset.prefetch_related(None).values(*dict.fromkeys(lookups))
+
+    def serialize(self, rows, queryset):
+        """
+        Args:
+            rows: lignes de self.values(queryset), éventuellement découpées (page)
+            queryset: queryset d'origine (ses annotations optionnelles)
+
+        Returns:
+            list: un dict par ligne, mêmes clés et valeurs que le serializer
+        """
+        annotations = queryset.query.annotations
+        getters = []
+        for name, spec in self.fields:
+            if isinstance(spec, _Computed):
+                getters.append((name, spec.get))
+            elif spec.optional and spec.lookup not in annotations:
+                getters.append((name, _missing))
+            else:
+                getters.append((name, _column_getter(spec.lookup, spec.converter())))
+        return [{name: get(row) for name, get in getters} for row in rows]
+
+
+@functools.lru_cache(maxsize=None)
+def row_plan(serializer_class):
+    """Plan d'un serializer, calculé une seule fois par classe"""
+    return RowPlan(serializer_class)
+
+
+class PlannedRows:
+    """Résultat de ValuesRowsMixin.get_serializer : seul .data est lu par les vues"""
+
+    def __init__(self, plan, rows, queryset):
+        self.plan = plan
+        self.rows = rows
+        self.queryset = queryset
+
+    @property
+    def data(self):
+        return self.plan.serialize(self.rows, self.queryset)
+
+
+class ValuesRowsMixin:
+    """
+    Sert les actions de values_row_actions depuis values() (voir le module)
+
+    La pagination découpe le queryset values() ; get_serializer(page, many=True)
+    retourne les lignes converties par le plan du serializer de l'action.
+    """
+    values_row_actions = ()
+
+    def uses_values_rows(self):
+        return self.action in self.values_row_actions
+
+    def paginate_queryset(self, queryset):
+        if not self.uses_values_rows():
+            return super().paginate_queryset(queryset)
+        self._values_queryset = queryset
+        return super().paginate_queryset(row_plan(self.get_serializer_class()).values(queryset))
+
+    def get_serializer(self, *args, **kwargs):
+        if not (kwargs.get('many') and self.uses_values_rows()):
+            return super().get_serializer(*args, **kwargs)
+        plan = row_plan(self.get_serializer_class())
+        rows = args[0] if args else kwargs['instance']
+        if isinstance(rows, QuerySet):  # liste non paginée
+            return PlannedRows(plan, plan.values(rows), rows)
+        return PlannedRows(plan, rows, self._values_queryset)
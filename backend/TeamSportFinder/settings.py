@@ -44,6 +44,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',  # Recherche full-text et trigrammes
     
     # Third party apps
     'rest_framework',   # Django REST Framework
@@ -66,6 +67,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'TeamSportFinder.profiling.ProfilingMiddleware',  # X-Profile (PROFILING_ENABLED) - avant tout le reste
+    'TeamSportFinder.monitoring.RequestMonitoringMiddleware',  # Server-Timing, journal des lenteurs - en premier
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',    # CORS - doit être en haut
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -168,10 +171,10 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'TeamSportFinder.renderers.FastJSONRenderer',  # orjson, repli sur json
     ],
     'DEFAULT_PARSER_CLASSES': [
-        'rest_framework.parsers.JSONParser',
+        'TeamSportFinder.renderers.FastJSONParser',
     ],
 }
 
@@ -209,8 +212,12 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
+    'x-profile',
 ]
 
+# En-têtes lisibles par le frontend (profilage à la demande)
+CORS_EXPOSE_HEADERS = ['x-profile-id', 'x-profile-url']
+
 # Permettre toutes les origines en développement (à restreindre en production)
 CORS_ALLOW_ALL_ORIGINS = DEBUG  # Seulement en mode DEBUG
 
@@ -224,6 +231,50 @@ CLERK_SECRET_KEY = os.getenv('CLERK_SECRET_KEY')
 CLERK_PUBLISHABLE_KEY = os.getenv('CLERK_PUBLISHABLE_KEY')
 CLERK_JWKS_URL = os.getenv('CLERK_JWKS_URL')
 
+# Vérification locale des signatures (clés JWKS gardées en mémoire)
+CLERK_JWKS_REFRESH_INTERVAL = int(os.getenv('CLERK_JWKS_REFRESH_INTERVAL', '3600'))  # secondes
+CLERK_JWKS_MIN_REFRESH_INTERVAL = int(os.getenv('CLERK_JWKS_MIN_REFRESH_INTERVAL', '30'))  # secondes
+CLERK_JWT_LEEWAY = int(os.getenv('CLERK_JWT_LEEWAY', '60'))  # tolérance sur 'exp' en secondes
+
+# Cache en mémoire des tokens déjà vérifiés (LRU + expiration au claim 'exp')
+CLERK_TOKEN_CACHE_SIZE = int(os.getenv('CLERK_TOKEN_CACHE_SIZE', '1024'))
+CLERK_TOKEN_CACHE_MAX_TTL = int(os.getenv('CLERK_TOKEN_CACHE_MAX_TTL', '300'))  # secondes
+
+# Cache partagé des utilisateurs résolus par clerk_id (voir CACHES)
+CLERK_USER_CACHE_TTL = int(os.getenv('CLERK_USER_CACHE_TTL', '300'))  # secondes
+
+# =============================================================================
+# CACHE CONFIGURATION
+# =============================================================================
+# Cache en mémoire locale par défaut, Redis (partagé entre les processus)
+# si REDIS_URL est définie
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'teamsportfinder',
+            'OPTIONS': {
+                'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', '10000')),
+            },
+        }
+    }
+
+# Réponses en cache de la liste et du détail des tournois (tournaments/cache.py).
+# Les générations vivent dans CACHES['default'] : avec la mémoire locale, une
+# écriture n'avance que celles de son processus. Activé par défaut avec Redis
+# seulement ; sans Redis, à n'activer qu'avec un seul processus.
+TOURNAMENT_CACHE_ENABLED = os.getenv('TOURNAMENT_CACHE_ENABLED', str(bool(REDIS_URL))) == 'True'
+TOURNAMENT_CACHE_TTL = int(os.getenv('TOURNAMENT_CACHE_TTL', '600'))  # secondes
+
 # =============================================================================
 # STRIPE CONFIGURATION
 # =============================================================================
@@ -231,6 +282,30 @@ STRIPE_SECRET_KEY = os.getenv('STRIPE_SECRET_KEY')
 STRIPE_PUBLISHABLE_KEY = os.getenv('STRIPE_PUBLISHABLE_KEY')
 STRIPE_WEBHOOK_SECRET = os.getenv('STRIPE_WEBHOOK_SECRET')
 
+# =============================================================================
+# MONITORING (TeamSportFinder/monitoring.py)
+# =============================================================================
+# En-tête Server-Timing (db, auth, serialize, total) sur chaque réponse (DEBUG par défaut :
+# les durées internes ne sont pas envoyées aux clients en production)
+SERVER_TIMING = os.getenv('SERVER_TIMING', str(DEBUG)) == 'True'
+
+# Seuils du journal des lenteurs (logger 'TeamSportFinder.slow')
+SLOW_REQUEST_MS = float(os.getenv('SLOW_REQUEST_MS', '500'))
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', '100'))
+
+# GET /metrics (TeamSportFinder/metrics.py) : jeton exigé (Authorization: Bearer) ; sans jeton, DEBUG uniquement
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+# Dossier partagé par les processus (gunicorn) ; vide = métriques du seul processus
+METRICS_DIR = os.getenv('METRICS_DIR')
+METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', '5'))  # secondes
+
+# Profilage à la demande (TeamSportFinder/profiling.py) : X-Profile: 1 ou sample,
+# avec METRICS_TOKEN dans X-Profile-Token ; sans jeton, DEBUG uniquement
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', str(DEBUG)) == 'True'
+PROFILE_DIR = os.getenv('PROFILE_DIR', str(BASE_DIR / 'profiles'))
+PROFILE_KEEP = int(os.getenv('PROFILE_KEEP', '50'))  # fichiers gardés
+PROFILE_SAMPLE_INTERVAL = float(os.getenv('PROFILE_SAMPLE_INTERVAL', '0.001'))  # secondes
+
 # =============================================================================
 # LOGGING (optionnel mais recommandé)
 # =============================================================================
@@ -252,6 +327,11 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        'TeamSportFinder.slow': {
+            'handlers': ['console'],
+            'level': os.getenv('SLOW_LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        },
     },
 }
 
@@ -265,11 +345,4 @@ LOGGING = {
 #     ],
 # }
 
-# Cache configuration (pour les JWKS)
-# CACHES = {
-#     'default': {
-#         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-#         'LOCATION': 'unique-snowflake',
-#     }
-# }
 # Configuration REST_FRAMEWORK déjà définie plus haut (ligne 150)
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""
+Outils de test partagés : jeu de données synthétique et budgets de requêtes SQL
+
+Chaque action d'API est appelée via le client de test sur un gros jeu de
+données ; on mesure le nombre de requêtes SQL, le temps et la taille de la
+réponse. Un budget fixe par action fait échouer les tests en cas de N+1.
+
+Variables d'environnement:
+    BENCH_SCALE: multiplie la taille du jeu de données (défaut: 1)
+    BENCH_REPORT: chemin d'un fichier JSON lines où ajouter les mesures
+                  ('-' pour afficher seulement le tableau récapitulatif)
+"""
+import json
+import os
+import sys
+import time
+
+import jwt
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import User
+from clerk_auth.utils import token_cache
+from matches.models import Match
+from players.recommendations import refresh_all
+from requestes.models import JoinRequest
+from tournaments.models import Team
+from tournaments.synthetic import SyntheticDataGenerator
+
+
+def make_token(clerk_id, lifetime=3600):
+    """Token JWT de développement (non signé côté serveur sans CLERK_JWKS_URL)"""
+    payload = {'sub': clerk_id, 'exp': int(time.time()) + lifetime}
+    return jwt.encode(payload, 'dev', algorithm='HS256')
+
+
+def seed_benchmark_dataset(scale=1, seed=42):
+    """
+    Crée un jeu de données synthétique reproductible (voir SyntheticDataGenerator)
+
+    Args:
+        scale: Multiplicateur du volume (1 = quelques milliers de lignes par table)
+        seed: Graine du générateur aléatoire
+
+    Returns:
+        dict: Les objets de référence utilisés par les tests (organizer, player, ...)
+    """
+    generator = SyntheticDataGenerator(
+        users=2000 * scale,
+        tournaments=1000 * scale,
+        teams_per=4,
+        matches_per=2,
+        requests_per=3,
+        seed=seed,
+        prefix='bench',
+    )
+    generator.run()
+
+    organizer = User.objects.get(id=generator.organizer_ids[0])
+    player = User.objects.get(id=generator.player_ids[0])
+
+    # Le joueur de référence est membre de 10 équipes et a 20 demandes en attente
+    open_teams = (
+        Team.objects.filter(current_capacity__lt=F('max_capacity'))
+        .exclude(members=player)
+        .exclude(join_requests_as_team__player=player)
+        .order_by('id')
+    )
+    member_of = list(open_teams.values_list('id', flat=True)[:10])
+    Team.members.through.objects.bulk_create([
+        Team.members.through(team_id=team_id, user_id=player.id) for team_id in member_of
+    ])
+    Team.objects.filter(id__in=member_of).update(current_capacity=F('current_capacity') + 1)
+    JoinRequest.objects.bulk_create([
+        JoinRequest(player=player, team_id=team_id)
+        for team_id in open_teams.values_list('id', flat=True)[:20]
+    ])
+    generator.analyze()
+    # Recommandations précalculées, comme après la commande refresh_recommendations
+    refresh_all()
+
+    pending_request = (
+        JoinRequest.objects.filter(
+            team__tournament__organizer=organizer,
+            team__current_capacity__lt=F('team__max_capacity'),
+            status='pending',
+        )
+        .select_related('team__tournament')
+        .order_by('id')
+        .first()
+    )
+    team = pending_request.team
+    return {
+        'organizer': organizer,
+        'player': player,
+        'tournament': team.tournament,
+        'team': team,
+        'match': Match.objects.filter(tournament=team.tournament).order_by('id').first(),
+        'pending_request': pending_request,
+        'player_request': JoinRequest.objects.filter(player=player, status='pending').order_by('id').first(),
+    }
+
+
+@override_settings(CLERK_JWKS_URL=None)
+class QueryBudgetTestCase(TestCase):
+    """
+    TestCase de base : jeu de données partagé + mesure des actions d'API
+
+    Utilisation:
+        self.assertQueryBudget('tournaments-list', 'get', '/api/tournaments/',
+                               user=self.organizer, budget=4)
+    """
+
+    scale = int(os.getenv('BENCH_SCALE', '1'))
+    measurements = []
+
+    @classmethod
+    def setUpTestData(cls):
+        for name, value in seed_benchmark_dataset(cls.scale).items():
+            setattr(cls, name, value)
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.measurements = []
+
+    @classmethod
+    def tearDownClass(cls):
+        report = os.getenv('BENCH_REPORT')
+        if report and cls.measurements:
+            if report != '-':
+                with open(report, 'a') as f:
+                    for row in cls.measurements:
+                        f.write(json.dumps(row) + '\n')
+            sys.stderr.write(f'\n{cls.__name__} (BENCH_SCALE={cls.scale})\n')
+            for row in cls.measurements:
+                sys.stderr.write(
+                    f"  {row['action']:<40} {row['status']:>3} {row['queries']:>5}/{row['budget']:<5} "
+                    f"{row['ms']:>9.1f} ms {row['bytes']:>10} o\n"
+                )
+        super().tearDownClass()
+
+    def setUp(self):
+        # Chaque mesure part de caches vides (authentification comprise)
+        token_cache.clear()
+        cache.clear()
+
+    def request(self, method, url, user, data=None, headers=None):
+        """Appelle l'API et retourne (response, queries, ms), travaux après commit (on_commit) compris"""
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {make_token(user.clerk_id)}', **(headers or {})}
+        call = getattr(self.client, method)
+        with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+            start = time.perf_counter()
+            if data is None:
+                response = call(url, **headers)
+            else:
+                response = call(url, data=data, content_type='application/json', **headers)
+            elapsed = (time.perf_counter() - start) * 1000
+        return response, queries, elapsed
+
+    def assertQueryBudget(self, action, method, url, user, budget, data=None, status=200, headers=None):
+        """
+        Vérifie le statut HTTP et que l'action reste dans son budget de requêtes SQL
+
+        Args:
+            headers: En-têtes WSGI supplémentaires (ex. HTTP_IF_NONE_MATCH)
+        """
+        response, queries, elapsed = self.request(method, url, user, data, headers)
+        self.measurements.append({
+            'action': action,
+            'status': response.status_code,
+            'queries': len(queries.captured_queries),
+            'budget': budget,
+            'ms': round(elapsed, 2),
+            'bytes': len(response.content),
+        })
+
+        self.assertEqual(response.status_code, status, response.content[:500])
+        if len(queries.captured_queries) > budget:
+            sql = '\n'.join(q['sql'] for q in queries.captured_queries[:20])
+            self.fail(
+                f'{action}: {len(queries.captured_queries)} requêtes SQL (budget: {budget})\n{sql}'
+            )
+        return response
@@ -1,8 +1,13 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from TeamSportFinder.metrics import metrics_view
+from TeamSportFinder.profiling import profile_download
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view),   # métriques Prometheus
+    path('profiles/<str:filename>', profile_download),   # profils X-Profile (PROFILING_ENABLED)
     path('api/players/', include('players.urls')),
     path('api/accounts/', include('accounts.urls')),
     path('api/', include('tournaments.urls')),   # pour tournois + équipes
@@ -2,10 +2,8 @@
 Authentification JWT avec Clerk
 """
 import jwt
-import requests
-from django.conf import settings
 from rest_framework import authentication, exceptions
-from django.core.cache import cache
+from clerk_auth.jwks import decode_verified_token
 import logging
 
 logger = logging.getLogger(__name__)
@@ -53,61 +51,10 @@ class ClerkJWTAuthentication(authentication.BaseAuthentication):
     
     def verify_jwt(self, token):
         """
-        Vérifie et décode le JWT token en utilisant les JWKS de Clerk
+        Vérifie et décode le JWT token avec les clés JWKS de Clerk
+        (vérification locale partagée avec clerk_auth, clés gardées en mémoire)
         """
-        # Récupérer les JWKS (JSON Web Key Set) de Clerk
-        jwks = self.get_jwks()
-        
-        # Décoder le header du token pour obtenir le 'kid' (Key ID)
-        unverified_header = jwt.get_unverified_header(token)
-        kid = unverified_header.get('kid')
-        
-        if not kid:
-            raise jwt.InvalidTokenError('Token sans kid')
-        
-        # Trouver la bonne clé dans le JWKS
-        signing_key = None
-        for key in jwks.get('keys', []):
-            if key.get('kid') == kid:
-                # Construire la clé publique RSA
-                signing_key = jwt.algorithms.RSAAlgorithm.from_jwk(key)
-                break
-        
-        if not signing_key:
-            raise jwt.InvalidTokenError('Clé de signature introuvable')
-        
-        # Décoder et valider le token
-        payload = jwt.decode(
-            token,
-            signing_key,
-            algorithms=['RS256'],
-            options={
-                'verify_signature': True,
-                'verify_exp': True,
-                'verify_iat': True,
-            }
-        )
-        
-        return payload
-    
-    def get_jwks(self):
-        """
-        Récupère les JWKS de Clerk (avec cache pour optimiser)
-        """
-        cache_key = 'clerk_jwks'
-        jwks = cache.get(cache_key)
-        
-        if jwks is None:
-            # Télécharger les JWKS depuis Clerk
-            jwks_url = settings.CLERK_JWKS_URL
-            response = requests.get(jwks_url, timeout=10)
-            response.raise_for_status()
-            jwks = response.json()
-            
-            # Mettre en cache pour 1 heure
-            cache.set(cache_key, jwks, 3600)
-        
-        return jwks
+        return decode_verified_token(token)
 
 
 class ClerkUser:
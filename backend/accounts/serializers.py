@@ -3,6 +3,7 @@ Serializers pour l'API REST
 """
 
 from requestes.models import JoinRequest
+from requestes.services import RequestAlreadyProcessed, TeamFull, accept_join_request
 from tournaments.models import Team
 from .models import User
 from rest_framework import serializers
@@ -90,14 +91,31 @@ class JoinRequestUpdateSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         new_status = validated_data.get('status')
 
-        if new_status == 'accepted':
-            team = instance.team
-            if team.is_full:
+        if new_status == 'accepted' and instance.status != 'accepted':
+            # Même chemin atomique que l'action 'accept'
+            try:
+                return accept_join_request(instance)
+            except TeamFull:
                 raise serializers.ValidationError("Impossible d'accepter, l'équipe est pleine.")
-            team.members.add(instance.player)
-            team.current_capacity += 1
-            team.save()
+            except RequestAlreadyProcessed:
+                raise serializers.ValidationError("Cette demande a déjà été traitée.")
 
         instance.status = new_status
         instance.save()
         return instance
+
+
+# --- JOIN REQUEST BULK (organisateur) ---
+class JoinRequestDecisionSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    decision = serializers.ChoiceField(choices=['accept', 'reject'])
+
+
+class JoinRequestBulkSerializer(serializers.Serializer):
+    decisions = JoinRequestDecisionSerializer(many=True, allow_empty=False, max_length=500)
+
+    def validate_decisions(self, decisions):
+        ids = [item['id'] for item in decisions]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError("Une même demande ne peut apparaître qu'une fois.")
+        return decisions
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from clerk_auth.utils import invalidate_cached_user
+from .models import User
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    """
+    Quand un User est modifié ou supprimé :
+    - Retire l'entrée du cache partagé clerk_id -> User
+    """
+    invalidate_cached_user(instance.clerk_id)
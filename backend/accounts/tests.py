@@ -1,3 +1,199 @@
-from django.test import TestCase
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import mock
 
-# Create your tests here.
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from TeamSportFinder.testing import QueryBudgetTestCase
+from accounts.models import User
+from clerk_auth.jwks import JWKSKeyStore, decode_verified_token
+from clerk_auth.utils import token_cache, verify_clerk_token
+
+
+def generate_signing_key(kid):
+    """Génère une paire de clés RSA et la JWK publique correspondante"""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({'kid': kid, 'alg': 'RS256', 'use': 'sig'})
+    return private_key, jwk
+
+
+class LocalJWKSServer:
+    """Serveur HTTP local qui remplace l'URL JWKS de Clerk pendant les tests"""
+
+    def __init__(self):
+        self.jwks = {'keys': []}
+        self.requests_count = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests_count += 1
+                body = json.dumps(server.jwks).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = HTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.httpd.server_port}/.well-known/jwks.json'
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class JWKSVerificationTests(SimpleTestCase):
+    """Vérification locale des signatures RS256 contre un serveur JWKS local"""
+
+    def setUp(self):
+        self.server = LocalJWKSServer().__enter__()
+        self.addCleanup(self.server.__exit__)
+        self.private_key, jwk = generate_signing_key('key-1')
+        self.server.jwks = {'keys': [jwk]}
+
+    def make_token(self, private_key=None, kid='key-1', **claims):
+        payload = {
+            'sub': 'user_123',
+            'email': 'alice@example.com',
+            'iat': int(time.time()),
+            'exp': int(time.time()) + 60,
+        }
+        payload.update(claims)
+        return jwt.encode(payload, private_key or self.private_key, algorithm='RS256', headers={'kid': kid})
+
+    def make_store(self):
+        store = JWKSKeyStore(self.server.url, min_refresh_interval=0)
+        store.refresh()
+        return store
+
+    def test_valid_signature(self):
+        payload = decode_verified_token(self.make_token(), self.make_store())
+        self.assertEqual(payload['sub'], 'user_123')
+
+    def test_invalid_signature_is_rejected(self):
+        other_key, _ = generate_signing_key('key-1')
+        with self.assertRaises(jwt.InvalidSignatureError):
+            decode_verified_token(self.make_token(private_key=other_key), self.make_store())
+
+    def test_expired_token_is_rejected(self):
+        token = self.make_token(exp=int(time.time()) - 3600)
+        with self.assertRaises(jwt.ExpiredSignatureError):
+            decode_verified_token(token, self.make_store())
+
+    def test_unknown_kid_refreshes_in_background(self):
+        store = self.make_store()
+        new_key, new_jwk = generate_signing_key('key-2')
+        self.server.jwks = {'keys': [new_jwk]}
+        token = self.make_token(private_key=new_key, kid='key-2')
+
+        # Le kid inconnu est refusé immédiatement, sans appel réseau bloquant
+        with self.assertRaisesMessage(jwt.InvalidTokenError, 'Clé de signature introuvable'):
+            decode_verified_token(token, store)
+
+        store._refresh_thread.join(timeout=5)
+        self.assertEqual(store.kids, ['key-2'])
+        self.assertEqual(decode_verified_token(token, store)['sub'], 'user_123')
+
+    def test_min_refresh_interval_limits_fetches(self):
+        store = JWKSKeyStore(self.server.url, min_refresh_interval=3600)
+        store.refresh_async().join(timeout=5)
+        for kid in ('unknown-1', 'unknown-2', 'unknown-3'):
+            self.assertIsNone(store.get_key(kid))
+        self.assertEqual(self.server.requests_count, 1)
+
+    def test_verify_clerk_token_uses_jwks(self):
+        with override_settings(CLERK_JWKS_URL=self.server.url):
+            from clerk_auth.jwks import get_key_store
+            self.assertTrue(get_key_store().wait_until_ready(timeout=5))
+
+            result = verify_clerk_token(self.make_token())
+            self.assertTrue(result['valid'])
+            self.assertEqual(result['user_id'], 'user_123')
+
+            other_key, _ = generate_signing_key('key-1')
+            result = verify_clerk_token(self.make_token(private_key=other_key))
+            self.assertFalse(result['valid'])
+
+
+@override_settings(CLERK_JWKS_URL=None)
+class AuthenticationPipelineTests(TestCase):
+    """Le middleware et l'authentification DRF partagent une seule résolution"""
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = User.objects.create(
+            clerk_id='user_abc',
+            email='bob@example.com',
+            full_name='Bob Martin',
+            role='player',
+        )
+
+    def get_me(self, sub='user_abc'):
+        token = jwt.encode({'sub': sub, 'exp': int(time.time()) + 300}, 'dev', algorithm='HS256')
+        return self.client.get('/api/accounts/me/', HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_one_decode_and_one_user_query(self):
+        with mock.patch('clerk_auth.utils.verify_clerk_token', wraps=verify_clerk_token) as verify, \
+                CaptureQueriesContext(connection) as queries:
+            response = self.get_me()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['email'], 'bob@example.com')
+        self.assertEqual(verify.call_count, 1)
+        user_queries = [q for q in queries.captured_queries if '"users"' in q['sql']]
+        self.assertEqual(len(user_queries), 1)
+
+    def test_hot_user_needs_no_query(self):
+        self.get_me()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get_me()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['id'], str(self.user.id))
+        self.assertEqual(len(queries.captured_queries), 0)
+
+    def test_user_cache_is_invalidated_on_save(self):
+        self.get_me()
+        self.user.full_name = 'Robert Martin'
+        self.user.save()
+
+        response = self.get_me()
+        self.assertEqual(response.json()['full_name'], 'Robert Martin')
+
+    def test_unknown_user_is_resolved_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get_me(sub='user_unknown')
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(len(queries.captured_queries), 1)
+
+    def test_invalid_token_is_rejected(self):
+        response = self.client.get('/api/accounts/me/', HTTP_AUTHORIZATION='Bearer not-a-jwt')
+        self.assertEqual(response.status_code, 401)
+
+
+class AccountQueryBudgetTests(QueryBudgetTestCase):
+    """Budgets de requêtes SQL des endpoints de comptes"""
+
+    def test_me(self):
+        self.assertQueryBudget('current-user', 'get', '/api/accounts/me/', self.player, budget=1)
+
+    def test_create_existing(self):
+        self.assertQueryBudget('create-user', 'post', '/api/accounts/create/', self.player,
+                               budget=2, data={'role': 'player'})
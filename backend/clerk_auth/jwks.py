@@ -0,0 +1,196 @@
+"""
+Vérification locale des signatures JWT Clerk (RS256) à partir des JWKS
+
+Les clés publiques sont gardées en mémoire (une par 'kid') et rafraîchies
+en arrière-plan : le chemin de la requête ne fait jamais d'appel réseau.
+"""
+import logging
+import threading
+import time
+
+import jwt  # type: ignore  # PyJWT package
+import requests
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class JWKSKeyStore:
+    """
+    Dictionnaire en mémoire kid -> clé publique RSA, alimenté depuis une URL JWKS
+
+    - get_key() ne bloque jamais : si le kid est inconnu (rotation des clés),
+      un rafraîchissement est lancé dans un thread et None est retourné
+    - Les clés sont aussi rafraîchies périodiquement (refresh_interval)
+    - min_refresh_interval évite de surcharger l'URL JWKS avec des kid inventés
+    """
+
+    def __init__(self, jwks_url, refresh_interval=3600, min_refresh_interval=30, timeout=10):
+        self.jwks_url = jwks_url
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self._keys = {}
+        self._last_refresh = 0.0
+        self._last_attempt = 0.0
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+        self._ready = threading.Event()
+
+    def get_key(self, kid):
+        """
+        Retourne la clé publique associée au kid, ou None si elle est inconnue
+
+        Args:
+            kid: L'identifiant de clé (header 'kid' du JWT)
+        """
+        key = self._keys.get(kid)
+        now = time.monotonic()
+
+        if key is None or now - self._last_refresh > self.refresh_interval:
+            self.refresh_async()
+
+        return key
+
+    def refresh_async(self):
+        """
+        Lance un rafraîchissement des clés en arrière-plan (un seul à la fois)
+
+        Returns:
+            Thread ou None: Le thread lancé, None si un rafraîchissement est
+            déjà en cours ou trop récent
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return None
+            if self._last_attempt and now - self._last_attempt < self.min_refresh_interval:
+                return None
+
+            self._last_attempt = now
+            self._refresh_thread = threading.Thread(
+                target=self.refresh,
+                name='clerk-jwks-refresh',
+                daemon=True,
+            )
+            self._refresh_thread.start()
+            return self._refresh_thread
+
+    def refresh(self):
+        """
+        Télécharge les JWKS et remplace le dictionnaire de clés
+
+        Returns:
+            bool: True si les clés ont été chargées
+        """
+        try:
+            response = requests.get(self.jwks_url, timeout=self.timeout)
+            response.raise_for_status()
+            jwks = response.json()
+        except Exception as e:
+            logger.warning(f"Impossible de récupérer les JWKS Clerk: {str(e)}")
+            return False
+
+        keys = {}
+        for jwk in jwks.get('keys', []):
+            kid = jwk.get('kid')
+            if not kid or jwk.get('kty') != 'RSA':
+                continue
+            try:
+                keys[kid] = jwt.algorithms.RSAAlgorithm.from_jwk(jwk)
+            except Exception as e:
+                logger.warning(f"Clé JWKS ignorée ({kid}): {str(e)}")
+
+        # Remplacement atomique : les lecteurs voient l'ancien ou le nouveau dict
+        self._keys = keys
+        self._last_refresh = time.monotonic()
+        self._ready.set()
+        return True
+
+    def wait_until_ready(self, timeout=None):
+        """
+        Attend le premier chargement des clés (démarrage, tests)
+
+        Returns:
+            bool: True si les clés ont été chargées avant le timeout
+        """
+        return self._ready.wait(timeout)
+
+    @property
+    def kids(self):
+        """Liste des kid actuellement connus"""
+        return list(self._keys)
+
+
+_key_store = None
+_key_store_lock = threading.Lock()
+
+
+def get_key_store():
+    """
+    Retourne le JWKSKeyStore partagé du processus
+
+    Returns:
+        JWKSKeyStore ou None: None si CLERK_JWKS_URL n'est pas configurée
+    """
+    global _key_store
+
+    jwks_url = getattr(settings, 'CLERK_JWKS_URL', None)
+    if not jwks_url:
+        return None
+
+    if _key_store is None or _key_store.jwks_url != jwks_url:
+        with _key_store_lock:
+            if _key_store is None or _key_store.jwks_url != jwks_url:
+                _key_store = JWKSKeyStore(
+                    jwks_url,
+                    refresh_interval=getattr(settings, 'CLERK_JWKS_REFRESH_INTERVAL', 3600),
+                    min_refresh_interval=getattr(settings, 'CLERK_JWKS_MIN_REFRESH_INTERVAL', 30),
+                )
+                _key_store.refresh_async()
+
+    return _key_store
+
+
+def decode_verified_token(token, key_store=None):
+    """
+    Vérifie la signature RS256 et l'expiration d'un token JWT Clerk
+
+    Args:
+        token: Le token JWT à vérifier
+        key_store: Le JWKSKeyStore à utiliser (par défaut celui du processus)
+
+    Returns:
+        dict: Le payload décodé
+
+    Raises:
+        jwt.ExpiredSignatureError: Si le token est expiré
+        jwt.InvalidTokenError: Si le token est invalide ou la clé inconnue
+    """
+    key_store = key_store or get_key_store()
+    if key_store is None:
+        raise jwt.InvalidTokenError('CLERK_JWKS_URL non configurée')
+
+    # Décoder le header du token pour obtenir le 'kid' (Key ID)
+    unverified_header = jwt.get_unverified_header(token)
+    kid = unverified_header.get('kid')
+
+    if not kid:
+        raise jwt.InvalidTokenError('Token sans kid')
+
+    signing_key = key_store.get_key(kid)
+    if signing_key is None:
+        # Un rafraîchissement a été lancé en arrière-plan
+        raise jwt.InvalidTokenError('Clé de signature introuvable')
+
+    return jwt.decode(
+        token,
+        signing_key,
+        algorithms=['RS256'],
+        leeway=getattr(settings, 'CLERK_JWT_LEEWAY', 0),
+        options={
+            'verify_signature': True,
+            'verify_exp': True,
+            'verify_iat': True,
+        }
+    )
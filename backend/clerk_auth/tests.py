@@ -0,0 +1,58 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from clerk_auth.token_cache import VerifiedTokenCache
+
+
+class VerifiedTokenCacheTests(SimpleTestCase):
+    """Cache LRU des tokens vérifiés : éviction, expiration et compteurs"""
+
+    def setUp(self):
+        patcher = mock.patch('clerk_auth.token_cache.time.time', return_value=1000.0)
+        self.clock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_lru_eviction_at_maxsize(self):
+        cache = VerifiedTokenCache(maxsize=2)
+        cache.set('a', 'A')
+        cache.set('b', 'B')
+        self.assertEqual(cache.get('a'), 'A')  # 'b' devient le moins récent
+        cache.set('c', 'C')
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual((cache.get('a'), cache.get('c')), ('A', 'C'))
+
+    def test_expires_at_max_ttl_or_exp(self):
+        cache = VerifiedTokenCache(max_ttl=300)
+        cache.set('long', 'L', exp=5000)  # plafonné à now + max_ttl = 1300
+        cache.set('short', 'S', exp=1100)
+        cache.set('expired', 'E', exp=1000)
+        self.assertIsNone(cache.get('expired'))
+
+        self.clock.return_value = 1099.0
+        self.assertEqual((cache.get('long'), cache.get('short')), ('L', 'S'))
+        self.clock.return_value = 1100.0
+        self.assertIsNone(cache.get('short'))
+        self.clock.return_value = 1299.0
+        self.assertEqual(cache.get('long'), 'L')
+        self.clock.return_value = 1300.0
+        self.assertIsNone(cache.get('long'))
+        self.assertEqual(len(cache), 0)
+
+    def test_counters_and_stats(self):
+        cache = VerifiedTokenCache(maxsize=10)
+        cache.get('a')
+        cache.set('a', 'A')
+        cache.get('a')
+        cache.get('a')
+
+        self.assertEqual(cache.stats(), {'hits': 2, 'misses': 1, 'size': 1, 'maxsize': 10})
+        cache.clear()
+        self.assertEqual(cache.stats(), {'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 10})
+
+    def test_token_is_not_stored(self):
+        cache = VerifiedTokenCache()
+        cache.set('secret-token', 'R')
+        self.assertNotIn('secret-token', cache._entries)
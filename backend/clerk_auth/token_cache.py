@@ -0,0 +1,109 @@
+"""
+Cache en mémoire des tokens Clerk déjà vérifiés
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+class VerifiedTokenCache:
+    """
+    Cache LRU borné avec expiration (TTL) pour les résultats de vérification JWT
+
+    - La clé est un hash SHA-256 du token (le token brut n'est jamais conservé)
+    - Une entrée expire au claim 'exp' du token, plafonné par max_ttl
+    - Les compteurs hits/misses permettent de suivre l'efficacité du cache
+    """
+
+    def __init__(self, maxsize=1024, max_ttl=300):
+        self.maxsize = maxsize
+        self.max_ttl = max_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token):
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    def get(self, token):
+        """
+        Retourne le résultat de vérification en cache, ou None si absent/expiré
+        """
+        key = self._key(token)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, result = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            # Marquer l'entrée comme récemment utilisée
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def set(self, token, result, exp=None):
+        """
+        Met en cache un résultat de vérification jusqu'à l'expiration du token
+
+        Args:
+            token: Le token JWT vérifié
+            result: Le résultat retourné par verify_clerk_token
+            exp: Le claim 'exp' du token (timestamp UNIX) ou None
+        """
+        if self.maxsize <= 0:
+            return
+
+        now = time.time()
+        expires_at = now + self.max_ttl
+        if exp is not None:
+            try:
+                expires_at = min(expires_at, float(exp))
+            except (TypeError, ValueError):
+                pass
+
+        # Un token déjà expiré n'est pas mis en cache
+        if expires_at <= now:
+            return
+
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Vide le cache et remet les compteurs à zéro"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Retourne les statistiques du cache
+
+        Returns:
+            dict: {'hits': int, 'misses': int, 'size': int, 'maxsize': int}
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,13 +1,29 @@
 import os
 import requests
 import jwt  # type: ignore  # PyJWT package
+from django.conf import settings
+from django.core.cache import cache
 from accounts.models import User
+from TeamSportFinder.monitoring import timed_auth
+from .jwks import get_key_store, decode_verified_token
+from .token_cache import VerifiedTokenCache
+
+
+# Cache des tokens déjà vérifiés (partagé par le middleware et l'authentification DRF)
+token_cache = VerifiedTokenCache(
+    maxsize=getattr(settings, 'CLERK_TOKEN_CACHE_SIZE', 1024),
+    max_ttl=getattr(settings, 'CLERK_TOKEN_CACHE_MAX_TTL', 300),
+)
 
 
 def verify_clerk_token(token):
     """
     Vérifie un token JWT Clerk et retourne les informations utilisateur
     
+    - Si CLERK_JWKS_URL est configurée : signature RS256 et expiration vérifiées
+      localement avec les clés JWKS en mémoire (aucun appel réseau)
+    - Sinon (développement) : le token est seulement décodé
+    
     Args:
         token: Le token JWT à vérifier
         
@@ -15,56 +31,20 @@ def verify_clerk_token(token):
         dict: {'valid': bool, 'user_id': str, 'email': str, 'role': str} ou {'valid': False, 'error': str}
     """
     try:
-        clerk_secret_key = os.getenv('CLERK_SECRET_KEY')
-        
-        # Décoder le token (sans vérifier la signature pour l'instant)
-        # En mode développement, on accepte le token si on peut le décoder
-        # Pour le développement, on ne vérifie pas strictement l'expiration
-        # (en production, vous devriez vérifier avec JWKS)
-        decoded = jwt.decode(
-            token,
-            options={"verify_signature": False, "verify_exp": False}
-        )
+        key_store = get_key_store()
+        
+        if key_store is not None:
+            # Production : vérification locale de la signature avec les JWKS
+            decoded = decode_verified_token(token, key_store)
+        else:
+            decoded = _decode_unverified_token(token)
         
-        # Pour le développement : ne pas vérifier l'expiration du token
-        # (en production, vous devriez vérifier l'expiration avec une marge de tolérance)
-        # Les tokens Clerk peuvent avoir une durée de vie très courte en développement
-        # import time
-        # exp = decoded.get('exp')
-        # if exp:
-        #     current_time = time.time()
-        #     if current_time > exp + 300:  # 5 minutes de marge
-        #         return {'valid': False, 'error': 'Token expiré'}
-        
-        # Pour le développement : accepter le token si on peut le décoder
-        # (En production, vous devriez vérifier la signature avec JWKS)
         user_id = decoded.get('sub')
         email = decoded.get('email') or decoded.get('primary_email_address')
         
         if not user_id:
             return {'valid': False, 'error': 'Token sans user ID (sub)'}
         
-        # Vérifier avec l'API Clerk (optionnel pour le développement)
-        # Si CLERK_SECRET_KEY est configurée, on essaie de vérifier
-        if clerk_secret_key:
-            try:
-                clerk_api_url = "https://api.clerk.com/v1/tokens/verify"
-                headers = {
-                    'Authorization': f'Bearer {clerk_secret_key}',
-                    'Content-Type': 'application/json'
-                }
-                data = {'token': token}
-                
-                response = requests.post(clerk_api_url, headers=headers, json=data, timeout=5)
-                
-                if response.status_code != 200:
-                    # Si la vérification échoue mais qu'on est en dev, on accepte quand même
-                    # (pour permettre les tests sans avoir à configurer l'API Clerk)
-                    pass
-            except:
-                # Si l'appel API échoue, on accepte quand même en mode dev
-                pass
-        
         # Retourner les infos du token décodé
         return {
             'valid': True,
@@ -80,6 +60,74 @@ def verify_clerk_token(token):
         return {'valid': False, 'error': str(e)}
 
 
+def _decode_unverified_token(token):
+    """
+    Décode un token sans vérifier la signature (développement sans CLERK_JWKS_URL)
+    
+    Args:
+        token: Le token JWT à décoder
+        
+    Returns:
+        dict: Le payload décodé
+    """
+    clerk_secret_key = os.getenv('CLERK_SECRET_KEY')
+    
+    # Pour le développement, on ne vérifie pas strictement l'expiration
+    # Les tokens Clerk peuvent avoir une durée de vie très courte en développement
+    decoded = jwt.decode(
+        token,
+        options={"verify_signature": False, "verify_exp": False}
+    )
+    
+    # Vérifier avec l'API Clerk (optionnel pour le développement)
+    # Si CLERK_SECRET_KEY est configurée, on essaie de vérifier
+    if clerk_secret_key:
+        try:
+            clerk_api_url = "https://api.clerk.com/v1/tokens/verify"
+            headers = {
+                'Authorization': f'Bearer {clerk_secret_key}',
+                'Content-Type': 'application/json'
+            }
+            data = {'token': token}
+            
+            response = requests.post(clerk_api_url, headers=headers, json=data, timeout=5)
+            
+            if response.status_code != 200:
+                # Si la vérification échoue mais qu'on est en dev, on accepte quand même
+                # (pour permettre les tests sans avoir à configurer l'API Clerk)
+                pass
+        except:
+            # Si l'appel API échoue, on accepte quand même en mode dev
+            pass
+    
+    return decoded
+
+
+def verify_clerk_token_cached(token):
+    """
+    Vérifie un token JWT Clerk en réutilisant le résultat si le token
+    a déjà été vérifié (évite le décodage et l'appel à l'API Clerk)
+    
+    Args:
+        token: Le token JWT à vérifier
+        
+    Returns:
+        dict: Le même format que verify_clerk_token
+    """
+    result = token_cache.get(token)
+    if result is not None:
+        return result
+    
+    result = verify_clerk_token(token)
+    
+    # Seuls les tokens valides sont mis en cache, jusqu'à leur expiration
+    if result.get('valid'):
+        exp = result.get('decoded_token', {}).get('exp')
+        token_cache.set(token, result, exp)
+    
+    return result
+
+
 def get_clerk_user_info(user_id):
     """
     Récupère les informations d'un utilisateur depuis Clerk
@@ -123,10 +171,83 @@ def get_user_from_clerk(clerk_user_id):
     Returns:
         User ou None: L'instance User Django si trouvé, None sinon
     """
+    # Carte d'identité partagée : un utilisateur fréquent ne coûte aucune requête SQL
+    cache_key = _user_cache_key(clerk_user_id)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return User.from_db(User.objects.db, list(cached), list(cached.values()))
+    
     try:
-        return User.objects.get(clerk_id=clerk_user_id)
+        user = User.objects.get(clerk_id=clerk_user_id)
     except User.DoesNotExist:
         return None
+    
+    cache.set(
+        cache_key,
+        {field.attname: getattr(user, field.attname) for field in User._meta.concrete_fields},
+        getattr(settings, 'CLERK_USER_CACHE_TTL', 300),
+    )
+    return user
+
+
+def invalidate_cached_user(clerk_user_id):
+    """
+    Supprime l'utilisateur du cache partagé (après modification ou suppression)
+    
+    Args:
+        clerk_user_id: L'ID de l'utilisateur Clerk
+    """
+    cache.delete(_user_cache_key(clerk_user_id))
+
+
+def _user_cache_key(clerk_user_id):
+    return f'clerk_user:{clerk_user_id}'
+
+
+def resolve_clerk_principal(request):
+    """
+    Authentifie une requête Django une seule fois et mémorise le résultat
+    
+    Le middleware et l'authentification DRF appellent cette fonction :
+    le token n'est décodé qu'une fois et l'utilisateur chargé au plus une fois.
+    
+    Args:
+        request: La requête Django (HttpRequest, pas la Request DRF)
+        
+    Returns:
+        dict ou None: {'token': str, 'verification': dict, 'user': User ou None},
+        None si la requête n'a pas de token Bearer
+    """
+    if hasattr(request, '_clerk_principal'):
+        return request._clerk_principal
+    
+    with timed_auth(request):
+        principal = None
+        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
+    
+        # Extraire le token en toute sécurité
+        parts = auth_header.split(' ', 1)
+        if auth_header.startswith('Bearer ') and len(parts) == 2:
+            token = parts[1]
+            verification_result = verify_clerk_token_cached(token)
+            principal = {
+                'token': token,
+                'verification': verification_result,
+                'user': None,
+            }
+        
+            if verification_result.get('valid'):
+                # Stocker les infos Clerk dans la requête (pour référence)
+                request.clerk_user_id = verification_result.get('user_id')
+                request.clerk_email = verification_result.get('email')
+                request.clerk_role = verification_result.get('role', 'player')
+            
+                # Récupérer l'utilisateur Django (sans créer)
+                # Si l'utilisateur n'existe pas, il devra s'inscrire d'abord
+                principal['user'] = get_user_from_clerk(request.clerk_user_id)
+    
+    request._clerk_principal = principal
+    return principal
 
 
 def get_or_create_user_from_clerk(clerk_user_id, email, full_name=None, role='player'):
@@ -155,6 +276,7 @@ def get_or_create_user_from_clerk(clerk_user_id, email, full_name=None, role='pl
         if user.role != role:
             user.role = role
         user.save()
+        invalidate_cached_user(clerk_user_id)
         
         return user
     except User.DoesNotExist:
@@ -169,5 +291,6 @@ def get_or_create_user_from_clerk(clerk_user_id, email, full_name=None, role='pl
             full_name=full_name,
             role=role
         )
+        invalidate_cached_user(clerk_user_id)
         return user
 
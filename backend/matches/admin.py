@@ -3,6 +3,7 @@ from matches.models import Match
 
 @admin.register(Match)
 class MatchAdmin(admin.ModelAdmin):
-    list_display = ('team_a', 'team_b', 'date', 'location', 'score_a', 'score_b')
+    list_display = ('team_a', 'team_b', 'tournament', 'date', 'ends_at', 'location', 'score_a', 'score_b')
+    list_select_related = ('team_a', 'team_b', 'tournament')
     search_fields = ('team_a__name', 'team_b__name', 'location')
     list_filter = ('date', 'location')
\ No newline at end of file
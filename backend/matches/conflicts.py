@@ -0,0 +1,128 @@
+"""
+Conflits de calendrier : même lieu ou même équipe sur deux créneaux qui se chevauchent
+
+Deux créneaux [début, fin) se chevauchent si chacun commence avant la fin
+de l'autre. Deux façons de les trouver :
+    - find_conflicts() : un créneau candidat (création / modification d'un
+      match), une requête sur des index, O(log n) par vérification :
+        * lieu : index GiST match_location_period_idx
+          (tournoi =, lieu =, tstzrange(date, ends_at) &&)
+        * équipes : index (team_a, date) et (team_b, date), fenêtre bornée
+          par MAX_MATCH_DURATION
+    - sweep_conflicts() : tous les conflits d'une liste triée par début
+      (rapport d'un tournoi, calendrier généré), balayage O(n log n + k)
+
+Les index accélèrent la vérification sans l'imposer : une création ou un
+déplacement verrouille d'abord son tournoi (lock_tournament), puis vérifie et
+écrit dans la même transaction. Les écritures de matchs d'un tournoi passent
+ainsi une par une.
+
+Les matchs enregistrés avant la détection peuvent se chevaucher : pas de
+contrainte d'exclusion en base, GET /api/matches/conflicts/ les signale.
+"""
+from django.db.models import Q
+
+from matches.models import MAX_MATCH_DURATION, Match, TsTzRange
+from tournaments.models import Tournament
+
+LOCATION = 'location'
+TEAM = 'team'
+
+
+def lock_tournament(tournament_id):
+    """
+    Verrouille le tournoi jusqu'à la fin de la transaction (SELECT ... FOR UPDATE)
+
+    À appeler dans transaction.atomic(), avant de vérifier puis d'écrire des
+    matchs du tournoi.
+    """
+    Tournament.objects.select_for_update().filter(id=tournament_id).values_list('id').get()
+
+
+def find_conflicts(tournament_id, location, team_ids, start, end, exclude_id=None, limit=10):
+    """
+    Matchs qui entrent en conflit avec un créneau candidat
+
+    Args:
+        tournament_id: Le tournoi du créneau (les lieux sont propres à un tournoi)
+        location: Le lieu du créneau
+        team_ids: Les équipes qui jouent
+        start, end: Le créneau [start, end)
+        exclude_id: Match à ignorer (le match modifié)
+        limit: Nombre maximal de conflits retournés
+
+    Returns:
+        list: dicts {'match_id', 'kinds', 'date', 'ends_at', 'location'} par date
+    """
+    same_location = Q(tournament_id=tournament_id, location=location, period__overlap=(start, end))
+    same_team = (
+        (Q(team_a_id__in=team_ids) | Q(team_b_id__in=team_ids))
+        & Q(date__lt=end, date__gt=start - MAX_MATCH_DURATION, ends_at__gt=start)
+    )
+    queryset = (
+        Match.objects.annotate(period=TsTzRange('date', 'ends_at'))
+        .filter(same_location | same_team)
+        .order_by('date', 'id')
+        .values('id', 'tournament_id', 'team_a_id', 'team_b_id', 'location', 'date', 'ends_at')
+    )
+    if exclude_id is not None:
+        queryset = queryset.exclude(id=exclude_id)
+
+    conflicts = []
+    for match in queryset[:limit]:
+        kinds = []
+        if match['tournament_id'] == tournament_id and match['location'] == location:
+            kinds.append(LOCATION)
+        if {match['team_a_id'], match['team_b_id']} & set(team_ids):
+            kinds.append(TEAM)
+        conflicts.append({
+            'match_id': str(match['id']),
+            'kinds': kinds,
+            'date': match['date'],
+            'ends_at': match['ends_at'],
+            'location': match['location'],
+        })
+    return conflicts
+
+
+def sweep_conflicts(slots):
+    """
+    Tous les conflits d'une liste de créneaux triés par début
+
+    Pour chaque lieu et chaque équipe, seuls les créneaux encore en cours
+    au début du créneau lu sont gardés : chacun d'eux est en conflit.
+
+    Args:
+        slots: Itérable de (id, team_a_id, team_b_id, location, start, end), trié par start
+
+    Returns:
+        list: (kind, clé, id du premier créneau, id du second)
+    """
+    active = {}
+    conflicts = []
+    for slot_id, team_a_id, team_b_id, location, start, end in slots:
+        for kind, key in dict.fromkeys([(LOCATION, location), (TEAM, team_a_id), (TEAM, team_b_id)]):
+            running = [item for item in active.get((kind, key), []) if item[1] > start]
+            conflicts.extend((kind, key, other_id, slot_id) for other_id, _ in running)
+            running.append((slot_id, end))
+            active[(kind, key)] = running
+    return conflicts
+
+
+def tournament_conflicts(tournament_id):
+    """
+    Conflits entre les matchs d'un tournoi (index tournament_id, date)
+
+    Returns:
+        list: dicts {'kind', 'key', 'match_ids'}
+    """
+    slots = (
+        Match.objects.filter(tournament_id=tournament_id)
+        .order_by('date', 'id')
+        .values_list('id', 'team_a_id', 'team_b_id', 'location', 'date', 'ends_at')
+        .iterator(chunk_size=2000)
+    )
+    return [
+        {'kind': kind, 'key': str(key), 'match_ids': [str(first), str(second)]}
+        for kind, key, first, second in sweep_conflicts(slots)
+    ]
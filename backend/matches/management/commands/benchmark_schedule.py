@@ -0,0 +1,64 @@
+"""
+Mesure la génération d'un calendrier (matches.scheduling.generate_schedule)
+
+Un tournoi de --teams équipes est créé puis son calendrier généré dans une
+transaction annulée à chaque mesure : la base n'est pas modifiée.
+
+Exemples:
+    python manage.py benchmark_schedule
+    python manage.py benchmark_schedule --teams 128 --format single_elimination --repeat 10
+"""
+import statistics
+import time
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.models import User
+from matches.scheduling import FORMATS, ROUND_ROBIN, generate_schedule
+from tournaments.models import Team, Tournament
+
+
+class _Rollback(Exception):
+    """Annule la transaction d'une mesure"""
+
+
+class Command(BaseCommand):
+    help = "Mesure la génération d'un calendrier (sans modifier la base)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--teams', type=int, default=64, help="Équipes du tournoi")
+        parser.add_argument('--format', choices=FORMATS, default=ROUND_ROBIN)
+        parser.add_argument('--locations', type=int, default=8, help="Lieux disponibles")
+        parser.add_argument('--repeat', type=int, default=5, help="Mesures (médiane)")
+
+    def measure(self, options):
+        try:
+            with transaction.atomic():
+                organizer = User.objects.create(clerk_id='benchmark_schedule', email='benchmark@example.com',
+                                                full_name='Benchmark', role='organizer')
+                tournament = Tournament.objects.create(name='Benchmark', sport='Soccer', city='Laval',
+                                                       start_date='2026-01-01', organizer=organizer)
+                teams = Team.objects.bulk_create([
+                    Team(name=f'Équipe {i}', tournament=tournament) for i in range(options['teams'])
+                ])
+                start = time.perf_counter()
+                summary = generate_schedule(
+                    tournament, [team.id for team in teams], options['format'],
+                    datetime(2026, 4, 4, 9, tzinfo=timezone.utc),
+                    [f'Terrain {i}' for i in range(1, options['locations'] + 1)],
+                    match_duration_minutes=60,
+                )
+                elapsed = (time.perf_counter() - start) * 1000
+                raise _Rollback
+        except _Rollback:
+            return summary, elapsed
+
+    def handle(self, *args, **options):
+        runs = [self.measure(options) for _ in range(options['repeat'])]
+        summary = runs[0][0]
+        self.stdout.write(
+            f"{options['format']} : {options['teams']} équipes, {summary['matches_created']} matchs, "
+            f"{summary['rounds']} journées en {statistics.median(elapsed for _, elapsed in runs):.1f} ms (médiane)"
+        )
@@ -0,0 +1,44 @@
+"""
+Recalcule les classements à partir des scores des matchs (voir matches.standings)
+
+Les classements sont tenus à jour à chaque score saisi ; la commande sert
+après un import de matchs en SQL ou pour vérifier les compteurs.
+
+Exemples:
+    python manage.py rebuild_standings
+    python manage.py rebuild_standings --tournament <uuid>
+"""
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from matches.models import Standing
+from matches.standings import rebuild_standings
+
+
+class Command(BaseCommand):
+    help = "Recalcule les classements des tournois à partir des matchs"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tournament', help="ID du tournoi à recalculer (tous par défaut)")
+
+    def handle(self, *args, **options):
+        tournament_id = None
+        if options['tournament']:
+            try:
+                tournament_id = uuid.UUID(options['tournament'])
+            except ValueError:
+                raise CommandError("ID de tournoi invalide.")
+
+        started = time.monotonic()
+        with transaction.atomic():
+            rows = rebuild_standings(tournament_id=tournament_id)
+        if tournament_id is None and connection.vendor == 'postgresql':
+            # Statistiques à jour : la lecture du classement passe par standing_ranking_idx
+            with connection.cursor() as cursor:
+                cursor.execute(f'ANALYZE "{Standing._meta.db_table}"')
+        self.stdout.write(self.style.SUCCESS(
+            f"{rows} lignes de classement recalculées en {time.monotonic() - started:.1f} s"
+        ))
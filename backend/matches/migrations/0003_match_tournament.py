@@ -0,0 +1,40 @@
+# Generated by Django 5.0.1 on 2026-10-17 19:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_tournament(apps, schema_editor):
+    """Copie le tournoi de l'équipe A (un seul UPDATE)"""
+    Match = apps.get_model('matches', 'Match')
+    Team = apps.get_model('tournaments', 'Team')
+    Match.objects.filter(tournament__isnull=True).update(
+        tournament_id=Subquery(Team.objects.filter(id=OuterRef('team_a_id')).values('tournament_id')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0002_alter_match_options_alter_match_table'),
+        ('tournaments', '0004_tournament_coordinates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='match',
+            name='tournament',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='matches', to='tournaments.tournament'),
+        ),
+        migrations.RunPython(backfill_tournament, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='match',
+            name='tournament',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='matches', to='tournaments.tournament'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['tournament', 'date'], name='match_tournament_date_idx'),
+        ),
+    ]
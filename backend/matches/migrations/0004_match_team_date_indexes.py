@@ -0,0 +1,33 @@
+# Generated by Django 5.0.1 on 2026-10-17 20:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0003_match_tournament'),
+        ('tournaments', '0004_tournament_coordinates'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='match',
+            name='team_a',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='matches_as_team_a', to='tournaments.team'),
+        ),
+        migrations.AlterField(
+            model_name='match',
+            name='team_b',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='matches_as_team_b', to='tournaments.team'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['team_a', 'date'], name='match_team_a_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['team_b', 'date'], name='match_team_b_date_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.1 on 2026-10-17 20:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_standings(apps, schema_editor):
+    """Classement initial des équipes existantes (une requête INSERT ... SELECT)"""
+    from matches.standings import rebuild_standings
+    rebuild_standings()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0004_match_team_date_indexes'),
+        ('tournaments', '0004_tournament_coordinates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Standing',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('played', models.PositiveIntegerField(default=0)),
+                ('wins', models.PositiveIntegerField(default=0)),
+                ('draws', models.PositiveIntegerField(default=0)),
+                ('losses', models.PositiveIntegerField(default=0)),
+                ('goals_for', models.PositiveIntegerField(default=0)),
+                ('goals_against', models.PositiveIntegerField(default=0)),
+                ('goal_difference', models.IntegerField(default=0)),
+                ('points', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('team', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='standing', to='tournaments.team')),
+                ('tournament', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='standings', to='tournaments.tournament')),
+            ],
+            options={
+                'verbose_name': 'standing',
+                'verbose_name_plural': 'standings',
+                'db_table': 'standings',
+                'indexes': [models.Index(fields=['tournament', '-points', '-goal_difference', '-goals_for', 'team'], name='standing_ranking_idx')],
+            },
+        ),
+        migrations.RunPython(build_standings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.0.1 on 2026-10-17 21:05
+
+import django.contrib.postgres.indexes
+import matches.models
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+
+
+def backfill_ends_at(apps, schema_editor):
+    """Durée par défaut (90 minutes) pour les matchs existants (un seul UPDATE)"""
+    Match = apps.get_model('matches', 'Match')
+    Match.objects.filter(ends_at__isnull=True).update(ends_at=models.F('date') + matches.models.DEFAULT_MATCH_DURATION)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0005_standings'),
+    ]
+
+    operations = [
+        # Égalité sur uuid et texte dans un index GiST (avec le chevauchement de créneaux)
+        BtreeGistExtension(),
+        migrations.AddField(
+            model_name='match',
+            name='ends_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(backfill_ends_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='match',
+            name='ends_at',
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=django.contrib.postgres.indexes.GistIndex(models.F('tournament'), models.F('location'), matches.models.TsTzRange('date', 'ends_at'), name='match_location_period_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='match',
+            constraint=models.CheckConstraint(check=models.Q(('ends_at__gt', models.F('date'))), name='match_ends_after_start'),
+        ),
+    ]
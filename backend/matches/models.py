@@ -1,20 +1,102 @@
 import uuid
+from datetime import timedelta
+
+from django.contrib.postgres.fields import DateTimeRangeField
+from django.contrib.postgres.indexes import GistIndex
+from django.core.exceptions import ValidationError
 from django.db import models
 
-from tournaments.models import Team
+from tournaments.models import Team, Tournament
+
+# Durée d'un match quand la fin n'est pas donnée, et durée maximale
+# (borne la fenêtre de recherche des conflits d'équipes, voir matches.conflicts)
+DEFAULT_MATCH_DURATION = timedelta(minutes=90)
+MAX_MATCH_DURATION = timedelta(hours=12)
+
+
+class TsTzRange(models.Func):
+    """tstzrange(début, fin) : créneau [début, fin) d'un match"""
+    function = 'TSTZRANGE'
+    output_field = DateTimeRangeField()
+
 
 class Match(models.Model):
 # """Match entre deux equipes"""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4)
-    team_a = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='matches_as_team_a')
-    team_b = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='matches_as_team_b')
+    # Index (team_a, date) et (team_b, date) déclarés dans Meta : calendrier des joueurs
+    team_a = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='matches_as_team_a', db_index=False)
+    team_b = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='matches_as_team_b', db_index=False)
+    # Tournoi des deux équipes, dénormalisé (voir clean) ; indexé par match_tournament_date_idx
+    tournament = models.ForeignKey(Tournament, on_delete=models.CASCADE, related_name='matches', db_index=False)
     date = models.DateTimeField ()
+    # Fin du créneau (date + DEFAULT_MATCH_DURATION par défaut)
+    ends_at = models.DateTimeField()
     location = models.CharField(max_length =200)
     score_a = models.IntegerField(null=True, blank=True)
     score_b = models.IntegerField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'matches'
         verbose_name = "match"
         verbose_name_plural = "matches"
+        indexes = [
+            # Matchs d'un tournoi (ou des tournois d'un organisateur) triés par date
+            models.Index(fields=['tournament', 'date'], name='match_tournament_date_idx'),
+            # Matchs des équipes d'un joueur triés par date (un parcours par côté)
+            models.Index(fields=['team_a', 'date'], name='match_team_a_date_idx'),
+            models.Index(fields=['team_b', 'date'], name='match_team_b_date_idx'),
+            # Conflits de lieu : créneaux qui se chevauchent (&&) au même lieu d'un tournoi
+            GistIndex('tournament', 'location', TsTzRange('date', 'ends_at'), name='match_location_period_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(check=models.Q(ends_at__gt=models.F('date')), name='match_ends_after_start'),
+        ]
+
+    def clean(self):
+        """Les deux équipes doivent appartenir au tournoi du match"""
+        if self.team_a_id is None or self.team_b_id is None:
+            return
+        if self.team_a.tournament_id != self.team_b.tournament_id:
+            raise ValidationError("Les deux équipes doivent appartenir au même tournoi.")
+        if self.tournament_id is not None and self.tournament_id != self.team_a.tournament_id:
+            raise ValidationError({'tournament': "Le tournoi du match doit être celui des deux équipes."})
+        if self.date and self.ends_at and not self.date < self.ends_at <= self.date + MAX_MATCH_DURATION:
+            raise ValidationError({'ends_at': "La fin doit suivre le début de 12 heures au plus."})
+
+    def save(self, *args, **kwargs):
+        # Le tournoi se déduit des équipes s'il n'est pas fourni
+        if self.tournament_id is None and self.team_a_id is not None:
+            self.tournament_id = self.team_a.tournament_id
+        if self.ends_at is None and self.date is not None:
+            # date peut être une chaîne ISO (convertie ici comme à l'enregistrement)
+            self.ends_at = self._meta.get_field('date').to_python(self.date) + DEFAULT_MATCH_DURATION
+        super().save(*args, **kwargs)
+
+
+class Standing(models.Model):
+    """Ligne du classement d'une équipe dans son tournoi (voir matches.standings)"""
+    tournament = models.ForeignKey(Tournament, on_delete=models.CASCADE, related_name='standings', db_index=False)
+    team = models.OneToOneField(Team, on_delete=models.CASCADE, related_name='standing')
+    played = models.PositiveIntegerField(default=0)
+    wins = models.PositiveIntegerField(default=0)
+    draws = models.PositiveIntegerField(default=0)
+    losses = models.PositiveIntegerField(default=0)
+    goals_for = models.PositiveIntegerField(default=0)
+    goals_against = models.PositiveIntegerField(default=0)
+    goal_difference = models.IntegerField(default=0)
+    points = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'standings'
+        verbose_name = "standing"
+        verbose_name_plural = "standings"
+        indexes = [
+            # GET /api/tournaments/{id}/standings/ : lecture dans l'ordre du classement
+            models.Index(
+                fields=['tournament', '-points', '-goal_difference', '-goals_for', 'team'],
+                name='standing_ranking_idx',
+            ),
+        ]
@@ -0,0 +1,190 @@
+"""
+Génération du calendrier d'un tournoi (POST /api/tournaments/{id}/generate-schedule/)
+
+Deux formats :
+    - round_robin : toutes les paires, réparties en journées par la méthode
+      du cercle (une équipe fixe, les autres tournent) ; chaque équipe joue
+      au plus une fois par journée, une équipe exempte si le nombre est impair
+    - single_elimination : premier tour d'un tableau à élimination directe,
+      complété par des exemptions jusqu'à la puissance de 2 suivante (les
+      meilleures têtes de série sont exemptées). Les tours suivants dépendent
+      des résultats et se créent ensuite comme des matchs ordinaires.
+
+Les matchs d'une journée occupent des créneaux (lieu, heure) distincts : le
+créneau k va au lieu k % len(locations), à l'heure start + (k // len(locations))
+durées de match. Le calendrier est vérifié par balayage (sweep_conflicts)
+avant d'être inséré par un seul bulk_create.
+"""
+from datetime import timedelta
+
+from matches.conflicts import sweep_conflicts
+from matches.models import Match
+
+ROUND_ROBIN = 'round_robin'
+SINGLE_ELIMINATION = 'single_elimination'
+FORMATS = [ROUND_ROBIN, SINGLE_ELIMINATION]
+
+
+class ScheduleError(ValueError):
+    """Calendrier impossible avec les paramètres donnés (message pour l'utilisateur)"""
+
+
+def round_robin_rounds(team_ids, legs=1):
+    """
+    Journées d'un championnat par la méthode du cercle
+
+    Args:
+        team_ids: Les équipes (au moins 2)
+        legs: 1 (aller) ou 2 (aller-retour, domicile inversé)
+
+    Returns:
+        list: Une liste de paires (team_a_id, team_b_id) par journée
+    """
+    teams = list(team_ids)
+    if len(teams) % 2:
+        teams.append(None)  # exempt
+    n = len(teams)
+    fixed, rotating = teams[0], teams[1:]
+
+    rounds = []
+    for r in range(n - 1):
+        circle = [fixed] + rotating
+        pairs = []
+        for i in range(n // 2):
+            home, away = circle[i], circle[n - 1 - i]
+            if home is None or away is None:
+                continue
+            # Alterner le domicile de l'équipe fixe d'une journée à l'autre
+            if i == 0 and r % 2:
+                home, away = away, home
+            pairs.append((home, away))
+        rounds.append(pairs)
+        rotating = rotating[-1:] + rotating[:-1]
+
+    if legs == 2:
+        rounds += [[(away, home) for home, away in pairs] for pairs in rounds]
+    return rounds
+
+
+def bracket_seeds(size):
+    """
+    Ordre des têtes de série dans un tableau de taille size (puissance de 2)
+
+    bracket_seeds(8) -> [1, 8, 4, 5, 2, 7, 3, 6] : 1 et 2 ne se croisent qu'en finale
+    """
+    seeds = [1]
+    while len(seeds) < size:
+        total = len(seeds) * 2 + 1
+        seeds = [s for seed in seeds for s in (seed, total - seed)]
+    return seeds
+
+
+def single_elimination_round(team_ids):
+    """
+    Premier tour d'un tableau à élimination directe
+
+    Args:
+        team_ids: Les équipes dans l'ordre des têtes de série (au moins 2)
+
+    Returns:
+        tuple: (paires du premier tour, équipes exemptées, nombre de tours)
+    """
+    teams = list(team_ids)
+    size = 1
+    while size < len(teams):
+        size *= 2
+
+    pairs, byes = [], []
+    seeds = bracket_seeds(size)
+    for i in range(0, size, 2):
+        first, second = seeds[i], seeds[i + 1]
+        if second > len(teams):
+            byes.append(teams[first - 1])
+        else:
+            pairs.append((teams[first - 1], teams[second - 1]))
+    return [pairs], byes, size.bit_length() - 1
+
+
+def assign_slots(rounds, start, locations, match_duration, round_interval):
+    """
+    Place chaque match sur un créneau (lieu, heure) sans chevauchement
+
+    Args:
+        rounds: Paires par journée
+        start: Début de la première journée
+        locations: Les lieux disponibles
+        match_duration: Durée d'un créneau (timedelta)
+        round_interval: Écart entre deux journées (timedelta)
+
+    Returns:
+        list: (team_a_id, team_b_id, date, location), trié par date
+
+    Raises:
+        ScheduleError: Si une journée déborde sur la suivante
+    """
+    slots_per_round = max((len(pairs) for pairs in rounds), default=0)
+    waves = -(-slots_per_round // len(locations))
+    if len(rounds) > 1 and waves * match_duration > round_interval:
+        raise ScheduleError(
+            f"Une journée demande {waves} créneaux de {match_duration} : "
+            f"ajoutez des lieux ou espacez les journées."
+        )
+
+    fixtures = []
+    for r, pairs in enumerate(rounds):
+        day = start + r * round_interval
+        for k, (team_a_id, team_b_id) in enumerate(pairs):
+            date = day + (k // len(locations)) * match_duration
+            fixtures.append((team_a_id, team_b_id, date, locations[k % len(locations)]))
+    return sorted(fixtures, key=lambda fixture: fixture[2])
+
+
+def generate_schedule(tournament, team_ids, schedule_format, start, locations,
+                      match_duration_minutes=90, days_between_rounds=7, legs=1):
+    """
+    Crée les matchs du calendrier (un seul bulk_create)
+
+    Args:
+        tournament: Le tournoi
+        team_ids: Les équipes, dans l'ordre des têtes de série
+        schedule_format: ROUND_ROBIN ou SINGLE_ELIMINATION
+
+    Returns:
+        dict: Résumé (format, rounds, matches_created, byes, first_date, last_date)
+
+    Raises:
+        ScheduleError: Moins de deux équipes ou journées qui se chevauchent
+    """
+    if len(team_ids) < 2:
+        raise ScheduleError("Il faut au moins deux équipes pour générer un calendrier.")
+
+    byes = []
+    if schedule_format == ROUND_ROBIN:
+        rounds = round_robin_rounds(team_ids, legs=legs)
+        total_rounds = len(rounds)
+    else:
+        rounds, byes, total_rounds = single_elimination_round(team_ids)
+
+    duration = timedelta(minutes=match_duration_minutes)
+    fixtures = assign_slots(rounds, start, locations, duration, timedelta(days=days_between_rounds))
+    conflicts = sweep_conflicts(
+        (index, team_a_id, team_b_id, location, date, date + duration)
+        for index, (team_a_id, team_b_id, date, location) in enumerate(fixtures)
+    )
+    if conflicts:
+        raise ScheduleError(f"Le calendrier généré a {len(conflicts)} conflit(s) de lieu ou d'équipe.")
+
+    Match.objects.bulk_create([
+        Match(team_a_id=team_a_id, team_b_id=team_b_id, tournament_id=tournament.id,
+              date=date, ends_at=date + duration, location=location)
+        for team_a_id, team_b_id, date, location in fixtures
+    ], batch_size=1000)
+
+    return {
+        'format': schedule_format,
+        'rounds': total_rounds,
+        'matches_created': len(fixtures),
+        'byes': [str(team_id) for team_id in byes],
+        'first_date': min(date for _, _, date, _ in fixtures) if fixtures else None,
+        'last_date': max(date for _, _, date, _ in fixtures) if fixtures else None,
+    }
@@ -1,9 +1,36 @@
+from django.db import transaction
 from rest_framework import serializers
-from matches.models import Match
+from matches.conflicts import LOCATION, find_conflicts, lock_tournament
+from matches.models import DEFAULT_MATCH_DURATION, MAX_MATCH_DURATION, Match, Standing
+from matches.scheduling import FORMATS, ROUND_ROBIN
+from matches.standings import apply_result
 from tournaments.models import Team
 from tournaments.serializers import TeamListSerializer
 
 
+def check_slot(tournament_id, location, team_ids, start, end, exclude_id=None):
+    """
+    Valide un créneau [start, end) : durée, lieu libre, équipes libres
+
+    Verrouille le tournoi : à appeler dans la transaction qui écrit le match,
+    une écriture concurrente ne peut plus prendre le créneau entre-temps.
+
+    Raises:
+        serializers.ValidationError: Créneau invalide ou en conflit (un message par match)
+    """
+    if not start < end <= start + MAX_MATCH_DURATION:
+        raise serializers.ValidationError({"ends_at": "La fin doit suivre le début de 12 heures au plus."})
+
+    lock_tournament(tournament_id)
+    conflicts = find_conflicts(tournament_id, location, team_ids, start, end, exclude_id=exclude_id)
+    if conflicts:
+        raise serializers.ValidationError({"conflicts": [
+            f"{'Lieu occupé' if LOCATION in conflict['kinds'] else 'Équipe déjà en match'} "
+            f"par le match {conflict['match_id']} ({conflict['date'].isoformat()} - {conflict['ends_at'].isoformat()})"
+            for conflict in conflicts
+        ]})
+
+
 class MatchSerializer(serializers.ModelSerializer):
     """
     Serializer pour afficher un match avec toutes les informations
@@ -16,19 +43,19 @@ class MatchSerializer(serializers.ModelSerializer):
     class Meta:
         model = Match
         fields = [
-            'id', 'team_a', 'team_b', 'date', 'location',
+            'id', 'team_a', 'team_b', 'date', 'ends_at', 'location',
             'score_a', 'score_b', 'tournament_name', 'tournament_id',
             'created_at'
         ]
         read_only_fields = ['id', 'created_at']
 
     def get_tournament_name(self, obj):
-        """Retourne le nom du tournoi (les deux équipes doivent être du même tournoi)"""
-        return obj.team_a.tournament.name if obj.team_a.tournament else None
+        """Retourne le nom du tournoi du match"""
+        return obj.tournament.name
 
     def get_tournament_id(self, obj):
         """Retourne l'ID du tournoi"""
-        return str(obj.team_a.tournament.id) if obj.team_a.tournament else None
+        return str(obj.tournament_id)
 
 
 class MatchCreateSerializer(serializers.ModelSerializer):
@@ -36,13 +63,15 @@ class MatchCreateSerializer(serializers.ModelSerializer):
     Serializer pour créer un match
     - Vérifie que les deux équipes sont du même tournoi
     - Vérifie que l'organisateur est propriétaire du tournoi
+    - Vérifie que le lieu et les équipes sont libres sur le créneau (ends_at optionnel)
     """
     team_a_id = serializers.UUIDField(write_only=True)
     team_b_id = serializers.UUIDField(write_only=True)
+    ends_at = serializers.DateTimeField(required=False)
 
     class Meta:
         model = Match
-        fields = ['team_a_id', 'team_b_id', 'date', 'location', 'score_a', 'score_b']
+        fields = ['team_a_id', 'team_b_id', 'date', 'ends_at', 'location', 'score_a', 'score_b']
         read_only_fields = ['score_a', 'score_b']  # Les scores sont optionnels à la création
 
     def validate(self, data):
@@ -76,27 +105,36 @@ class MatchCreateSerializer(serializers.ModelSerializer):
                 "Une équipe ne peut pas jouer contre elle-même."
             )
 
+        data.setdefault('ends_at', data['date'] + DEFAULT_MATCH_DURATION)
+
         data['team_a'] = team_a
         data['team_b'] = team_b
+        data['tournament'] = team_a.tournament
         return data
 
     def create(self, validated_data):
-        """Crée le match"""
+        """Crée le match si le créneau est libre (vérifié sous le verrou du tournoi)"""
         # Retirer team_a_id et team_b_id car on utilise team_a et team_b
         validated_data.pop('team_a_id', None)
         validated_data.pop('team_b_id', None)
-        return Match.objects.create(**validated_data)
+        with transaction.atomic():
+            check_slot(validated_data['tournament'].id, validated_data['location'],
+                       [validated_data['team_a'].id, validated_data['team_b'].id],
+                       validated_data['date'], validated_data['ends_at'])
+            return Match.objects.create(**validated_data)
 
 
 class MatchUpdateSerializer(serializers.ModelSerializer):
     """
     Serializer pour modifier un match
-    - On ne peut modifier que la date, le lieu et les scores
+    - On ne peut modifier que la date, la fin, le lieu et les scores
     - On ne peut pas changer les équipes
+    - Un nouveau créneau ou lieu est vérifié (conflits) ; la date seule décale la fin
     """
     class Meta:
         model = Match
-        fields = ['date', 'location', 'score_a', 'score_b']
+        fields = ['date', 'ends_at', 'location', 'score_a', 'score_b']
+        extra_kwargs = {'ends_at': {'required': False}}
 
     def validate(self, data):
         """Validation optionnelle pour les scores"""
@@ -109,8 +147,36 @@ class MatchUpdateSerializer(serializers.ModelSerializer):
         if score_b is not None and score_b < 0:
             raise serializers.ValidationError({"score_b": "Le score ne peut pas être négatif."})
 
+        match = self.instance
+        if match is not None and {'date', 'ends_at', 'location'} & set(data):
+            start = data.get('date', match.date)
+            if 'ends_at' not in data:
+                # Même durée qu'avant
+                data['ends_at'] = start + (match.ends_at - match.date)
+
         return data
 
+    def update(self, instance, validated_data):
+        """
+        Enregistre le match et reporte le changement de score sur le classement
+        (un nouveau créneau est vérifié sous le verrou du tournoi)
+        """
+        slot = (validated_data.get('date', instance.date), validated_data.get('ends_at', instance.ends_at),
+                validated_data.get('location', instance.location))
+        with transaction.atomic():
+            if slot != (instance.date, instance.ends_at, instance.location):
+                start, end, location = slot
+                check_slot(instance.tournament_id, location, [instance.team_a_id, instance.team_b_id],
+                           start, end, exclude_id=instance.id)
+            # Scores relus sous verrou : deux modifications simultanées ne partent pas du même score
+            old_scores = Match.objects.select_for_update().filter(id=instance.id).values_list(
+                'score_a', 'score_b'
+            ).get()
+            instance.score_a, instance.score_b = old_scores
+            match = super().update(instance, validated_data)
+            apply_result(match, old_scores, (match.score_a, match.score_b))
+        return match
+
 
 class MatchListSerializer(serializers.ModelSerializer):
     """
@@ -118,12 +184,70 @@ class MatchListSerializer(serializers.ModelSerializer):
     """
     team_a_name = serializers.CharField(source='team_a.name', read_only=True)
     team_b_name = serializers.CharField(source='team_b.name', read_only=True)
-    tournament_name = serializers.CharField(source='team_a.tournament.name', read_only=True)
+    tournament_name = serializers.CharField(source='tournament.name', read_only=True)
 
     class Meta:
         model = Match
         fields = [
-            'id', 'team_a_name', 'team_b_name', 'date', 'location',
+            'id', 'team_a_name', 'team_b_name', 'date', 'ends_at', 'location',
             'score_a', 'score_b', 'tournament_name', 'created_at'
         ]
 
+
+
+class StandingSerializer(serializers.ModelSerializer):
+    """
+    Ligne du classement d'un tournoi (rank est calculé par la vue)
+    """
+    team_id = serializers.UUIDField(read_only=True)
+    team_name = serializers.CharField(source='team.name', read_only=True)
+    rank = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Standing
+        fields = [
+            'rank', 'team_id', 'team_name', 'played', 'wins', 'draws', 'losses',
+            'goals_for', 'goals_against', 'goal_difference', 'points'
+        ]
+
+
+class ScheduleGenerateSerializer(serializers.Serializer):
+    """
+    Paramètres de POST /api/tournaments/{id}/generate-schedule/ (voir matches.scheduling)
+    """
+    format = serializers.ChoiceField(choices=FORMATS, default=ROUND_ROBIN)
+    start = serializers.DateTimeField()
+    locations = serializers.ListField(
+        child=serializers.CharField(max_length=200), min_length=1, max_length=50, default=['Terrain 1']
+    )
+    match_duration_minutes = serializers.IntegerField(min_value=15, max_value=600, default=90)
+    days_between_rounds = serializers.IntegerField(min_value=1, max_value=60, default=7)
+    legs = serializers.ChoiceField(choices=[1, 2], default=1)
+    replace = serializers.BooleanField(default=False)
+
+    def validate_locations(self, value):
+        """Lieux distincts : deux créneaux d'un même lieu se chevaucheraient"""
+        locations = [location.strip() for location in value]
+        if len(set(locations)) != len(locations) or not all(locations):
+            raise serializers.ValidationError("Les lieux doivent être distincts et non vides.")
+        return locations
+
+
+class ConflictCheckSerializer(serializers.Serializer):
+    """
+    Créneau candidat de GET /api/matches/conflicts/ (sans date : rapport du tournoi)
+    """
+    tournament_id = serializers.UUIDField()
+    date = serializers.DateTimeField(required=False)
+    ends_at = serializers.DateTimeField(required=False)
+    location = serializers.CharField(max_length=200, required=False, default='')
+    team_id = serializers.ListField(child=serializers.UUIDField(), required=False, default=list)
+    exclude = serializers.UUIDField(required=False)
+
+    def validate(self, data):
+        """La fin par défaut suit le début de la durée d'un match"""
+        if 'date' in data:
+            data.setdefault('ends_at', data['date'] + DEFAULT_MATCH_DURATION)
+            if not data['date'] < data['ends_at'] <= data['date'] + MAX_MATCH_DURATION:
+                raise serializers.ValidationError({"ends_at": "La fin doit suivre le début de 12 heures au plus."})
+        return data
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from tournaments.models import Team
+
+from .standings import create_standing
+
+
+@receiver(post_save, sender=Team)
+def create_team_standing(sender, instance, created, **kwargs):
+    """Chaque équipe a sa ligne de classement dès sa création"""
+    if created:
+        create_standing(instance)
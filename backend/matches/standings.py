@@ -0,0 +1,137 @@
+"""
+Classements des tournois : une ligne Standing par équipe
+
+Un match compte quand ses deux scores sont saisis : victoire 3 points,
+nul 1 point, défaite 0. Les lignes sont tenues à jour par différence :
+    - MatchUpdateSerializer et la suppression d'un match appellent
+      apply_result(match, anciens scores, nouveaux scores), qui ajoute la
+      différence des deux contributions aux deux équipes (2 UPDATE)
+    - Une ligne vide est créée avec chaque équipe (signal)
+    - rebuild_standings() recalcule tout en une requête (commande
+      rebuild_standings, migration)
+"""
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+
+from matches.models import Match, Standing
+from tournaments.models import Team
+
+POINTS_WIN = 3
+POINTS_DRAW = 1
+COUNTERS = ['played', 'wins', 'draws', 'losses', 'goals_for', 'goals_against', 'goal_difference', 'points']
+
+# Ordre du classement (même ordre que l'index standing_ranking_idx)
+RANKING_ORDER = ['-points', '-goal_difference', '-goals_for', 'team_id']
+
+
+def contribution(goals_for, goals_against):
+    """
+    Ce qu'un match apporte au classement d'une équipe
+
+    Returns:
+        dict: Compteurs (vide si le match n'a pas ses deux scores)
+    """
+    if goals_for is None or goals_against is None:
+        return {}
+    won, drawn = goals_for > goals_against, goals_for == goals_against
+    return {
+        'played': 1,
+        'wins': int(won),
+        'draws': int(drawn),
+        'losses': int(not won and not drawn),
+        'goals_for': goals_for,
+        'goals_against': goals_against,
+        'goal_difference': goals_for - goals_against,
+        'points': POINTS_WIN if won else POINTS_DRAW if drawn else 0,
+    }
+
+
+def apply_result(match, old_scores, new_scores):
+    """
+    Reporte un changement de score sur les lignes des deux équipes
+
+    À appeler dans la transaction qui modifie (ou supprime) le match.
+
+    Args:
+        match: Le match (team_a_id, team_b_id, tournament_id)
+        old_scores: (score_a, score_b) avant la modification
+        new_scores: (score_a, score_b) après ((None, None) pour une suppression)
+    """
+    (old_a, old_b), (new_a, new_b) = old_scores, new_scores
+    now = timezone.now()
+    for team_id, old, new in (
+        (match.team_a_id, contribution(old_a, old_b), contribution(new_a, new_b)),
+        (match.team_b_id, contribution(old_b, old_a), contribution(new_b, new_a)),
+    ):
+        changes = {
+            field: F(field) + (new.get(field, 0) - old.get(field, 0))
+            for field in COUNTERS
+            if new.get(field, 0) != old.get(field, 0)
+        }
+        if not changes:
+            continue
+        if not Standing.objects.filter(team_id=team_id).update(**changes, updated_at=now):
+            # Ligne absente (équipe antérieure aux classements) : le tournoi est recalculé
+            rebuild_standings(tournament_id=match.tournament_id)
+            return
+
+
+def create_standing(team):
+    """Ligne vide pour une nouvelle équipe (sans effet si elle existe déjà)"""
+    Standing.objects.bulk_create(
+        [Standing(tournament_id=team.tournament_id, team_id=team.id)],
+        ignore_conflicts=True,
+    )
+
+
+def rebuild_standings(tournament_id=None):
+    """
+    Recalcule les classements à partir des matchs (INSERT ... ON CONFLICT)
+
+    Args:
+        tournament_id: Limiter à un tournoi
+
+    Returns:
+        int: Le nombre de lignes écrites
+    """
+    scored = 'score_a IS NOT NULL AND score_b IS NOT NULL'
+    team_filter = match_filter = ''
+    params = []
+    if tournament_id is not None:
+        match_filter = 'AND tournament_id = %s'
+        team_filter = 'WHERE team.tournament_id = %s'
+        params = [tournament_id, tournament_id, tournament_id]
+
+    sql = f"""
+        INSERT INTO {Standing._meta.db_table} AS standing
+            (tournament_id, team_id, played, wins, draws, losses,
+             goals_for, goals_against, goal_difference, points, updated_at)
+        SELECT team.tournament_id, team.id,
+               count(side.team_id),
+               count(*) FILTER (WHERE side.goals_for > side.goals_against),
+               count(*) FILTER (WHERE side.goals_for = side.goals_against),
+               count(*) FILTER (WHERE side.goals_for < side.goals_against),
+               coalesce(sum(side.goals_for), 0),
+               coalesce(sum(side.goals_against), 0),
+               coalesce(sum(side.goals_for - side.goals_against), 0),
+               {POINTS_WIN} * count(*) FILTER (WHERE side.goals_for > side.goals_against)
+                 + {POINTS_DRAW} * count(*) FILTER (WHERE side.goals_for = side.goals_against),
+               now()
+        FROM {Team._meta.db_table} AS team
+        LEFT JOIN (
+            SELECT team_a_id AS team_id, score_a AS goals_for, score_b AS goals_against
+            FROM {Match._meta.db_table} WHERE {scored} {match_filter}
+            UNION ALL
+            SELECT team_b_id, score_b, score_a
+            FROM {Match._meta.db_table} WHERE {scored} {match_filter}
+        ) AS side ON side.team_id = team.id
+        {team_filter}
+        GROUP BY team.id
+        ON CONFLICT (team_id) DO UPDATE SET
+            {', '.join(f'{field} = EXCLUDED.{field}' for field in COUNTERS)},
+            updated_at = EXCLUDED.updated_at
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
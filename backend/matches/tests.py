@@ -1,3 +1,489 @@
-from django.test import TestCase
+import threading
+import time
+from datetime import timedelta
 
-# Create your tests here.
+import jwt
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from TeamSportFinder.testing import QueryBudgetTestCase
+from clerk_auth.utils import token_cache
+from accounts.models import User
+from matches.models import Match, Standing
+from matches.conflicts import sweep_conflicts
+from matches.scheduling import bracket_seeds, round_robin_rounds, single_elimination_round
+from matches.serializers import MatchUpdateSerializer
+from matches.views import MatchViewSet
+from matches.standings import rebuild_standings
+from tournaments.models import Team, Tournament
+
+
+class MatchTournamentTests(TestCase):
+    """Tournoi dénormalisé sur le match"""
+
+    @classmethod
+    def setUpTestData(cls):
+        organizer = User.objects.create(
+            clerk_id='org_1', email='org@example.com', full_name='Org', role='organizer'
+        )
+        cls.tournament, cls.other = [
+            Tournament.objects.create(name=name, sport='Soccer', city='Laval',
+                                      start_date='2025-12-01', organizer=organizer)
+            for name in ('Ligue A', 'Ligue B')
+        ]
+        cls.team_a = Team.objects.create(name='A', tournament=cls.tournament)
+        cls.team_b = Team.objects.create(name='B', tournament=cls.tournament)
+        cls.outsider = Team.objects.create(name='C', tournament=cls.other)
+
+    def test_tournament_defaults_to_teams(self):
+        match = Match.objects.create(team_a=self.team_a, team_b=self.team_b,
+                                     date='2026-03-01T18:00:00Z', location='Stade')
+        self.assertEqual(match.tournament, self.tournament)
+
+    def test_teams_must_share_the_tournament(self):
+        match = Match(team_a=self.team_a, team_b=self.outsider, date='2026-03-01T18:00:00Z', location='Stade')
+        with self.assertRaises(ValidationError):
+            match.full_clean()
+
+        match = Match(team_a=self.team_a, team_b=self.team_b, tournament=self.other,
+                      date='2026-03-01T18:00:00Z', location='Stade')
+        with self.assertRaises(ValidationError) as error:
+            match.full_clean()
+        self.assertIn('tournament', error.exception.message_dict)
+
+
+@override_settings(CLERK_JWKS_URL=None)
+class PlayerScheduleTests(TestCase):
+    """Calendrier du joueur : sans doublon, paginé par curseur sur la date"""
+
+    @classmethod
+    def setUpTestData(cls):
+        organizer = User.objects.create(
+            clerk_id='org_1', email='org@example.com', full_name='Org', role='organizer'
+        )
+        cls.player = User.objects.create(
+            clerk_id='player_1', email='player@example.com', full_name='Player', role='player'
+        )
+        tournament = Tournament.objects.create(name='Ligue', sport='Soccer', city='Laval',
+                                               start_date='2025-12-01', organizer=organizer)
+        mine, also_mine, other = [Team.objects.create(name=name, tournament=tournament) for name in 'ABC']
+        mine.members.add(cls.player)
+        also_mine.members.add(cls.player)
+
+        now = timezone.now()
+        cls.upcoming = [
+            Match.objects.create(team_a=team_a, team_b=team_b, date=now + timedelta(days=day), location='Stade')
+            for day, (team_a, team_b) in enumerate([(mine, other), (other, also_mine), (mine, also_mine)] * 2, 1)
+        ]
+        Match.objects.create(team_a=mine, team_b=other, date=now - timedelta(days=1), location='Stade')
+        Match.objects.create(team_a=other, team_b=other, date=now + timedelta(days=1), location='Stade')
+
+    def get(self, url):
+        token = jwt.encode({'sub': 'player_1', 'exp': int(time.time()) + 300}, 'dev', algorithm='HS256')
+        response = self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_upcoming_pages_follow_dates(self):
+        ids = []
+        url = '/api/matches/my/?filter=upcoming&page_size=4'
+        while url:
+            page = self.get(url)
+            ids.extend(match['id'] for match in page['results'])
+            url = page['next']
+        # Un match entre deux équipes du joueur n'apparaît qu'une fois
+        self.assertEqual(ids, [str(match.id) for match in self.upcoming])
+
+    def test_schedule_revalidation(self):
+        token = jwt.encode({'sub': 'player_1', 'exp': int(time.time()) + 300}, 'dev', algorithm='HS256')
+        url = '/api/matches/my/?filter=upcoming'
+        etag = self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {token}')['ETag']
+        response = self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {token}', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # Score saisi : nouvelle version
+        match = self.upcoming[0]
+        match.score_a = 1
+        match.save()
+        response = self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {token}', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_list_has_no_duplicates(self):
+        self.assertEqual(self.get('/api/matches/')['count'], len(self.upcoming) + 1)
+
+
+@override_settings(CLERK_JWKS_URL=None)
+class StandingsTests(TestCase):
+    """Classement tenu à jour par différence, identique au recalcul complet"""
+
+    @classmethod
+    def setUpTestData(cls):
+        organizer = User.objects.create(
+            clerk_id='org_1', email='org@example.com', full_name='Org', role='organizer'
+        )
+        User.objects.create(clerk_id='player_1', email='player@example.com', full_name='Player', role='player')
+        cls.tournament = Tournament.objects.create(name='Ligue', sport='Soccer', city='Laval',
+                                                   start_date='2025-12-01', organizer=organizer)
+        cls.a, cls.b, cls.c = [Team.objects.create(name=name, tournament=cls.tournament) for name in 'ABC']
+        cls.ab = Match.objects.create(team_a=cls.a, team_b=cls.b, date='2026-03-01T18:00:00Z', location='Stade')
+        cls.bc = Match.objects.create(team_a=cls.b, team_b=cls.c, date='2026-03-08T18:00:00Z', location='Stade')
+
+    def request(self, method, url, data=None, clerk_id='org_1'):
+        token = jwt.encode({'sub': clerk_id, 'exp': int(time.time()) + 300}, 'dev', algorithm='HS256')
+        return getattr(self.client, method)(url, data, content_type='application/json',
+                                            HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def score(self, match, score_a, score_b):
+        response = self.request('patch', f'/api/matches/{match.id}/', {'score_a': score_a, 'score_b': score_b})
+        self.assertEqual(response.status_code, 200)
+
+    def table(self):
+        return {
+            s.team.name: (s.played, s.wins, s.draws, s.losses, s.goals_for, s.goals_against, s.points)
+            for s in Standing.objects.filter(tournament=self.tournament).select_related('team')
+        }
+
+    def test_new_team_has_empty_row(self):
+        self.assertEqual(self.table()['C'], (0, 0, 0, 0, 0, 0, 0))
+
+    def test_score_set_changed_and_cleared(self):
+        self.score(self.ab, 2, 1)
+        self.assertEqual(self.table()['A'], (1, 1, 0, 0, 2, 1, 3))
+        self.assertEqual(self.table()['B'], (1, 0, 0, 1, 1, 2, 0))
+
+        self.score(self.ab, 1, 1)
+        self.assertEqual(self.table()['A'], (1, 0, 1, 0, 1, 1, 1))
+        self.assertEqual(self.table()['B'], (1, 0, 1, 0, 1, 1, 1))
+
+        self.score(self.ab, None, None)
+        self.assertEqual(self.table()['A'], (0, 0, 0, 0, 0, 0, 0))
+
+    def test_destroy_removes_result(self):
+        self.score(self.bc, 0, 3)
+        self.assertEqual(self.request('delete', f'/api/matches/{self.bc.id}/').status_code, 204)
+        self.assertEqual(self.table()['C'], (0, 0, 0, 0, 0, 0, 0))
+
+    def test_stale_instance_uses_locked_scores(self):
+        # Deux modifications simultanées : la seconde a lu le match avant la première
+        stale = Match.objects.get(id=self.ab.id)
+        self.score(self.ab, 2, 1)
+        serializer = MatchUpdateSerializer(stale, data={'score_a': 3, 'score_b': 0}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        self.assertEqual(self.table()['A'], (1, 1, 0, 0, 3, 0, 3))
+
+        stale = Match.objects.get(id=self.ab.id)
+        self.score(self.ab, None, None)
+        MatchViewSet().perform_destroy(stale)
+        self.assertEqual(self.table()['A'], (0, 0, 0, 0, 0, 0, 0))
+
+    def test_incremental_matches_rebuild(self):
+        self.score(self.ab, 4, 0)
+        self.score(self.bc, 2, 2)
+        self.score(self.ab, 0, 1)
+        incremental = self.table()
+        Standing.objects.update(points=0, wins=0, goals_for=0)
+        self.assertEqual(rebuild_standings(tournament_id=self.tournament.id), 3)
+        self.assertEqual(self.table(), incremental)
+
+    def test_missing_row_is_rebuilt(self):
+        Standing.objects.filter(team=self.c).delete()
+        self.score(self.bc, 1, 2)
+        self.assertEqual(self.table()['C'], (1, 1, 0, 0, 2, 1, 3))
+
+    def test_endpoint_ranks_teams(self):
+        self.score(self.ab, 1, 0)
+        self.score(self.bc, 0, 2)
+        response = self.request('get', f'/api/tournaments/{self.tournament.id}/standings/', clerk_id='player_1')
+        self.assertEqual(response.status_code, 200)
+        # A et C à 3 points : C devant à la différence de buts
+        self.assertEqual([row['team_name'] for row in response.json()], ['C', 'A', 'B'])
+        self.assertEqual([row['rank'] for row in response.json()], [1, 2, 3])
+
+    def test_endpoint_unknown_tournament(self):
+        url = '/api/tournaments/00000000-0000-4000-8000-000000000000/standings/'
+        self.assertEqual(self.request('get', url, clerk_id='player_1').status_code, 404)
+
+
+class ScheduleGeneratorTests(TestCase):
+    """Méthode du cercle et premier tour à élimination directe"""
+
+    def test_round_robin_plays_every_pair_once(self):
+        for count in (5, 8):
+            rounds = round_robin_rounds(range(count))
+            self.assertEqual(len(rounds), count - 1 + count % 2)
+            pairs = [frozenset(pair) for day in rounds for pair in day]
+            self.assertEqual(len(pairs), count * (count - 1) // 2)
+            self.assertEqual(len(set(pairs)), len(pairs))
+            for day in rounds:
+                teams = [team for pair in day for team in pair]
+                self.assertEqual(len(teams), len(set(teams)))
+
+    def test_return_legs_swap_home(self):
+        rounds = round_robin_rounds('ABCD', legs=2)
+        self.assertEqual(len(rounds), 6)
+        self.assertEqual(rounds[3], [(b, a) for a, b in rounds[0]])
+
+    def test_bracket_byes_go_to_top_seeds(self):
+        self.assertEqual(bracket_seeds(8), [1, 8, 4, 5, 2, 7, 3, 6])
+        rounds, byes, total = single_elimination_round('ABCDEF')
+        self.assertEqual(byes, ['A', 'B'])
+        self.assertEqual(rounds, [[('D', 'E'), ('C', 'F')]])
+        self.assertEqual(total, 3)
+
+
+@override_settings(CLERK_JWKS_URL=None)
+class GenerateScheduleTests(TestCase):
+    """POST /api/tournaments/{id}/generate-schedule/"""
+
+    @classmethod
+    def setUpTestData(cls):
+        organizer = User.objects.create(
+            clerk_id='org_1', email='org@example.com', full_name='Org', role='organizer'
+        )
+        cls.tournament = Tournament.objects.create(name='Ligue', sport='Soccer', city='Laval',
+                                                   start_date='2025-12-01', organizer=organizer)
+        Team.objects.bulk_create([Team(name=f'Équipe {i}', tournament=cls.tournament) for i in range(64)])
+        cls.url = f'/api/tournaments/{cls.tournament.id}/generate-schedule/'
+
+    def post(self, data):
+        token = jwt.encode({'sub': 'org_1', 'exp': int(time.time()) + 300}, 'dev', algorithm='HS256')
+        return self.client.post(self.url, data, content_type='application/json',
+                                HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_league_of_64_teams(self):
+        data = {'start': '2026-04-04T09:00:00Z', 'locations': [f'Terrain {i}' for i in range(1, 9)],
+                'match_duration_minutes': 60}
+        # Temps mesuré par python manage.py benchmark_schedule
+        token_cache.clear()  # l'utilisateur est relu, quel que soit l'ordre des tests
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post(data)
+        self.assertEqual(response.status_code, 201)
+        # Le nombre de requêtes ne dépend que des lots de 1000 matchs du bulk_create
+        self.assertEqual(len(queries), 10)
+        self.assertEqual(response.json()['matches_created'], 2016)
+        self.assertEqual(response.json()['rounds'], 63)
+
+        matches = list(Match.objects.filter(tournament=self.tournament).values_list(
+            'team_a_id', 'team_b_id', 'date', 'location'))
+        self.assertEqual(len(matches), 2016)
+        # Aucun lieu ni aucune équipe sur deux matchs à la même heure
+        self.assertEqual(len({(date, location) for _, _, date, location in matches}), 2016)
+        busy = [(team, date) for a, b, date, _ in matches for team in (a, b)]
+        self.assertEqual(len(set(busy)), len(busy))
+
+    def test_existing_matches_need_replace(self):
+        data = {'start': '2026-04-04T09:00:00Z', 'format': 'single_elimination', 'locations': ['A', 'B']}
+        self.assertEqual(self.post(data).status_code, 201)
+        self.assertEqual(self.post(data).status_code, 400)
+        response = self.post({**data, 'replace': True})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Match.objects.filter(tournament=self.tournament).count(), 32)
+
+    def test_overflowing_round_is_rejected(self):
+        response = self.post({'start': '2026-04-04T09:00:00Z', 'days_between_rounds': 1})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Match.objects.exists())
+
+
+@override_settings(CLERK_JWKS_URL=None)
+class ConflictTests(TestCase):
+    """Lieu et équipes libres sur le créneau : création, modification, rapport"""
+
+    @classmethod
+    def setUpTestData(cls):
+        organizer = User.objects.create(
+            clerk_id='org_1', email='org@example.com', full_name='Org', role='organizer'
+        )
+        cls.tournament = Tournament.objects.create(name='Ligue', sport='Soccer', city='Laval',
+                                                   start_date='2025-12-01', organizer=organizer)
+        cls.a, cls.b, cls.c, cls.d = [Team.objects.create(name=name, tournament=cls.tournament) for name in 'ABCD']
+        cls.ab = Match.objects.create(team_a=cls.a, team_b=cls.b, date='2026-03-01T18:00:00Z', location='Stade')
+
+    def request(self, method, url, data=None):
+        token = jwt.encode({'sub': 'org_1', 'exp': int(time.time()) + 300}, 'dev', algorithm='HS256')
+        return getattr(self.client, method)(url, data, content_type='application/json',
+                                            HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def create(self, team_a, team_b, date, location):
+        return self.request('post', '/api/matches/', {
+            'team_a_id': str(team_a.id), 'team_b_id': str(team_b.id), 'date': date, 'location': location,
+        })
+
+    def test_default_duration(self):
+        self.ab.refresh_from_db()
+        self.assertEqual(self.ab.ends_at - self.ab.date, timedelta(minutes=90))
+
+    def test_location_taken(self):
+        response = self.create(self.c, self.d, '2026-03-01T19:00:00Z', 'Stade')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Lieu occupé', response.json()['conflicts'][0])
+        # Fin du créneau précédent : [début, fin) ne se chevauchent pas
+        self.assertEqual(self.create(self.c, self.d, '2026-03-01T19:30:00Z', 'Stade').status_code, 201)
+
+    def test_team_busy_elsewhere(self):
+        response = self.create(self.c, self.b, '2026-03-01T18:30:00Z', 'Parc')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Équipe déjà en match', response.json()['conflicts'][0])
+        self.assertEqual(self.create(self.c, self.d, '2026-03-01T18:30:00Z', 'Parc').status_code, 201)
+
+    def test_move_keeps_duration_and_ignores_itself(self):
+        url = f'/api/matches/{self.ab.id}/'
+        self.assertEqual(self.request('patch', url, {'date': '2026-03-01T18:30:00Z'}).status_code, 200)
+        self.ab.refresh_from_db()
+        self.assertEqual(self.ab.ends_at - self.ab.date, timedelta(minutes=90))
+
+        Match.objects.create(team_a=self.c, team_b=self.d, date='2026-03-02T18:00:00Z', location='Stade')
+        self.assertEqual(self.request('patch', url, {'date': '2026-03-02T17:00:00Z'}).status_code, 400)
+        self.assertEqual(self.request('patch', url, {'score_a': 1, 'score_b': 0}).status_code, 200)
+
+    def test_report_and_check(self):
+        Match.objects.create(team_a=self.c, team_b=self.a, date='2026-03-01T19:00:00Z', location='Stade')
+        url = f'/api/matches/conflicts/?tournament_id={self.tournament.id}'
+        report = self.request('get', url).json()
+        self.assertEqual(report['count'], 2)
+        self.assertEqual({conflict['kind'] for conflict in report['conflicts']}, {'location', 'team'})
+
+        check = self.request('get', f'{url}&date=2026-03-01T17:00:00Z&location=Parc&team_id={self.b.id}').json()
+        self.assertEqual([conflict['match_id'] for conflict in check['conflicts']], [str(self.ab.id)])
+        check = self.request('get', f'{url}&date=2026-03-01T16:00:00Z&location=Stade&team_id={self.b.id}').json()
+        self.assertEqual(check['count'], 0)
+
+    def test_sweep(self):
+        slots = [
+            (1, 'A', 'B', 'Stade', 0, 90),
+            (2, 'C', 'D', 'Stade', 60, 150),
+            (3, 'A', 'D', 'Parc', 100, 190),
+            (4, 'E', 'E', 'Parc', 190, 200),
+        ]
+        self.assertEqual(sweep_conflicts(slots), [('location', 'Stade', 1, 2), ('team', 'D', 2, 3)])
+
+
+@override_settings(CLERK_JWKS_URL=None)
+class ParallelScheduleTests(TransactionTestCase):
+    """Écritures simultanées : un créneau n'est réservé qu'une fois, un calendrier n'est généré qu'une fois"""
+
+    def setUp(self):
+        organizer = User.objects.create(
+            clerk_id='org_1', email='org@example.com', full_name='Org', role='organizer'
+        )
+        self.tournament = Tournament.objects.create(name='Ligue', sport='Soccer', city='Laval',
+                                                    start_date='2025-12-01', organizer=organizer)
+        self.teams = Team.objects.bulk_create([Team(name=f'Équipe {i}', tournament=self.tournament)
+                                               for i in range(16)])
+
+    def run_parallel(self, requests):
+        token = jwt.encode({'sub': 'org_1', 'exp': int(time.time()) + 300}, 'dev', algorithm='HS256')
+        barrier = threading.Barrier(len(requests))
+        statuses = []
+
+        def worker(method, url, data):
+            try:
+                barrier.wait()
+                response = getattr(Client(), method)(url, data, content_type='application/json',
+                                                     HTTP_AUTHORIZATION=f'Bearer {token}')
+                statuses.append(response.status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=request) for request in requests]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return statuses
+
+    def test_parallel_creates_same_location(self):
+        statuses = self.run_parallel([
+            ('post', '/api/matches/', {'team_a_id': str(a.id), 'team_b_id': str(b.id),
+                                       'date': '2026-03-01T18:00:00Z', 'location': 'Stade'})
+            for a, b in zip(self.teams[::2], self.teams[1::2])
+        ])
+        self.assertEqual(sorted(statuses), [201] + [400] * 7)
+        self.assertEqual(Match.objects.filter(tournament=self.tournament).count(), 1)
+
+    def test_parallel_moves_same_location(self):
+        matches = Match.objects.bulk_create([
+            Match(team_a=a, team_b=b, tournament=self.tournament, location='Stade',
+                  date=f'2026-03-0{day}T18:00:00Z', ends_at=f'2026-03-0{day}T19:30:00Z')
+            for day, (a, b) in enumerate(zip(self.teams[::2], self.teams[1::2]), 1)
+        ])
+        statuses = self.run_parallel([
+            ('patch', f'/api/matches/{match.id}/', {'date': '2026-04-01T18:00:00Z'}) for match in matches
+        ])
+        self.assertEqual(sorted(statuses), [200] + [400] * 7)
+        self.assertEqual(Match.objects.filter(date='2026-04-01T18:00:00Z').count(), 1)
+
+    def test_parallel_schedule_generation(self):
+        url = f'/api/tournaments/{self.tournament.id}/generate-schedule/'
+        statuses = self.run_parallel([('post', url, {'start': '2026-04-04T09:00:00Z'})] * 4)
+        self.assertEqual(sorted(statuses), [201] + [400] * 3)
+        self.assertEqual(Match.objects.filter(tournament=self.tournament).count(), 120)
+
+        statuses = self.run_parallel([('post', url, {'start': '2026-05-02T09:00:00Z', 'replace': True})] * 4)
+        self.assertEqual(statuses, [201] * 4)
+        self.assertEqual(Match.objects.filter(tournament=self.tournament).count(), 120)
+
+
+class MatchQueryBudgetTests(QueryBudgetTestCase):
+    """Budgets de requêtes SQL des actions de MatchViewSet"""
+
+    def test_list_player(self):
+        self.assertQueryBudget('matches-list (joueur)', 'get', '/api/matches/', self.player, budget=4)
+
+    def test_list_organizer(self):
+        self.assertQueryBudget('matches-list (organisateur)', 'get', '/api/matches/', self.organizer, budget=3)
+
+    def test_list_tournament(self):
+        url = f'/api/matches/?tournament_id={self.tournament.id}'
+        response = self.assertQueryBudget('matches-list (tournoi)', 'get', url, self.organizer, budget=3)
+        self.assertTrue(response.json()['results'])
+        self.assertEqual({m['tournament_name'] for m in response.json()['results']}, {self.tournament.name})
+
+    def test_retrieve(self):
+        url = f'/api/matches/{self.match.id}/'
+        self.assertQueryBudget('matches-detail', 'get', url, self.organizer, budget=2)
+
+    def test_my_player(self):
+        self.assertQueryBudget('matches-my (joueur)', 'get', '/api/matches/my/?filter=upcoming',
+                               self.player, budget=4)
+
+    def test_my_player_not_modified(self):
+        url = '/api/matches/my/?filter=upcoming'
+        etag = self.request('get', url, self.player)[0]['ETag']
+        self.assertQueryBudget('matches-my (joueur, 304)', 'get', url, self.player, budget=3,
+                               status=304, headers={'HTTP_IF_NONE_MATCH': etag})
+
+    def test_my_organizer(self):
+        self.assertQueryBudget('matches-my (organisateur)', 'get', '/api/matches/my/',
+                               self.organizer, budget=3)
+
+    # Un créneau est vérifié sous le verrou du tournoi (SELECT ... FOR UPDATE dans une transaction)
+    def test_create(self):
+        data = {
+            'team_a_id': str(self.match.team_a_id),
+            'team_b_id': str(self.match.team_b_id),
+            'date': '2026-03-01T18:00:00Z',
+            'location': 'Stade',
+        }
+        self.assertQueryBudget('matches-create', 'post', '/api/matches/', self.organizer,
+                               budget=9, data=data, status=201)
+
+    def test_update(self):
+        url = f'/api/matches/{self.match.id}/'
+        data = {'date': '2026-03-01T18:00:00Z', 'location': 'Stade', 'score_a': 2, 'score_b': 1}
+        self.assertQueryBudget('matches-update', 'put', url, self.organizer, budget=11, data=data)
+
+    def test_partial_update(self):
+        url = f'/api/matches/{self.match.id}/'
+        self.assertQueryBudget('matches-partial-update', 'patch', url, self.organizer, budget=9,
+                               data={'score_a': 3, 'score_b': 3})
+
+    def test_destroy(self):
+        url = f'/api/matches/{self.match.id}/'
+        self.assertQueryBudget('matches-destroy', 'delete', url, self.organizer, budget=7, status=204)
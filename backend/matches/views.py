@@ -1,37 +1,76 @@
+import uuid
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.pagination import CursorPagination
 from django.utils import timezone
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Count, Max, Q
 
 from matches.models import Match
+from matches.conflicts import find_conflicts, tournament_conflicts
+from matches.standings import apply_result
 from matches.serializers import (
+    ConflictCheckSerializer,
     MatchSerializer,
     MatchCreateSerializer,
     MatchUpdateSerializer,
     MatchListSerializer
 )
+from TeamSportFinder.conditional import conditional_get
+from TeamSportFinder.rows import ValuesRowsMixin
 from accounts.permissions import IsOrganizer, IsPlayerOrOrganizer
-from tournaments.models import Team
+from tournaments.models import Team, Tournament
+
+
+class MatchScheduleCursorPagination(CursorPagination):
+    """
+    Pagination par curseur sur la date (les plus proches d'abord) : la page
+    suivante reprend après le dernier match lu, sans OFFSET
+    """
+    ordering = ('date', 'id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+def my_matches_version(view, request, *args, **kwargs):
+    """
+    Version de GET /api/matches/my/ : une requête d'agrégat sur les matchs
+    listés (nombre, dernières modifications des matchs, équipes et tournois)
+    """
+    stamp = view.get_my_queryset().aggregate(
+        count=Count('id'),
+        match=Max('updated_at'),
+        team_a=Max('team_a__updated_at'),
+        team_b=Max('team_b__updated_at'),
+        tournament=Max('tournament__updated_at'),
+    )
+    modified = max((value for key, value in stamp.items() if key != 'count' and value is not None), default=None)
+    return tuple(stamp.values()), modified
 
 
-class MatchViewSet(viewsets.ModelViewSet):
+class MatchViewSet(ValuesRowsMixin, viewsets.ModelViewSet):
     """
     ViewSet pour gérer les matchs
     
     Endpoints:
-    - GET /api/matches/ : Lister les matchs (selon le rôle)
+    - GET /api/matches/ : Lister les matchs (selon le rôle, ?tournament_id=... optionnel)
     - GET /api/matches/{id}/ : Détails d'un match
-    - GET /api/matches/my/ : Mes matchs (joueur uniquement)
+    - GET /api/matches/my/ : Mes matchs (paginés par curseur, ?filter=upcoming|past, ETag)
+    - GET /api/matches/conflicts/ : Conflits de lieu et d'équipe d'un tournoi (organisateur propriétaire)
     - POST /api/matches/ : Créer un match (organisateur uniquement)
     - PUT /api/matches/{id}/ : Modifier un match (organisateur propriétaire uniquement)
     - PATCH /api/matches/{id}/ : Modifier partiellement (organisateur propriétaire uniquement)
     - DELETE /api/matches/{id}/ : Supprimer un match (organisateur propriétaire uniquement)
     """
-    queryset = Match.objects.all().select_related('team_a', 'team_b', 'team_a__tournament', 'team_b__tournament')
+    queryset = Match.objects.all().select_related('team_a', 'team_b', 'tournament')
     permission_classes = [IsAuthenticated]
+    # Listes construites depuis values() (TeamSportFinder/rows.py)
+    values_row_actions = ('list', 'my')
 
     def get_serializer_class(self):
         """Retourne le serializer approprié selon l'action"""
@@ -58,22 +97,39 @@ class MatchViewSet(viewsets.ModelViewSet):
         Filtre les matchs selon le rôle de l'utilisateur
         - Organisateur : voit les matchs de ses tournois
         - Joueur : voit les matchs de ses équipes
+        - ?tournament_id=... : limite à un tournoi (index tournament_id, date)
         """
         user = self.request.user
         
         if user.role == 'organizer':
             # Organisateur : voir les matchs de ses tournois
-            return Match.objects.filter(
-                Q(team_a__tournament__organizer=user) | Q(team_b__tournament__organizer=user)
-            ).select_related('team_a', 'team_b', 'team_a__tournament', 'team_b__tournament')
+            queryset = Match.objects.filter(tournament__organizer=user)
         
         elif user.role == 'player':
-            # Joueur : voir les matchs de ses équipes
-            return Match.objects.filter(
-                Q(team_a__members=user) | Q(team_b__members=user)
-            ).select_related('team_a', 'team_b', 'team_a__tournament', 'team_b__tournament').distinct()
+            # Joueur : voir les matchs de ses équipes. Les équipes sont lues
+            # d'abord (teams_members) ; les matchs viennent ensuite de deux
+            # parcours d'index (team_a, date) et (team_b, date) unis par
+            # PostgreSQL (BitmapOr) : un match n'apparaît qu'une fois, sans DISTINCT
+            team_ids = list(
+                Team.members.through.objects.filter(user_id=user.id).values_list('team_id', flat=True)
+            )
+            queryset = Match.objects.filter(Q(team_a_id__in=team_ids) | Q(team_b_id__in=team_ids))
         
-        return Match.objects.none()
+        else:
+            return Match.objects.none()
+
+        tournament_id = self.request.query_params.get('tournament_id', None)
+        if tournament_id:
+            try:
+                queryset = queryset.filter(tournament_id=uuid.UUID(tournament_id))
+            except ValueError:
+                pass  # Ignorer si l'UUID est invalide
+
+        queryset = queryset.select_related('team_a', 'team_b', 'tournament')
+        if self.action not in ('list', 'my'):
+            # MatchSerializer imbrique les équipes (TeamListSerializer lit team.tournament)
+            queryset = queryset.select_related('team_a__tournament', 'team_b__tournament')
+        return queryset.order_by('date', 'id')
 
     def perform_create(self, serializer):
         """Crée un match (validation faite dans le serializer)"""
@@ -84,7 +140,7 @@ class MatchViewSet(viewsets.ModelViewSet):
         match = self.get_object()
         
         # Vérifier que l'utilisateur est l'organisateur du tournoi
-        if match.team_a.tournament.organizer != request.user:
+        if match.tournament.organizer_id != request.user.id:
             raise PermissionDenied("Vous n'êtes pas autorisé à modifier ce match.")
         
         return super().update(request, *args, **kwargs)
@@ -94,34 +150,89 @@ class MatchViewSet(viewsets.ModelViewSet):
         match = self.get_object()
         
         # Vérifier que l'utilisateur est l'organisateur du tournoi
-        if match.team_a.tournament.organizer != request.user:
+        if match.tournament.organizer_id != request.user.id:
             raise PermissionDenied("Vous n'êtes pas autorisé à supprimer ce match.")
         
         return super().destroy(request, *args, **kwargs)
 
-    @action(detail=False, methods=['get'], url_path='my', permission_classes=[IsAuthenticated, IsPlayerOrOrganizer])
-    def my(self, request):
+    def perform_destroy(self, instance):
+        """Supprime le match et retire son résultat du classement"""
+        with transaction.atomic():
+            # Scores relus sous verrou (une modification simultanée a pu les changer)
+            old_scores = Match.objects.select_for_update().filter(id=instance.id).values_list(
+                'score_a', 'score_b'
+            ).first()
+            if old_scores is None:
+                return  # déjà supprimé
+            apply_result(instance, old_scores, (None, None))
+            instance.delete()
+
+    def get_my_queryset(self):
         """
-        Joueur : voir tous ses matchs (équipes où il est membre)
-        Organisateur : voir tous les matchs de ses tournois
+        Matchs de l'action my, avec le filtre optionnel ?filter=upcoming|past
+        (construit une fois par requête : la version et la page le partagent)
         """
-        user = request.user
+        if getattr(self, '_my_queryset', None) is not None:
+            return self._my_queryset
         queryset = self.get_queryset()
         
         # Filtre optionnel : matchs à venir / passés
-        filter_type = request.query_params.get('filter', None)
+        filter_type = self.request.query_params.get('filter', None)
         now = timezone.now()
         
         if filter_type == 'upcoming':
             queryset = queryset.filter(date__gte=now)
         elif filter_type == 'past':
             queryset = queryset.filter(date__lt=now)
+        self._my_queryset = queryset
+        return queryset
+
+    @action(detail=False, methods=['get'], url_path='my', permission_classes=[IsAuthenticated, IsPlayerOrOrganizer],
+            pagination_class=MatchScheduleCursorPagination)
+    @conditional_get(my_matches_version)
+    def my(self, request):
+        """
+        Joueur : voir tous ses matchs (équipes où il est membre)
+        Organisateur : voir tous les matchs de ses tournois
+        - Paginé par curseur sur (date, id) : ?cursor=... donné par 'next'
+        - 304 si aucun de ces matchs (ni leurs équipes et tournois) n'a changé
+        """
+        queryset = self.get_my_queryset()
         
-        # Trier par date (les plus proches en premier)
-        queryset = queryset.order_by('date')
-        
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        # Trié par date (les plus proches en premier) par la pagination
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=['get'], url_path='conflicts', permission_classes=[IsAuthenticated, IsOrganizer])
+    def conflicts(self, request):
+        """
+        GET /api/matches/conflicts/?tournament_id=...
+        Rapport des matchs du tournoi qui se chevauchent (même lieu ou même équipe)
+
+        GET /api/matches/conflicts/?tournament_id=...&date=...&ends_at=...&location=...&team_id=...&team_id=...
+        Vérifie un créneau candidat (une requête sur les index, ?exclude=<match> pour un déplacement)
+        """
+        serializer = ConflictCheckSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        organizer_id = (
+            Tournament.objects.filter(id=params['tournament_id']).values_list('organizer_id', flat=True).first()
+        )
+        if organizer_id is None:
+            return Response({"error": "Tournoi introuvable."}, status=status.HTTP_404_NOT_FOUND)
+        if organizer_id != request.user.id:
+            raise PermissionDenied("Vous n'êtes pas l'organisateur de ce tournoi.")
+
+        if 'date' in params:
+            conflicts = find_conflicts(
+                params['tournament_id'], params['location'], params['team_id'],
+                params['date'], params['ends_at'], exclude_id=params.get('exclude'),
+            )
+        else:
+            conflicts = tournament_conflicts(params['tournament_id'])
+        return Response({'count': len(conflicts), 'conflicts': conflicts})
 
     def get_serializer_context(self):
         """Ajoute le contexte (request) au serializer"""
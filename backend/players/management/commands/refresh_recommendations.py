@@ -0,0 +1,29 @@
+"""
+Recalcule les équipes recommandées de tous les joueurs (voir players.recommendations)
+
+Les signaux tiennent les listes à jour entre deux exécutions ; la commande
+prend en compte les adhésions acceptées (niveaux et postes des équipes).
+
+Exemples:
+    python manage.py refresh_recommendations
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from players.recommendations import refresh_all
+
+
+class Command(BaseCommand):
+    help = "Recalcule les équipes recommandées de tous les joueurs"
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+
+        def progress(sport, players, teams):
+            self.stdout.write(f"  {sport}: {players} joueurs x {teams} équipes ({time.monotonic() - started:.1f} s)")
+
+        players, rows = refresh_all(progress=progress)
+        self.stdout.write(self.style.SUCCESS(
+            f"{rows} recommandations pour {players} joueurs en {time.monotonic() - started:.1f} s"
+        ))
@@ -0,0 +1,36 @@
+# Generated by Django 5.0.1 on 2026-10-17 18:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_alter_user_options'),
+        ('players', '0003_alter_playerprofile_options'),
+        ('tournaments', '0004_tournament_coordinates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('computed_at', models.DateTimeField(auto_now_add=True)),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='team_recommendations', to='accounts.user')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='tournaments.team')),
+            ],
+            options={
+                'verbose_name': 'team recommendation',
+                'verbose_name_plural': 'team recommendations',
+                'db_table': 'team_recommendations',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='teamrecommendation',
+            constraint=models.UniqueConstraint(fields=('player', 'rank'), name='team_reco_player_rank_uniq'),
+        ),
+    ]
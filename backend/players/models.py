@@ -17,4 +17,21 @@ class PlayerProfile(models.Model):
     class Meta:
         db_table = 'player_profiles'
         verbose_name = "player"
-        verbose_name_plural = "players"
\ No newline at end of file
+        verbose_name_plural = "players"
+
+class TeamRecommendation(models.Model):
+# """Équipe recommandée à un joueur (top-K précalculé, voir players.recommendations)"""
+    player = models.ForeignKey(User, on_delete=models.CASCADE, related_name='team_recommendations')
+    team = models.ForeignKey('tournaments.Team', on_delete=models.CASCADE, related_name='recommendations')
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+    computed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'team_recommendations'
+        constraints = [
+            # Sert aussi d'index à GET /api/players/recommendations/ (player = ... ORDER BY rank)
+            models.UniqueConstraint(fields=['player', 'rank'], name='team_reco_player_rank_uniq'),
+        ]
+        verbose_name = "team recommendation"
+        verbose_name_plural = "team recommendations"
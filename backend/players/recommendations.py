@@ -0,0 +1,396 @@
+"""
+Recommandations d'équipes pour les joueurs (top-K précalculé)
+
+Score d'une équipe ouverte pour un joueur, entre 0 et 1 :
+    - sport : filtre, seules les équipes du sport favori sont classées
+    - ville : proximité du tournoi, exp(-distance / PROXIMITY_KM), ou égalité
+      des villes si l'une des deux n'est pas dans le gazetteer
+    - niveau : écart entre le niveau du joueur et le niveau moyen des membres
+    - poste : part des membres qui occupent déjà le poste du joueur
+
+Les scores sont calculés avec NumPy, par matrices (lot de joueurs x équipes
+d'un sport), et seuls les TOP_K meilleurs sont écrits dans TeamRecommendation.
+GET /api/players/recommendations/ lit ces lignes, sans calcul.
+
+Mises à jour:
+    - refresh_all() (commande refresh_recommendations) : recalcul complet
+    - refresh_for_team() (signal, après le commit) : les lignes de l'équipe
+      sont recalculées dans les listes qui la contiennent
+    - refresh_for_player() (signal, après le commit) : le profil est
+      recalculé sur les équipes des NEAR_TOURNAMENTS tournois les plus
+      proches de sa ville
+
+Les adhésions acceptées ne déclenchent pas de signal (UPDATE ensemblistes) :
+niveaux et postes des équipes sont rafraîchis par la commande.
+"""
+import numpy as np
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+from django.db.models.functions import Lower
+
+from players.models import PlayerProfile, TeamRecommendation
+from requestes.models import JoinRequest
+from tournaments.geo import EARTH_RADIUS_KM, MAX_RADIUS_KM, filter_near, lookup_city, normalize_city
+from tournaments.models import Team, Tournament
+from tournaments.search import normalize_term
+
+TOP_K = 20
+CITY_WEIGHT = 0.5
+LEVEL_WEIGHT = 0.3
+POSITION_WEIGHT = 0.2
+PROXIMITY_KM = 25
+LEVELS = {'beginner': 0, 'intermediate': 1, 'advanced': 2}
+
+# Joueurs par matrice de scores (PLAYER_BATCH x équipes du sport, float32)
+PLAYER_BATCH = 256
+# Tournois candidats quand un seul profil est recalculé
+NEAR_TOURNAMENTS = 200
+
+
+class TeamFeatures:
+    """
+    Équipes ouvertes d'un sport, en colonnes NumPy
+
+    Attributes:
+        sport: Le sport des équipes
+        ids: Les id des équipes (colonnes des matrices de scores)
+        index: id d'équipe -> colonne
+        cities / positions: Vocabulaires (nom normalisé -> code)
+        city, latitude, longitude, level: Un tableau par caractéristique
+        position_share: Part des membres par poste, (len(positions) + 1) x équipes ;
+                        la dernière ligne (poste que personne n'occupe) est nulle
+    """
+
+    def __init__(self, rows, sport):
+        self.sport = sport
+        self.ids = []
+        self.index = {}
+        self.cities = {}
+        self.positions = {}
+        city, latitude, longitude, members, level_sum = [], [], [], [], []
+        counts = []  # (colonne, code du poste, nombre)
+
+        for team_id, team_city, team_lat, team_lng, position, count, levels in rows:
+            column = self.index.get(team_id)
+            if column is None:
+                column = self.index[team_id] = len(self.ids)
+                self.ids.append(team_id)
+                city.append(self.cities.setdefault(normalize_city(team_city), len(self.cities)))
+                latitude.append(np.nan if team_lat is None else team_lat)
+                longitude.append(np.nan if team_lng is None else team_lng)
+                members.append(0)
+                level_sum.append(0)
+            members[column] += count
+            level_sum[column] += levels or 0
+            position = normalize_term(position or '')
+            if position:
+                counts.append((column, self.positions.setdefault(position, len(self.positions)), count))
+
+        self.city = np.array(city, dtype=np.int64)
+        self.latitude = np.radians(np.array(latitude, dtype=np.float64))
+        self.longitude = np.radians(np.array(longitude, dtype=np.float64))
+        members = np.array(members, dtype=np.float32)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.level = np.array(level_sum, dtype=np.float32) / members  # nan sans membre
+
+        self.position_share = np.zeros((len(self.positions) + 1, len(self.ids)), dtype=np.float32)
+        for column, code, count in counts:
+            self.position_share[code, column] += count / members[column]
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class PlayerFeatures:
+    """Profils de joueurs, codés avec les vocabulaires d'un TeamFeatures"""
+
+    def __init__(self, profiles, teams):
+        # profiles: (user_id, city, level, position)
+        self.ids = [user_id for user_id, _, _, _ in profiles]
+        self.index = {user_id: row for row, user_id in enumerate(self.ids)}
+        self.city = np.array(
+            [teams.cities.get(normalize_city(city), -1) for _, city, _, _ in profiles], dtype=np.int64
+        )
+        coordinates = [lookup_city(city) or (np.nan, np.nan) for _, city, _, _ in profiles]
+        self.latitude = np.radians(np.array([lat for lat, _ in coordinates], dtype=np.float64))
+        self.longitude = np.radians(np.array([lng for _, lng in coordinates], dtype=np.float64))
+        self.level = np.array([LEVELS.get(level, np.nan) for _, _, level, _ in profiles], dtype=np.float32)
+        positions = [normalize_term(position or '') for _, _, _, position in profiles]
+        self.has_position = np.array([bool(position) for position in positions])
+        unknown = len(teams.positions)  # ligne nulle de position_share
+        self.position = np.array([teams.positions.get(position, unknown) for position in positions], dtype=np.int64)
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def load_team_features(sport, team_ids=None, tournaments=None):
+    """
+    Lit les équipes ouvertes d'un sport et leurs membres, agrégés par poste (1 requête)
+
+    Args:
+        sport: Le sport (comparaison insensible à la casse)
+        team_ids: Limiter à ces équipes
+        tournaments: Queryset d'id de tournois (sous-requête) pour limiter les équipes
+
+    Returns:
+        TeamFeatures
+    """
+    level_case = ' '.join(f"WHEN '{level}' THEN {value}" for level, value in LEVELS.items())
+    conditions = ['team.current_capacity < team.max_capacity', 'lower(tournament.sport) = lower(%s)']
+    params = [sport]
+    if team_ids is not None:
+        conditions.append('team.id = ANY(%s)')
+        params.append(list(team_ids))
+    if tournaments is not None:
+        subquery, subquery_params = tournaments.query.sql_with_params()
+        conditions.append(f'team.tournament_id IN ({subquery})')
+        params.extend(subquery_params)
+
+    sql = f"""
+        SELECT team.id, tournament.city, tournament.latitude, tournament.longitude,
+               profile.position, count(profile.id), sum(CASE profile.level {level_case} END)
+        FROM {Team._meta.db_table} AS team
+        JOIN {Tournament._meta.db_table} AS tournament ON tournament.id = team.tournament_id
+        LEFT JOIN {Team.members.through._meta.db_table} AS member ON member.team_id = team.id
+        LEFT JOIN {PlayerProfile._meta.db_table} AS profile ON profile.user_id = member.user_id
+        WHERE {' AND '.join(conditions)}
+        GROUP BY team.id, tournament.id, profile.position
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return TeamFeatures(cursor.fetchall(), sport)
+
+
+def score_matrix(players, teams):
+    """
+    Scores joueurs x équipes (float32), sans accès à la base
+
+    Returns:
+        np.ndarray: Matrice len(players) x len(teams)
+    """
+    # Distance haversine entre la ville du joueur et le tournoi (nan si inconnue)
+    d_lat = players.latitude[:, None] - teams.latitude[None, :]
+    d_lng = players.longitude[:, None] - teams.longitude[None, :]
+    a = np.sin(d_lat / 2) ** 2 + np.cos(players.latitude)[:, None] * np.cos(teams.latitude)[None, :] * np.sin(d_lng / 2) ** 2
+    distance = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+    same_city = players.city[:, None] == teams.city[None, :]
+    city = np.where(np.isnan(distance), same_city, np.exp(-distance / PROXIMITY_KM))
+
+    # Niveau : 1 si identique, 0 pour débutant/avancé, neutre si inconnu
+    level = 1 - np.abs(players.level[:, None] - teams.level[None, :]) / 2
+    level = np.where(np.isnan(level), 0.5, level)
+
+    # Poste : 1 si personne ne l'occupe encore, neutre si le joueur n'en a pas
+    position = 1 - teams.position_share[players.position]
+    position[~players.has_position] = 0.5
+
+    return (CITY_WEIGHT * city + LEVEL_WEIGHT * level + POSITION_WEIGHT * position).astype(np.float32)
+
+
+def excluded_teams(player_ids=None, team_id=None, sport=None):
+    """Paires (joueur, équipe) déjà membres ou déjà demandées (1 requête)"""
+    members = Team.members.through.objects.values_list('user_id', 'team_id')
+    requests = JoinRequest.objects.values_list('player_id', 'team_id')
+    if player_ids is not None:
+        members = members.filter(user_id__in=player_ids)
+        requests = requests.filter(player_id__in=player_ids)
+    if team_id is not None:
+        members = members.filter(team_id=team_id)
+        requests = requests.filter(team_id=team_id)
+    if sport is not None:
+        members = members.filter(team__tournament__sport__iexact=sport)
+        requests = requests.filter(team__tournament__sport__iexact=sport)
+    return set(members.union(requests, all=True))
+
+
+def rank_players(players, teams):
+    """
+    Top-K de chaque joueur, par lots de PLAYER_BATCH
+
+    Le score ne dépend que de la ville, du niveau et du poste : une ligne de
+    scores est calculée par combinaison distincte (matrice combinaisons x
+    équipes), puis chaque joueur la parcourt en sautant les équipes dont il
+    est déjà membre ou qu'il a déjà demandées.
+
+    Yields:
+        tuple: (player_id, [(team_id, score), ...] trié par score décroissant)
+    """
+    if not len(teams):
+        for player_id in players.ids:
+            yield player_id, []
+        return
+
+    keys = np.stack([
+        players.city, players.latitude, players.longitude,
+        players.level, players.position, players.has_position,
+    ], axis=1)
+    _, first, key_of = np.unique(np.nan_to_num(keys, nan=-1.0), axis=0, return_index=True, return_inverse=True)
+    key_of = key_of.reshape(-1)
+    rankings = {}  # combinaison -> (profondeur, colonnes triées, scores)
+
+    for start in range(0, len(players), PLAYER_BATCH):
+        batch_ids = players.ids[start:start + PLAYER_BATCH]
+        excluded = {}
+        for player_id, team_id in excluded_teams(player_ids=batch_ids, sport=teams.sport):
+            column = teams.index.get(team_id)
+            if column is not None:
+                excluded.setdefault(player_id, set()).add(column)
+
+        # Profondeur à classer : TOP_K + les équipes que le joueur doit sauter
+        needed = {}
+        for row, player_id in enumerate(batch_ids, start):
+            key = key_of[row]
+            depth = min(len(teams), TOP_K + len(excluded.get(player_id, ())))
+            if key not in rankings or rankings[key][0] < depth:
+                needed[key] = max(depth, needed.get(key, 0))
+
+        if needed:
+            needed_keys = list(needed)
+            scores = score_matrix(_take(players, first[needed_keys]), teams)
+            for key, row_scores in zip(needed_keys, scores):
+                depth = needed[key]
+                top = np.argpartition(-row_scores, depth - 1)[:depth]
+                top = top[np.argsort(-row_scores[top], kind='stable')]
+                rankings[key] = (depth, top, row_scores[top])
+
+        for row, player_id in enumerate(batch_ids, start):
+            _, columns, scores = rankings[key_of[row]]
+            skip = excluded.get(player_id, ())
+            ranked = []
+            for column, score in zip(columns, scores):
+                if column not in skip:
+                    ranked.append((teams.ids[column], float(score)))
+                    if len(ranked) == TOP_K:
+                        break
+            yield player_id, ranked
+
+
+def _take(players, rows):
+    """Sous-ensemble (lignes données) d'un PlayerFeatures, pour score_matrix"""
+    subset = PlayerFeatures.__new__(PlayerFeatures)
+    for name in ('city', 'latitude', 'longitude', 'level', 'has_position', 'position'):
+        setattr(subset, name, getattr(players, name)[rows])
+    return subset
+
+
+def save_recommendations(ranked):
+    """
+    Remplace les recommandations des joueurs donnés (DELETE + bulk_create)
+
+    Args:
+        ranked: Itérable de (player_id, [(team_id, score), ...])
+
+    Returns:
+        int: Le nombre de lignes écrites
+    """
+    ranked = list(ranked)
+    rows = [
+        TeamRecommendation(player_id=player_id, team_id=team_id, score=score, rank=rank)
+        for player_id, teams in ranked
+        for rank, (team_id, score) in enumerate(teams)
+    ]
+    with transaction.atomic():
+        TeamRecommendation.objects.filter(player_id__in=[player_id for player_id, _ in ranked]).delete()
+        TeamRecommendation.objects.bulk_create(rows, batch_size=5000)
+    return len(rows)
+
+
+def refresh_all(progress=None):
+    """
+    Recalcule les recommandations de tous les joueurs, sport par sport
+
+    Args:
+        progress: Fonction appelée avec (sport, joueurs, équipes) après chaque sport
+
+    Returns:
+        tuple: (joueurs traités, lignes écrites)
+    """
+    profiles = {}
+    for user_id, city, sport, level, position in PlayerProfile.objects.annotate(sport=Lower('favorite_sport')).values_list(
+        'user_id', 'city', 'sport', 'level', 'position'
+    ):
+        profiles.setdefault(sport, []).append((user_id, city, level, position))
+
+    sports = set(Tournament.objects.annotate(key=Lower('sport')).values_list('key', flat=True).distinct())
+    players_done = rows_written = 0
+    for sport, sport_profiles in profiles.items():
+        if sport in sports:
+            teams = load_team_features(sport)
+            players = PlayerFeatures(sport_profiles, teams)
+            rows_written += save_recommendations(rank_players(players, teams))
+        else:
+            teams = []
+            save_recommendations((user_id, []) for user_id, _, _, _ in sport_profiles)
+        players_done += len(sport_profiles)
+        if progress:
+            progress(sport, len(sport_profiles), len(teams))
+    return players_done, rows_written
+
+
+def refresh_for_player(profile):
+    """
+    Recalcule les recommandations d'un profil (après création ou modification)
+
+    Les équipes candidates sont celles des NEAR_TOURNAMENTS tournois du sport
+    les plus proches de la ville du joueur (ou de la même ville si elle n'est
+    pas dans le gazetteer).
+    """
+    tournaments = Tournament.objects.filter(sport__iexact=profile.favorite_sport)
+    coordinates = lookup_city(profile.city)
+    if coordinates is not None:
+        tournaments = filter_near(tournaments, *coordinates, MAX_RADIUS_KM).order_by('distance_km', 'id')
+    else:
+        tournaments = tournaments.filter(city__iexact=profile.city).order_by('id')
+
+    teams = load_team_features(
+        profile.favorite_sport,
+        tournaments=tournaments.values('id')[:NEAR_TOURNAMENTS],
+    )
+    players = PlayerFeatures([(profile.user_id, profile.city, profile.level, profile.position)], teams)
+    save_recommendations(rank_players(players, teams))
+
+
+def refresh_for_team(team_id):
+    """
+    Met à jour une équipe modifiée dans les listes qui la contiennent déjà
+
+    Seuls les joueurs qui ont une ligne pour l'équipe sont recalculés : son
+    score y est remplacé, ou elle est retirée si elle est pleine, n'est plus
+    de leur sport, ou si le joueur en est devenu membre ou l'a demandée. Les
+    autres listes ne changent pas : une équipe nouvelle ou qui s'améliore y
+    entre au prochain refresh_all().
+    """
+    lists = {}
+    for player_id, listed_team_id, score in TeamRecommendation.objects.filter(
+        player__team_recommendations__team_id=team_id
+    ).values_list('player_id', 'team_id', 'score'):
+        lists.setdefault(player_id, {})[listed_team_id] = score
+    if not lists:
+        return
+
+    scores = {}
+    sport = Team.objects.filter(id=team_id).values_list('tournament__sport', flat=True).first()
+    teams = load_team_features(sport, team_ids=[team_id]) if sport is not None else []
+    if len(teams):
+        member = Team.members.through.objects.filter(team_id=team_id, user_id=OuterRef('user_id'))
+        requested = JoinRequest.objects.filter(team_id=team_id, player_id=OuterRef('user_id'))
+        profiles = list(
+            PlayerProfile.objects.filter(user_id__in=lists, favorite_sport__iexact=sport)
+            .exclude(Exists(member))
+            .exclude(Exists(requested))
+            .values_list('user_id', 'city', 'level', 'position')
+        )
+        if profiles:
+            players = PlayerFeatures(profiles, teams)
+            scores = dict(zip(players.ids, score_matrix(players, teams)[:, 0].tolist()))
+
+    for player_id, ranked in lists.items():
+        if player_id in scores:
+            ranked[team_id] = scores[player_id]
+        else:
+            del ranked[team_id]
+    save_recommendations(
+        (player_id, sorted(ranked.items(), key=lambda item: -item[1]))
+        for player_id, ranked in lists.items()
+    )
@@ -1,6 +1,7 @@
 from rest_framework import serializers
-from players.models import PlayerProfile
+from players.models import PlayerProfile, TeamRecommendation
 from accounts.models import User
+from tournaments.serializers import TeamListSerializer
 
 
 class PlayerProfileSerializer(serializers.ModelSerializer):
@@ -59,3 +60,15 @@ class PlayerProfileCreateSerializer(serializers.ModelSerializer):
             )
         return value
 
+
+
+class TeamRecommendationSerializer(serializers.ModelSerializer):
+    """
+    Serializer pour une équipe recommandée (lecture seule)
+    """
+    team = TeamListSerializer(read_only=True)
+
+    class Meta:
+        model = TeamRecommendation
+        fields = ['rank', 'score', 'team', 'computed_at']
+        read_only_fields = fields
@@ -0,0 +1,31 @@
+import functools
+
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from tournaments.models import Team
+from .models import PlayerProfile
+from .recommendations import refresh_for_player, refresh_for_team
+
+# Champs d'une équipe qui changent son score ou sa disponibilité
+RECOMMENDED_TEAM_FIELDS = {'current_capacity', 'max_capacity', 'tournament'}
+# Champs d'un profil qui changent ses scores
+RECOMMENDED_PROFILE_FIELDS = {'city', 'favorite_sport', 'level', 'position'}
+
+
+@receiver(post_save, sender=PlayerProfile)
+def refresh_player_recommendations(sender, instance, update_fields=None, **kwargs):
+    """Recalcule les recommandations d'un profil créé ou modifié, après le commit"""
+    if update_fields is None or RECOMMENDED_PROFILE_FIELDS & set(update_fields):
+        transaction.on_commit(functools.partial(refresh_for_player, instance))
+
+
+@receiver(post_save, sender=Team)
+def refresh_team_recommendations(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Recalcule l'équipe dans les listes qui la contiennent, après le commit
+    (une équipe créée n'est encore dans aucune liste)
+    """
+    if not created and (update_fields is None or RECOMMENDED_TEAM_FIELDS & set(update_fields)):
+        transaction.on_commit(functools.partial(refresh_for_team, instance.id))
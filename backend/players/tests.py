@@ -0,0 +1,149 @@
+import time
+
+import jwt
+from django.test import TestCase, override_settings
+
+from TeamSportFinder.testing import QueryBudgetTestCase
+from accounts.models import User
+from players.models import PlayerProfile
+from players.recommendations import POSITION_WEIGHT, refresh_all
+from tournaments.models import Team, Tournament
+
+
+@override_settings(CLERK_JWKS_URL=None)
+class TeamRecommendationTests(TestCase):
+    """Scores, top-K stockés et mises à jour incrémentales"""
+
+    @classmethod
+    def setUpTestData(cls):
+        organizer = User.objects.create(
+            clerk_id='org_1', email='org@example.com', full_name='Org', role='organizer'
+        )
+        cls.player = User.objects.create(
+            clerk_id='player_1', email='player@example.com', full_name='Player', role='player'
+        )
+
+        def tournament(sport, city):
+            return Tournament.objects.create(
+                name=f'Ligue {sport} de {city}', sport=sport, city=city,
+                start_date='2025-12-01', organizer=organizer,
+            )
+
+        def team(name, tournament, members=()):
+            team = Team.objects.create(name=name, tournament=tournament, current_capacity=len(members))
+            for i, (level, position) in enumerate(members):
+                user = User.objects.create(
+                    clerk_id=f'{name}_{i}', email=f'{name}_{i}@example.com', full_name=name, role='player'
+                )
+                PlayerProfile.objects.create(user=user, city='Laval', favorite_sport='Soccer',
+                                             level=level, position=position)
+                team.members.add(user)
+            return team
+
+        cls.montreal = tournament('Soccer', 'Montréal')
+        cls.gardiens = team('Gardiens', cls.montreal, [('advanced', 'Gardien')])
+        cls.attaquants = team('Attaquants', cls.montreal, [('intermediate', 'Attaquant')])
+        cls.quebec = team('Québec', tournament('Soccer', 'Québec'))
+        cls.hockey = team('Hockey', tournament('Hockey', 'Montréal'))
+        cls.full = team('Complète', cls.montreal)
+        Team.objects.filter(id=cls.full.id).update(current_capacity=15)
+
+        cls.profile = PlayerProfile.objects.create(
+            user=cls.player, city='Montréal', favorite_sport='soccer', level='intermediate', position='Gardien'
+        )
+        refresh_all()
+
+    def recommended(self):
+        return list(self.player.team_recommendations.order_by('rank').values_list('team__name', flat=True))
+
+    def test_ranking(self):
+        # Même ville, niveau proche, poste libre > poste déjà pris > autre ville ; pas d'autre sport ni d'équipe pleine
+        self.assertEqual(self.recommended(), ['Attaquants', 'Gardiens', 'Québec'])
+
+    def test_member_teams_are_excluded(self):
+        self.attaquants.members.add(self.player)
+        refresh_all()
+        self.assertEqual(self.recommended(), ['Gardiens', 'Québec'])
+
+    def test_new_team_is_inserted_by_refresh_all(self):
+        # Sans membre : niveau neutre, poste libre
+        with self.captureOnCommitCallbacks(execute=True):
+            Team.objects.create(name='Nouvelle', tournament=self.montreal)
+        self.assertEqual(self.recommended(), ['Attaquants', 'Gardiens', 'Québec'])
+        refresh_all()
+        self.assertEqual(self.recommended(), ['Attaquants', 'Nouvelle', 'Gardiens', 'Québec'])
+
+    def test_full_team_is_removed(self):
+        self.attaquants.current_capacity = self.attaquants.max_capacity
+        with self.captureOnCommitCallbacks(execute=True):
+            self.attaquants.save()
+            self.assertEqual(self.recommended(), ['Attaquants', 'Gardiens', 'Québec'])  # avant le commit
+        self.assertEqual(self.recommended(), ['Gardiens', 'Québec'])
+
+    def test_team_change_rescores_its_rows(self):
+        # Un gardien rejoint les Attaquants : le poste du joueur n'y est plus libre
+        gardien = User.objects.create(clerk_id='gardien', email='gardien@example.com', full_name='G', role='player')
+        PlayerProfile.objects.create(user=gardien, city='Laval', favorite_sport='Soccer',
+                                     level='intermediate', position='Gardien')
+        self.attaquants.members.add(gardien)
+        self.attaquants.current_capacity += 1
+        before = self.player.team_recommendations.get(team=self.attaquants).score
+        with self.captureOnCommitCallbacks(execute=True):
+            self.attaquants.save(update_fields=['current_capacity'])
+
+        row = self.player.team_recommendations.get(team=self.attaquants)
+        self.assertAlmostEqual(before - row.score, POSITION_WEIGHT / 2, places=5)
+        self.assertEqual(row.rank, 0)
+        self.assertEqual(self.recommended(), ['Attaquants', 'Gardiens', 'Québec'])
+
+    def test_profile_change(self):
+        self.profile.favorite_sport = 'Hockey'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.save()
+            self.assertEqual(self.recommended(), ['Attaquants', 'Gardiens', 'Québec'])  # avant le commit
+        self.assertEqual(self.recommended(), ['Hockey'])
+
+    def test_unscored_profile_field_is_ignored(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.profile.save(update_fields=['user'])
+        self.assertEqual(callbacks, [])
+
+    def test_api(self):
+        token = jwt.encode({'sub': 'player_1', 'exp': int(time.time()) + 300}, 'dev', algorithm='HS256')
+        response = self.client.get('/api/players/recommendations/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([item['team']['name'] for item in data], ['Attaquants', 'Gardiens', 'Québec'])
+        self.assertEqual([item['rank'] for item in data], [0, 1, 2])
+        self.assertGreater(data[0]['score'], data[1]['score'])
+
+
+class PlayerProfileQueryBudgetTests(QueryBudgetTestCase):
+    """Budgets de requêtes SQL des actions de PlayerProfileViewSet"""
+
+    def test_profile_list(self):
+        self.assertQueryBudget('player-profile-list', 'get', '/api/players/profile/', self.player, budget=3)
+
+    # Les écritures de profil recalculent les recommandations du joueur (+4 à 6 requêtes)
+    def test_profile_create(self):
+        self.player.playerprofile.delete()
+        data = {'city': 'Laval', 'favorite_sport': 'Soccer', 'level': 'beginner', 'position': 'Gardien'}
+        self.assertQueryBudget('player-profile-create', 'post', '/api/players/profile/', self.player,
+                               budget=9, data=data, status=201)
+
+    def test_profile_update(self):
+        data = {'city': 'Laval', 'favorite_sport': 'Soccer', 'level': 'advanced', 'position': ''}
+        self.assertQueryBudget('player-profile-update', 'put', '/api/players/profile/', self.player,
+                               budget=10, data=data)
+
+    def test_profile_partial_update(self):
+        self.assertQueryBudget('player-profile-partial-update', 'patch', '/api/players/profile/',
+                               self.player, budget=10, data={'level': 'advanced'})
+
+    def test_profile_destroy(self):
+        self.assertQueryBudget('player-profile-destroy', 'delete', '/api/players/profile/',
+                               self.player, budget=3, status=204)
+
+    def test_recommendations(self):
+        self.assertQueryBudget('player-recommendations', 'get', '/api/players/recommendations/',
+                               self.player, budget=2)
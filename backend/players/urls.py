@@ -1,5 +1,5 @@
 from django.urls import path
-from players.views import PlayerProfileViewSet
+from players.views import PlayerProfileViewSet, TeamRecommendationViewSet
 
 # Routes personnalisées pour le profil joueur (sans ID dans l'URL)
 # Le router DRF génère des routes avec ID, donc on crée les routes manuellement
@@ -11,5 +11,7 @@ urlpatterns = [
         'patch': 'partial_update',  # PATCH /api/players/profile/
         'delete': 'destroy',  # DELETE /api/players/profile/
     }), name='player-profile'),
+    path('recommendations/', TeamRecommendationViewSet.as_view({
+        'get': 'list',      # GET /api/players/recommendations/
+    }), name='player-recommendations'),
 ]
-
@@ -4,10 +4,12 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import PermissionDenied, NotFound
 
-from players.models import PlayerProfile
+from accounts.permissions import IsPlayer
+from players.models import PlayerProfile, TeamRecommendation
 from players.serializers import (
     PlayerProfileSerializer,
-    PlayerProfileCreateSerializer
+    PlayerProfileCreateSerializer,
+    TeamRecommendationSerializer,
 )
 
 
@@ -137,3 +139,32 @@ class PlayerProfileViewSet(viewsets.ModelViewSet):
         profile = self.get_object()
         profile.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class TeamRecommendationViewSet(viewsets.GenericViewSet):
+    """
+    ViewSet pour les équipes recommandées au joueur connecté
+
+    Endpoints:
+    - GET /api/players/recommendations/ : Mes TOP_K équipes recommandées
+
+    Les recommandations sont précalculées (players.recommendations) : la
+    liste est lue en une requête sur l'index (player, rank).
+    """
+    permission_classes = [IsAuthenticated, IsPlayer]
+    serializer_class = TeamRecommendationSerializer
+
+    def get_queryset(self):
+        return (
+            TeamRecommendation.objects.filter(player=self.request.user)
+            .select_related('team__tournament')
+            .order_by('rank')
+        )
+
+    def list(self, request, *args, **kwargs):
+        """
+        GET /api/players/recommendations/
+        Retourne les équipes recommandées, de la meilleure à la moins bonne
+        """
+        serializer = self.get_serializer(self.get_queryset(), many=True)
+        return Response(serializer.data)
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-17 18:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_alter_user_options'),
+        ('requestes', '0003_alter_joinrequest_options'),
+        ('tournaments', '0002_alter_team_options_alter_tournament_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='joinrequest',
+            index=models.Index(fields=['team', 'status', 'created_at'], name='join_req_team_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='joinrequest',
+            index=models.Index(fields=['player', 'status', 'created_at'], name='join_req_player_status_idx'),
+        ),
+    ]
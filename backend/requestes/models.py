@@ -22,6 +22,11 @@ class JoinRequest(models.Model):
 
     class Meta:
         unique_together = ['player', 'team'] # Une seule demande par joueur/equipe
+        indexes = [
+            # Boîte de réception (received) et demandes du joueur (my), filtrées par statut
+            models.Index(fields=['team', 'status', 'created_at'], name='join_req_team_status_idx'),
+            models.Index(fields=['player', 'status', 'created_at'], name='join_req_player_status_idx'),
+        ]
         verbose_name = "requeste"
         verbose_name_plural = "requestes"
     
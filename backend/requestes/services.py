@@ -0,0 +1,261 @@
+"""
+Acceptation des demandes d'adhésion, sans course entre organisateurs
+
+Tout passe par des UPDATE conditionnels dans une transaction :
+    UPDATE join_request SET status = 'accepted' WHERE id = ... AND status = 'pending'
+    UPDATE teams SET current_capacity = current_capacity + 1
+        WHERE id = ... AND current_capacity < max_capacity
+PostgreSQL réévalue la condition après avoir obtenu le verrou de la ligne :
+deux acceptations simultanées ne peuvent donc pas dépasser max_capacity.
+
+Une place n'est comptée que pour un membre réellement ajouté (INSERT ... ON
+CONFLICT DO NOTHING RETURNING sur la table des membres).
+"""
+from django.db import connection, transaction
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db.models import Case, F, IntegerField, OuterRef, Value, When
+from django.utils import timezone
+
+from requestes.models import JoinRequest
+from tournaments.models import Team
+from tournaments.versions import touch_tournaments
+
+
+class JoinRequestError(Exception):
+    """Erreur métier lors du traitement d'une demande d'adhésion"""
+
+
+class RequestAlreadyProcessed(JoinRequestError):
+    """La demande n'est plus en attente"""
+
+
+class TeamFull(JoinRequestError):
+    """L'équipe a atteint sa capacité maximale"""
+
+
+def insert_members(pairs):
+    """
+    Ajoute des membres aux équipes ; un joueur déjà membre est ignoré (une requête)
+
+    Args:
+        pairs: Liste de tuples (team_id, player_id)
+
+    Returns:
+        list: Le team_id de chaque membre réellement ajouté
+    """
+    if not pairs:
+        return []
+    through = Team.members.through
+    team_column = through._meta.get_field('team').column
+    user_column = through._meta.get_field('user').column
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {through._meta.db_table} ({team_column}, {user_column}) '
+            f'SELECT * FROM unnest(%s::uuid[], %s::uuid[]) '
+            f'ON CONFLICT DO NOTHING RETURNING {team_column}',
+            [[team_id for team_id, _ in pairs], [player_id for _, player_id in pairs]],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def add_player_to_team(team_id, player_id):
+    """
+    Réserve une place dans l'équipe puis ajoute le joueur aux membres
+
+    Doit être appelée dans une transaction (la réservation est annulée si
+    l'appelant lève une exception). Un joueur déjà membre rend la place
+    réservée : current_capacity ne compte que les membres ajoutés.
+
+    Args:
+        team_id: L'id de l'équipe
+        player_id: L'id du joueur
+
+    Returns:
+        bool: False si l'équipe est pleine
+    """
+    now = timezone.now()
+    reserved = Team.objects.filter(
+        id=team_id,
+        current_capacity__lt=F('max_capacity'),
+    ).update(current_capacity=F('current_capacity') + 1, updated_at=now)
+    if not reserved:
+        return False
+
+    if not insert_members([(team_id, player_id)]):
+        Team.objects.filter(id=team_id).update(current_capacity=F('current_capacity') - 1)
+        return True  # déjà membre
+
+    touch_tournaments(team_ids=[team_id], now=now)
+    return True
+
+
+def accept_join_request(join_request):
+    """
+    Accepte une demande en attente et ajoute le joueur à l'équipe
+
+    Requêtes SQL (6 avec la transaction, 8 pour POST /accept/ avec
+    l'utilisateur et la demande lus par la vue) :
+        - SAVEPOINT / BEGIN
+        - UPDATE de la demande (pending -> accepted)
+        - UPDATE de l'équipe (réservation de la place)
+        - INSERT du membre (ON CONFLICT DO NOTHING)
+        - UPDATE des tournois (touch_tournaments)
+        - RELEASE SAVEPOINT / COMMIT
+    Un joueur déjà membre remplace le dernier UPDATE par celui qui rend la place.
+
+    Args:
+        join_request: La JoinRequest à accepter (mise à jour en mémoire)
+
+    Returns:
+        JoinRequest: La demande acceptée
+
+    Raises:
+        RequestAlreadyProcessed: Si la demande n'est plus en attente
+        TeamFull: Si l'équipe est déjà complète (rien n'est modifié)
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        updated = JoinRequest.objects.filter(
+            id=join_request.id,
+            status='pending',
+        ).update(status='accepted', updated_at=now)
+        if not updated:
+            raise RequestAlreadyProcessed()
+
+        if not add_player_to_team(join_request.team_id, join_request.player_id):
+            raise TeamFull()
+
+    join_request.status = 'accepted'
+    join_request.updated_at = now
+    # Valeur indicative pour la réponse : d'autres acceptations ont pu avoir lieu
+    if JoinRequest.team.is_cached(join_request):
+        join_request.team.current_capacity += 1
+    return join_request
+
+
+def reject_join_request(join_request):
+    """
+    Refuse une demande en attente
+
+    Raises:
+        RequestAlreadyProcessed: Si la demande n'est plus en attente
+    """
+    now = timezone.now()
+    updated = JoinRequest.objects.filter(
+        id=join_request.id,
+        status='pending',
+    ).update(status='rejected', updated_at=now)
+    if not updated:
+        raise RequestAlreadyProcessed()
+
+    join_request.status = 'rejected'
+    join_request.updated_at = now
+    return join_request
+
+
+def process_join_requests(organizer, decisions):
+    """
+    Applique une liste de décisions (accepter/refuser) en une transaction
+
+    Les demandes puis les équipes concernées sont verrouillées (FOR UPDATE,
+    triées par id pour éviter les interblocages), les places sont attribuées
+    dans l'ordre de la liste, puis tout est écrit avec des UPDATE ensemblistes
+    et un seul INSERT sur la table des membres : le nombre de requêtes SQL ne
+    dépend pas du nombre de décisions. Les places ajoutées aux équipes sont
+    comptées sur les membres réellement insérés.
+
+    Args:
+        organizer: L'organisateur (User) qui traite les demandes
+        decisions: Liste de tuples (join_request_id, 'accept' | 'reject')
+
+    Returns:
+        list: Un dict {'id', 'decision', 'outcome'} par décision, où outcome
+        vaut 'accepted', 'rejected', 'refused_full', 'not_found', 'forbidden'
+        ou 'already_processed'
+    """
+    ids = [request_id for request_id, _ in decisions]
+    results = []
+    now = timezone.now()
+
+    with transaction.atomic():
+        join_requests = {
+            join_request.id: join_request
+            for join_request in JoinRequest.objects.filter(id__in=ids)
+            .select_related('team__tournament')
+            .select_for_update(of=('self',))
+            .order_by('id')
+        }
+
+        accept_team_ids = {
+            join_requests[request_id].team_id
+            for request_id, decision in decisions
+            if decision == 'accept' and request_id in join_requests
+        }
+        # Les joueurs déjà membres sont lus avec les équipes : acceptés sans prendre de place
+        requested_members = Team.members.through.objects.filter(
+            team_id=OuterRef('id'),
+            user_id__in={join_request.player_id for join_request in join_requests.values()},
+        ).values('user_id')
+        available, members = {}, set()
+        for team_id, max_capacity, current_capacity, member_ids in (
+            Team.objects.filter(id__in=accept_team_ids)
+            .annotate(member_ids=ArraySubquery(requested_members))
+            .select_for_update()
+            .order_by('id')
+            .values_list('id', 'max_capacity', 'current_capacity', 'member_ids')
+        ):
+            available[team_id] = max_capacity - current_capacity
+            members.update((team_id, player_id) for player_id in member_ids)
+
+        accepted, rejected = [], []
+        for request_id, decision in decisions:
+            join_request = join_requests.get(request_id)
+            if join_request is None:
+                outcome = 'not_found'
+            elif join_request.team.tournament.organizer_id != organizer.id:
+                outcome = 'forbidden'
+            elif join_request.status != 'pending':
+                outcome = 'already_processed'
+            elif decision == 'reject':
+                outcome = 'rejected'
+                rejected.append(join_request)
+            elif (join_request.team_id, join_request.player_id) in members:
+                outcome = 'accepted'
+                accepted.append(join_request)
+            elif available.get(join_request.team_id, 0) <= 0:
+                outcome = 'refused_full'
+            else:
+                outcome = 'accepted'
+                available[join_request.team_id] -= 1
+                members.add((join_request.team_id, join_request.player_id))
+                accepted.append(join_request)
+
+            if join_request is not None and outcome in ('accepted', 'rejected'):
+                join_request.status = outcome
+            results.append({'id': request_id, 'decision': decision, 'outcome': outcome})
+
+        if rejected:
+            JoinRequest.objects.filter(id__in=[r.id for r in rejected]).update(
+                status='rejected', updated_at=now
+            )
+
+        if accepted:
+            JoinRequest.objects.filter(id__in=[r.id for r in accepted]).update(
+                status='accepted', updated_at=now
+            )
+
+            added = {}
+            for team_id in insert_members([(r.team_id, r.player_id) for r in accepted]):
+                added[team_id] = added.get(team_id, 0) + 1
+            if added:
+                Team.objects.filter(id__in=added).update(
+                    current_capacity=F('current_capacity') + Case(
+                        *[When(id=team_id, then=Value(count)) for team_id, count in added.items()],
+                        default=Value(0),
+                        output_field=IntegerField(),
+                    ),
+                    updated_at=now,
+                )
+                touch_tournaments(team_ids=list(added), now=now)
+
+    return results
@@ -1,25 +1,27 @@
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from .models import JoinRequest
+from .services import add_player_to_team
 
 @receiver(post_save, sender=JoinRequest)
 def handle_join_request(sender, instance, created, **kwargs):
     """
-    Quand une JoinRequest est sauvegardée :
+    Quand une JoinRequest est sauvegardée avec save() (admin, shell) :
     - Si status == "accepted", ajoute le joueur dans l'équipe
-    - Vérifie la capacité max avant d'ajouter
+    - Si l'équipe est pleine, la demande passe à "rejected"
+
+    L'API passe par requestes.services.accept_join_request (UPDATE
+    conditionnels), qui ne déclenche pas ce signal.
     """
-    if instance.status == "accepted":
-        team = instance.team
+    if instance.status != "accepted":
+        return
+
+    if instance.team.members.filter(id=instance.player_id).exists():
+        return
 
-        # Vérifie si l'équipe est déjà pleine
-        if team.current_capacity >= team.max_capacity:
+    with transaction.atomic():
+        if not add_player_to_team(instance.team_id, instance.player_id):
             # Annule l'acceptation si l'équipe est pleine
+            JoinRequest.objects.filter(id=instance.id).update(status="rejected")
             instance.status = "rejected"
-            instance.save(update_fields=["status"])
-            return
-
-        # Sinon, ajoute le joueur
-        team.members.add(instance.player)
-        team.current_capacity = team.members.count()
-        team.save()
\ No newline at end of file
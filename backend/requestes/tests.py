@@ -1,3 +1,278 @@
-from django.test import TestCase
+import threading
 
-# Create your tests here.
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from TeamSportFinder.testing import QueryBudgetTestCase, make_token
+from accounts.models import User
+from requestes.models import JoinRequest
+from requestes.services import RequestAlreadyProcessed, TeamFull, accept_join_request, add_player_to_team
+from tournaments.models import Team, Tournament
+
+
+def create_team_with_requests(max_capacity, requests):
+    """Crée un organisateur, une équipe et `requests` demandes en attente"""
+    organizer = User.objects.create(clerk_id='org', email='org@example.com', full_name='Org', role='organizer')
+    tournament = Tournament.objects.create(
+        name='Coupe', sport='Soccer', city='Laval', start_date='2026-01-01', organizer=organizer
+    )
+    team = Team.objects.create(name='A', tournament=tournament, max_capacity=max_capacity)
+    join_requests = []
+    for i in range(requests):
+        player = User.objects.create(
+            clerk_id=f'p{i}', email=f'p{i}@example.com', full_name=f'P{i}', role='player'
+        )
+        join_requests.append(JoinRequest.objects.create(player=player, team=team))
+    return organizer, team, join_requests
+
+
+@override_settings(CLERK_JWKS_URL=None)
+class AcceptJoinRequestTests(TestCase):
+    """Acceptation atomique : statut, capacité et membres restent cohérents"""
+
+    def setUp(self):
+        self.organizer, self.team, self.requests = create_team_with_requests(max_capacity=1, requests=2)
+
+    def accept(self, join_request):
+        return self.client.post(
+            f'/api/join-requests/{join_request.id}/accept/',
+            HTTP_AUTHORIZATION=f'Bearer {make_token(self.organizer.clerk_id)}',
+        )
+
+    def test_accept_adds_member(self):
+        response = self.accept(self.requests[0])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['team']['current_capacity'], 1)
+        self.team.refresh_from_db()
+        self.assertEqual(self.team.current_capacity, 1)
+        self.assertEqual(list(self.team.members.all()), [self.requests[0].player])
+
+    def test_full_team_changes_nothing(self):
+        self.accept(self.requests[0])
+        response = self.accept(self.requests[1])
+
+        self.assertEqual(response.status_code, 400)
+        self.requests[1].refresh_from_db()
+        self.assertEqual(self.requests[1].status, 'pending')
+        self.team.refresh_from_db()
+        self.assertEqual(self.team.current_capacity, 1)
+
+    def test_already_processed(self):
+        accept_join_request(self.requests[0])
+        with self.assertRaises(RequestAlreadyProcessed):
+            accept_join_request(JoinRequest.objects.get(id=self.requests[0].id))
+        with self.assertRaises(TeamFull):
+            accept_join_request(self.requests[1])
+
+    def test_existing_member_takes_no_place(self):
+        self.team.max_capacity = 2
+        self.team.save()
+        player_id = self.requests[0].player_id
+        self.assertTrue(add_player_to_team(self.team.id, player_id))
+        self.assertTrue(add_player_to_team(self.team.id, player_id))
+
+        self.team.refresh_from_db()
+        self.assertEqual(self.team.current_capacity, 1)
+        self.assertEqual(self.team.members.count(), 1)
+
+    def test_save_accepted_uses_signal(self):
+        self.requests[0].status = 'accepted'
+        self.requests[0].save()
+        self.requests[1].status = 'accepted'
+        self.requests[1].save()
+
+        self.team.refresh_from_db()
+        self.assertEqual(self.team.current_capacity, 1)
+        self.assertEqual(JoinRequest.objects.get(id=self.requests[1].id).status, 'rejected')
+
+
+@override_settings(CLERK_JWKS_URL=None)
+class BulkJoinRequestTests(TestCase):
+    """POST /api/join-requests/bulk/ : une transaction, un résultat par décision"""
+
+    def setUp(self):
+        self.organizer, self.team, self.requests = create_team_with_requests(max_capacity=2, requests=4)
+
+    def bulk(self, decisions, user=None):
+        return self.client.post(
+            '/api/join-requests/bulk/',
+            data={'decisions': decisions},
+            content_type='application/json',
+            HTTP_AUTHORIZATION=f'Bearer {make_token((user or self.organizer).clerk_id)}',
+        )
+
+    def test_outcomes(self):
+        accept_join_request(self.requests[3])
+        missing = '00000000-0000-4000-8000-000000000000'
+        response = self.bulk([
+            {'id': str(self.requests[0].id), 'decision': 'accept'},
+            {'id': str(self.requests[1].id), 'decision': 'accept'},
+            {'id': str(self.requests[2].id), 'decision': 'reject'},
+            {'id': str(self.requests[3].id), 'decision': 'reject'},
+            {'id': missing, 'decision': 'accept'},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        outcomes = [item['outcome'] for item in response.json()['results']]
+        self.assertEqual(outcomes, ['accepted', 'refused_full', 'rejected', 'already_processed', 'not_found'])
+        self.assertEqual(response.json()['summary']['accepted'], 1)
+
+        self.team.refresh_from_db()
+        self.assertEqual(self.team.current_capacity, 2)
+        self.assertEqual(self.team.members.count(), 2)
+        statuses = dict(JoinRequest.objects.values_list('id', 'status'))
+        self.assertEqual(statuses[self.requests[1].id], 'pending')
+        self.assertEqual(statuses[self.requests[2].id], 'rejected')
+
+    def test_existing_member_takes_no_place(self):
+        add_player_to_team(self.team.id, self.requests[0].player_id)
+        response = self.bulk([
+            {'id': str(self.requests[0].id), 'decision': 'accept'},
+            {'id': str(self.requests[1].id), 'decision': 'accept'},
+        ])
+
+        outcomes = [item['outcome'] for item in response.json()['results']]
+        self.assertEqual(outcomes, ['accepted', 'accepted'])
+        self.team.refresh_from_db()
+        self.assertEqual(self.team.current_capacity, 2)
+        self.assertEqual(self.team.members.count(), 2)
+
+    def test_other_organizer_is_forbidden(self):
+        other = User.objects.create(clerk_id='org2', email='org2@example.com', full_name='Org2', role='organizer')
+        response = self.bulk([{'id': str(self.requests[0].id), 'decision': 'accept'}], user=other)
+
+        self.assertEqual(response.json()['results'][0]['outcome'], 'forbidden')
+        self.assertEqual(JoinRequest.objects.get(id=self.requests[0].id).status, 'pending')
+
+    def test_duplicates_are_invalid(self):
+        decision = {'id': str(self.requests[0].id), 'decision': 'accept'}
+        self.assertEqual(self.bulk([decision, decision]).status_code, 400)
+
+
+@override_settings(CLERK_JWKS_URL=None)
+class InboxPaginationTests(TestCase):
+    """my/received : pagination par curseur et filtre ?status="""
+
+    def setUp(self):
+        self.organizer, self.team, self.requests = create_team_with_requests(max_capacity=30, requests=25)
+        JoinRequest.objects.filter(id__in=[r.id for r in self.requests[:5]]).update(status='rejected')
+
+    def get(self, url, user=None):
+        return self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {make_token((user or self.organizer).clerk_id)}')
+
+    def test_received_is_paginated_by_cursor(self):
+        first = self.get('/api/join-requests/received/').json()
+        self.assertEqual(len(first['results']), 20)
+        second = self.get(first['next']).json()
+        self.assertEqual(len(second['results']), 5)
+        self.assertIsNone(second['next'])
+
+        ids = [item['id'] for item in first['results'] + second['results']]
+        self.assertEqual(len(set(ids)), 25)
+        dates = [item['created_at'] for item in first['results']]
+        self.assertEqual(dates, sorted(dates, reverse=True))
+
+    def test_status_filter(self):
+        data = self.get('/api/join-requests/received/?status=rejected').json()
+        self.assertEqual(len(data['results']), 5)
+        self.assertTrue(all(item['status'] == 'rejected' for item in data['results']))
+
+        self.assertEqual(self.get('/api/join-requests/received/?status=unknown').status_code, 400)
+
+    def test_my_requests(self):
+        player = self.requests[0].player
+        data = self.get('/api/join-requests/my/?status=rejected', user=player).json()
+        self.assertEqual([item['id'] for item in data['results']], [str(self.requests[0].id)])
+
+
+class ParallelAcceptTests(TransactionTestCase):
+    """Des acceptations simultanées ne dépassent jamais max_capacity"""
+
+    def test_parallel_accepts(self):
+        _, team, join_requests = create_team_with_requests(max_capacity=5, requests=20)
+        barrier = threading.Barrier(len(join_requests))
+        results = []
+
+        def worker(join_request):
+            try:
+                barrier.wait()
+                accept_join_request(join_request)
+                results.append('accepted')
+            except TeamFull:
+                results.append('full')
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(r,)) for r in join_requests]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        team.refresh_from_db()
+        self.assertEqual(results.count('accepted'), 5)
+        self.assertEqual(results.count('full'), 15)
+        self.assertEqual(team.current_capacity, 5)
+        self.assertEqual(team.members.count(), 5)
+        self.assertEqual(JoinRequest.objects.filter(team=team, status='accepted').count(), 5)
+
+
+class JoinRequestQueryBudgetTests(QueryBudgetTestCase):
+    """Budgets de requêtes SQL des actions de JoinRequestViewSet"""
+
+    def test_list(self):
+        self.assertQueryBudget('join-requests-list', 'get', '/api/join-requests/', self.organizer, budget=3)
+
+    def test_retrieve(self):
+        url = f'/api/join-requests/{self.pending_request.id}/'
+        self.assertQueryBudget('join-requests-detail', 'get', url, self.organizer, budget=2)
+
+    def test_my_requests(self):
+        self.assertQueryBudget('join-requests-my', 'get', '/api/join-requests/my/', self.player, budget=2)
+
+    def test_received_requests(self):
+        self.assertQueryBudget('join-requests-received', 'get', '/api/join-requests/received/',
+                               self.organizer, budget=2)
+
+    def test_received_requests_pending(self):
+        self.assertQueryBudget('join-requests-received (pending)', 'get',
+                               '/api/join-requests/received/?status=pending', self.organizer, budget=2)
+
+    def test_create(self):
+        team = (
+            Team.objects.filter(current_capacity__lt=F('max_capacity'))
+            .exclude(members=self.player)
+            .exclude(join_requests_as_team__player=self.player)
+            .first()
+        )
+        self.assertQueryBudget('join-requests-create', 'post', '/api/join-requests/', self.player,
+                               budget=4, data={'team_id': str(team.id), 'message': 'Salut'}, status=201)
+
+    def test_accept(self):
+        url = f'/api/join-requests/{self.pending_request.id}/accept/'
+        self.assertQueryBudget('join-requests-accept', 'post', url, self.organizer, budget=8)
+
+    def test_reject(self):
+        url = f'/api/join-requests/{self.pending_request.id}/reject/'
+        self.assertQueryBudget('join-requests-reject', 'post', url, self.organizer, budget=3)
+
+    def test_bulk(self):
+        pending = JoinRequest.objects.filter(
+            team__tournament__organizer=self.organizer, status='pending'
+        ).order_by('id')[:20]
+        decisions = [
+            {'id': str(r.id), 'decision': 'accept' if i % 2 else 'reject'} for i, r in enumerate(pending)
+        ]
+        self.assertQueryBudget('join-requests-bulk', 'post', '/api/join-requests/bulk/', self.organizer,
+                               budget=10, data={'decisions': decisions})
+
+    def test_cancel(self):
+        url = f'/api/join-requests/{self.player_request.id}/cancel/'
+        self.assertQueryBudget('join-requests-cancel', 'post', url, self.player, budget=3)
+
+    def test_partial_update(self):
+        url = f'/api/join-requests/{self.pending_request.id}/'
+        self.assertQueryBudget('join-requests-partial-update', 'patch', url, self.organizer,
+                               budget=3, data={'status': 'rejected'})
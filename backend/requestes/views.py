@@ -5,24 +5,44 @@ from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
 
 from requestes.models import JoinRequest
+from requestes.services import (
+    RequestAlreadyProcessed,
+    TeamFull,
+    accept_join_request,
+    process_join_requests,
+    reject_join_request,
+)
 from accounts.permissions import IsPlayer, IsOrganizer
 from tournaments.models import Team
 from accounts.serializers import (
     JoinRequestSerializer,
     JoinRequestDetailSerializer,
-    JoinRequestUpdateSerializer
+    JoinRequestUpdateSerializer,
+    JoinRequestBulkSerializer,
 )
 
 
+class JoinRequestCursorPagination(CursorPagination):
+    """
+    Pagination par curseur sur created_at (plus récentes d'abord) : le coût
+    d'une page ne dépend pas de sa position dans la liste
+    """
+    ordering = '-created_at'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
 class JoinRequestViewSet(viewsets.ModelViewSet):
     """
     ViewSet pour gérer les demandes d'adhésion.
     - Joueur : créer une demande, voir ses demandes
     - Organisateur : voir les demandes reçues, accepter/refuser
     """
-    queryset = JoinRequest.objects.all()
+    queryset = JoinRequest.objects.select_related('player', 'team__tournament')
     permission_classes = [IsAuthenticated]
 
     def get_permissions(self):
@@ -31,7 +51,7 @@ class JoinRequestViewSet(viewsets.ModelViewSet):
         """
         if self.action in ['create', 'my_requests', 'cancel']:
             return [IsAuthenticated(), IsPlayer()]
-        elif self.action in ['update', 'partial_update', 'received_requests', 'accept', 'reject']:
+        elif self.action in ['update', 'partial_update', 'received_requests', 'accept', 'reject', 'bulk']:
             return [IsAuthenticated(), IsOrganizer()]
         return [IsAuthenticated()]
     def get_serializer_class(self):
@@ -42,19 +62,38 @@ class JoinRequestViewSet(viewsets.ModelViewSet):
         return JoinRequestDetailSerializer
 
     # --- Actions personnalisées ---
-    @action(detail=False, methods=['get'], url_path='my', permission_classes=[IsAuthenticated, IsPlayer])
+    def filter_by_status(self, queryset):
+        """Filtre optionnel ?status=pending|accepted|rejected (None si invalide)"""
+        status_param = self.request.query_params.get('status')
+        if not status_param:
+            return queryset
+        if status_param not in dict(JoinRequest.STATUS_CHOICES):
+            return None
+        return queryset.filter(status=status_param)
+
+    def paginated_response(self, queryset):
+        """Réponse paginée par curseur, ou 400 si le filtre de statut est invalide"""
+        queryset = self.filter_by_status(queryset)
+        if queryset is None:
+            return Response(
+                {"error": "Statut invalide. Valeurs possibles : pending, accepted, rejected."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        page = self.paginate_queryset(queryset)
+        serializer = JoinRequestDetailSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=['get'], url_path='my', permission_classes=[IsAuthenticated, IsPlayer],
+            pagination_class=JoinRequestCursorPagination)
     def my_requests(self, request):
-        """Joueur : voir toutes ses demandes"""
-        qs = JoinRequest.objects.filter(player=request.user)
-        serializer = JoinRequestDetailSerializer(qs, many=True)
-        return Response(serializer.data)
+        """Joueur : voir ses demandes (paginées, ?status= optionnel)"""
+        return self.paginated_response(self.get_queryset().filter(player=request.user))
 
-    @action(detail=False, methods=['get'], url_path='received', permission_classes=[IsAuthenticated, IsOrganizer])
+    @action(detail=False, methods=['get'], url_path='received', permission_classes=[IsAuthenticated, IsOrganizer],
+            pagination_class=JoinRequestCursorPagination)
     def received_requests(self, request):
-        """Organisateur : voir toutes les demandes reçues"""
-        qs = JoinRequest.objects.filter(team__tournament__organizer=request.user)
-        serializer = JoinRequestDetailSerializer(qs, many=True)
-        return Response(serializer.data)
+        """Organisateur : voir les demandes reçues (paginées, ?status= optionnel)"""
+        return self.paginated_response(self.get_queryset().filter(team__tournament__organizer=request.user))
 
     @action(detail=True, methods=['post'], url_path='accept', permission_classes=[IsAuthenticated, IsOrganizer])
     def accept(self, request, pk=None):
@@ -62,8 +101,8 @@ class JoinRequestViewSet(viewsets.ModelViewSet):
         Organisateur : accepter une demande d'adhésion.
         - Vérifie que l'organisateur est propriétaire du tournoi
         - Vérifie que la demande est en statut 'pending'
-        - Met le statut à 'accepted'
-        - Le signal Django ajoutera automatiquement le joueur à l'équipe
+        - Met le statut à 'accepted' et ajoute le joueur à l'équipe de façon
+          atomique (voir requestes.services)
         """
         try:
             join_request = self.get_object()
@@ -74,31 +113,27 @@ class JoinRequestViewSet(viewsets.ModelViewSet):
             )
 
         # Vérifier que l'organisateur est bien le propriétaire du tournoi
-        if join_request.team.tournament.organizer != request.user:
+        if join_request.team.tournament.organizer_id != request.user.id:
             return Response(
                 {"error": "Vous n'êtes pas autorisé à gérer cette demande."},
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        # Vérifier que la demande est en attente
-        if join_request.status != 'pending':
+        # Accepter la demande (statut 'pending' et capacité vérifiés dans le UPDATE)
+        try:
+            accept_join_request(join_request)
+        except RequestAlreadyProcessed:
+            join_request.refresh_from_db(fields=['status'])
             return Response(
                 {"error": f"Cette demande a déjà été traitée (statut: {join_request.get_status_display()})."},
                 status=status.HTTP_400_BAD_REQUEST
             )
-
-        # Vérifier que l'équipe n'est pas pleine
-        if join_request.team.is_full:
+        except TeamFull:
             return Response(
                 {"error": "L'équipe est déjà complète. Impossible d'accepter la demande."},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Accepter la demande
-        join_request.status = 'accepted'
-        join_request.save()
-
-        # Le signal Django s'occupera d'ajouter le joueur à l'équipe
         serializer = JoinRequestDetailSerializer(join_request)
         return Response(
             {
@@ -125,23 +160,22 @@ class JoinRequestViewSet(viewsets.ModelViewSet):
             )
 
         # Vérifier que l'organisateur est bien le propriétaire du tournoi
-        if join_request.team.tournament.organizer != request.user:
+        if join_request.team.tournament.organizer_id != request.user.id:
             return Response(
                 {"error": "Vous n'êtes pas autorisé à gérer cette demande."},
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        # Vérifier que la demande est en attente
-        if join_request.status != 'pending':
+        # Refuser la demande (si elle est toujours en attente)
+        try:
+            reject_join_request(join_request)
+        except RequestAlreadyProcessed:
+            join_request.refresh_from_db(fields=['status'])
             return Response(
                 {"error": f"Cette demande a déjà été traitée (statut: {join_request.get_status_display()})."},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Refuser la demande
-        join_request.status = 'rejected'
-        join_request.save()
-
         serializer = JoinRequestDetailSerializer(join_request)
         return Response(
             {
@@ -151,6 +185,31 @@ class JoinRequestViewSet(viewsets.ModelViewSet):
             status=status.HTTP_200_OK
         )
 
+    @action(detail=False, methods=['post'], url_path='bulk', permission_classes=[IsAuthenticated, IsOrganizer])
+    def bulk(self, request):
+        """
+        Organisateur : accepter/refuser plusieurs demandes en une seule transaction.
+        Body: {"decisions": [{"id": "<uuid>", "decision": "accept" | "reject"}, ...]}
+        - Retourne le résultat de chaque décision (accepted, rejected, refused_full,
+          not_found, forbidden, already_processed)
+        """
+        serializer = JoinRequestBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        decisions = [(item['id'], item['decision']) for item in serializer.validated_data['decisions']]
+        results = process_join_requests(request.user, decisions)
+
+        summary = {}
+        for item in results:
+            summary[item['outcome']] = summary.get(item['outcome'], 0) + 1
+        return Response(
+            {
+                "results": results,
+                "summary": summary
+            },
+            status=status.HTTP_200_OK
+        )
+
     @action(detail=True, methods=['post'], url_path='cancel', permission_classes=[IsAuthenticated, IsPlayer])
     def cancel(self, request, pk=None):
         """
@@ -168,7 +227,7 @@ class JoinRequestViewSet(viewsets.ModelViewSet):
             )
 
         # Vérifier que le joueur est bien l'auteur de la demande
-        if join_request.player != request.user:
+        if join_request.player_id != request.user.id:
             return Response(
                 {"error": "Vous n'êtes pas autorisé à annuler cette demande."},
                 status=status.HTTP_403_FORBIDDEN
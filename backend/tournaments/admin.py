@@ -13,8 +13,9 @@
 #     search_fields = ('name', 'tournament__name')
 #     list_filter = ('tournament', 'max_capacity')
 
-from django.contrib import admin
+from django.contrib import admin, messages
 from requestes.models import JoinRequest
+from requestes.services import JoinRequestError, accept_join_request
 from .models import Tournament, Team
 
 @admin.register(Tournament)
@@ -53,13 +54,14 @@ class JoinRequestAdmin(admin.ModelAdmin):
     actions = ['accept_requests', 'reject_requests']
 
     def accept_requests(self, request, queryset):
-        for req in queryset:
-            if not req.team.is_full:
-                req.status = 'accepted'
-                req.team.members.add(req.player)
-                req.team.current_capacity += 1
-                req.team.save()
-                req.save()
+        accepted = 0
+        for req in queryset.filter(status='pending'):
+            try:
+                accept_join_request(req)
+                accepted += 1
+            except JoinRequestError:
+                pass  # équipe pleine ou demande traitée entre-temps
+        self.message_user(request, f"{accepted} demande(s) acceptée(s).", messages.SUCCESS)
     accept_requests.short_description = "Accepter les demandes sélectionnées"
 
     def reject_requests(self, request, queryset):
@@ -0,0 +1,188 @@
+"""
+Cache des réponses de la liste et du détail des tournois (CACHES['default'])
+
+Les réponses ne dépendent pas de l'utilisateur : une entrée est partagée par
+tous. La clé d'une réponse contient l'URL complète (paramètres de requête,
+pagination) et les générations dont elle dépend :
+    - 'list' : la liste des tournois (nombre d'équipes, organisateur...)
+    - 'details' (tous les détails : organisateurs) et l'id du tournoi : le
+      détail d'un tournoi
+
+Une génération est un compteur du cache, avancé (incr) à chaque écriture qui
+change ce qu'affiche la réponse (signaux de tournaments/signals.py et
+touch_tournaments) : les anciennes entrées ne sont plus jamais lues et
+expirent d'elles-mêmes (TOURNAMENT_CACHE_TTL). Une génération absente (cache
+vidé ou entrée évincée) repart de l'horloge en nanosecondes, plus grande que
+toutes les valeurs déjà servies.
+
+Les générations avancent aussi après le commit : une lecture concurrente
+pendant la transaction ne peut pas garder l'ancien état sous la nouvelle
+génération.
+
+Le cache n'est utilisé que si TOURNAMENT_CACHE_ENABLED (par défaut : avec
+REDIS_URL) : un cache en mémoire locale n'est pas partagé entre les
+processus, qui serviraient l'ancien état jusqu'à TOURNAMENT_CACHE_TTL.
+"""
+import functools
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+LIST = 'list'
+DETAILS = 'details'
+
+KEY_PREFIX = 'tournaments'
+
+
+class ResponseCache:
+    """
+    Réponses (response.data) en cache sous les générations de leurs données
+
+    Les compteurs hits/misses (par endpoint) sont propres au processus.
+    """
+
+    def __init__(self, prefix=KEY_PREFIX):
+        self.prefix = prefix
+        self.hits = {}
+        self.misses = {}
+        self._lock = threading.Lock()
+
+    def _generation_key(self, scope):
+        return f'{self.prefix}:gen:{scope}'
+
+    def generations(self, scopes):
+        """
+        Générations courantes des scopes (un seul aller-retour au cache si elles existent)
+
+        Returns:
+            tuple: Une génération par scope, dans l'ordre
+        """
+        keys = [self._generation_key(scope) for scope in scopes]
+        values = cache.get_many(keys)
+        for key in keys:
+            if key not in values:
+                # add() : un autre processus a pu l'initialiser entre-temps
+                cache.add(key, time.time_ns(), timeout=None)
+                values[key] = cache.get(key) or time.time_ns()
+        return tuple(values[key] for key in keys)
+
+    def bump(self, *scopes):
+        """Avance les générations des scopes, maintenant et après le commit"""
+        scopes = [str(scope) for scope in scopes if scope is not None]
+        if not scopes:
+            return
+        self._incr(scopes)
+        transaction.on_commit(lambda: self._incr(scopes))
+
+    def _incr(self, scopes):
+        for scope in scopes:
+            key = self._generation_key(scope)
+            try:
+                cache.incr(key)
+            except ValueError:
+                # Jamais lue : la prochaine lecture l'initialisera
+                pass
+
+    def enabled(self):
+        """Générations fiables (cache partagé, ou un seul processus) : voir TOURNAMENT_CACHE_ENABLED"""
+        return settings.TOURNAMENT_CACHE_ENABLED
+
+    def response_key(self, endpoint, request, generations):
+        url = request.build_absolute_uri()
+        digest = hashlib.sha1(f'{url}|{generations!r}'.encode()).hexdigest()
+        return f'{self.prefix}:{endpoint}:{digest}'
+
+    def get(self, endpoint, key):
+        """Retourne les données en cache, ou None (compte un hit ou un miss)"""
+        data = cache.get(key)
+        with self._lock:
+            counter = self.misses if data is None else self.hits
+            counter[endpoint] = counter.get(endpoint, 0) + 1
+        return data
+
+    def set(self, key, data):
+        cache.set(key, data, timeout=settings.TOURNAMENT_CACHE_TTL)
+
+    def stats(self):
+        """
+        Statistiques par endpoint
+
+        Returns:
+            dict: {endpoint: {'hits', 'misses', 'hit_ratio'}}
+        """
+        with self._lock:
+            endpoints = sorted(set(self.hits) | set(self.misses))
+            stats = {}
+            for endpoint in endpoints:
+                hits, misses = self.hits.get(endpoint, 0), self.misses.get(endpoint, 0)
+                stats[endpoint] = {
+                    'hits': hits,
+                    'misses': misses,
+                    'hit_ratio': hits / (hits + misses) if hits + misses else 0.0,
+                }
+            return stats
+
+    def clear_stats(self):
+        with self._lock:
+            self.hits.clear()
+            self.misses.clear()
+
+
+response_cache = ResponseCache()
+
+
+def bump_tournaments(tournament_ids=None):
+    """La liste et le détail des tournois donnés (tous si None) ont changé"""
+    if tournament_ids is None:
+        response_cache.bump(LIST, DETAILS)
+    else:
+        response_cache.bump(LIST, *tournament_ids)
+
+
+def view_generations(view, scopes):
+    """Générations lues une fois par requête (vue DRF) : ETag et clé de cache"""
+    generations = getattr(view, '_cache_generations', None)
+    if generations is None:
+        generations = view._cache_generations = response_cache.generations(scopes)
+    return generations
+
+
+def cached_response(endpoint, scopes_func):
+    """
+    Décorateur d'action DRF (GET) : réponse 200 servie depuis le cache
+
+    En cas de hit, ni le queryset ni le serializer ne sont exécutés. L'en-tête
+    X-Cache (HIT / MISS) indique d'où vient la réponse. Sans
+    TOURNAMENT_CACHE_ENABLED, la vue s'exécute directement.
+
+    Args:
+        endpoint: Nom de l'endpoint (clés et statistiques)
+        scopes_func: (view, request, *args, **kwargs) -> scopes, ou None pour ne pas cacher
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            scopes = scopes_func(view, request, *args, **kwargs) if response_cache.enabled() else None
+            if scopes is None:
+                return method(view, request, *args, **kwargs)
+
+            key = response_cache.response_key(endpoint, request, view_generations(view, scopes))
+            data = response_cache.get(endpoint, key)
+            if data is not None:
+                response = Response(data)
+                response['X-Cache'] = 'HIT'
+                return response
+
+            response = method(view, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                response_cache.set(key, response.data)
+                response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
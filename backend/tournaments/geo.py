@@ -0,0 +1,177 @@
+"""
+Géolocalisation des tournois : gazetteer hors ligne et recherche par rayon
+
+Les coordonnées d'un tournoi viennent de sa ville, cherchée dans
+data/gazetteer.csv (aucun appel réseau). La recherche "près de moi" se fait
+en deux temps :
+    1. Boîte englobante sur les colonnes latitude/longitude indexées
+       (index B-tree composite, parcours d'intervalle sur la latitude)
+    2. Distance exacte (haversine) calculée en SQL sur les seules lignes
+       restantes, puis filtrée sur le rayon
+
+Pour les équipes, les tournois du rayon sont choisis par une sous-requête ;
+toutes leurs équipes sont retournées, la pagination limite les lignes.
+"""
+import csv
+import math
+import os
+import re
+from functools import lru_cache
+
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+
+from tournaments.models import Tournament
+from tournaments.search import normalize_term
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(__file__), 'data', 'gazetteer.csv')
+EARTH_RADIUS_KM = 6371.0088
+MAX_RADIUS_KM = 500
+
+
+def normalize_city(city):
+    """'Saint-Jérôme', 'ST JEROME', 'st-jérôme' -> 'saint jerome'"""
+    words = re.sub(r"[-'’.]", ' ', normalize_term(city or '')).split()
+    aliases = {'st': 'saint', 'ste': 'sainte'}
+    return ' '.join(aliases.get(word, word) for word in words)
+
+
+@lru_cache(maxsize=1)
+def load_gazetteer():
+    """
+    Charge le gazetteer une fois par processus
+
+    Returns:
+        dict: Nom de ville normalisé -> (latitude, longitude)
+    """
+    with open(GAZETTEER_PATH, encoding='utf-8') as f:
+        return {
+            normalize_city(row['city']): (float(row['latitude']), float(row['longitude']))
+            for row in csv.DictReader(f)
+        }
+
+
+def lookup_city(city):
+    """
+    Retourne les coordonnées d'une ville du gazetteer
+
+    Returns:
+        tuple ou None: (latitude, longitude), None si la ville est inconnue
+    """
+    return load_gazetteer().get(normalize_city(city))
+
+
+def parse_near(value, radius_km):
+    """
+    Valide les paramètres ?near=lat,lng&radius_km=...
+
+    Returns:
+        tuple: (latitude, longitude, radius_km)
+
+    Raises:
+        ValueError: Si les valeurs sont invalides (message pour l'utilisateur)
+    """
+    try:
+        latitude, longitude = (float(part) for part in value.split(','))
+    except (AttributeError, ValueError):
+        raise ValueError("Le paramètre 'near' doit être de la forme 'latitude,longitude'.")
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError("Coordonnées hors limites.")
+
+    try:
+        radius_km = float(radius_km)
+    except (TypeError, ValueError):
+        raise ValueError("Le paramètre 'radius_km' doit être un nombre.")
+    if not 0 < radius_km <= MAX_RADIUS_KM:
+        raise ValueError(f"Le rayon doit être compris entre 0 et {MAX_RADIUS_KM} km.")
+
+    return latitude, longitude, radius_km
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Boîte (min_lat, max_lat, min_lng, max_lng) qui contient le cercle
+
+    Près des pôles, la boîte couvre toutes les longitudes. Elle est bornée
+    à [-180, 180] sans traverser l'antiméridien (sans objet pour le Canada).
+    """
+    delta_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = math.cos(math.radians(latitude))
+    if cos_lat < 1e-6 or abs(latitude) + delta_lat >= 90:
+        delta_lng = 180
+    else:
+        delta_lng = min(180, math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat)))
+    return (
+        max(-90.0, latitude - delta_lat),
+        min(90.0, latitude + delta_lat),
+        max(-180.0, longitude - delta_lng),
+        min(180.0, longitude + delta_lng),
+    )
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Distance orthodromique en km (version Python, même formule qu'en SQL)"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def haversine_expression(latitude_field, longitude_field, latitude, longitude):
+    """Expression SQL de la distance (km) entre des colonnes et un point"""
+    phi1 = math.radians(latitude)
+    phi2 = Radians(F(latitude_field))
+    a = (
+        Power(Sin((phi2 - Value(phi1)) / 2), 2)
+        + Value(math.cos(phi1)) * Cos(phi2)
+        * Power(Sin((Radians(F(longitude_field)) - Value(math.radians(longitude))) / 2), 2)
+    )
+    return Value(2 * EARTH_RADIUS_KM) * ASin(Least(Value(1.0), Sqrt(a), output_field=FloatField()))
+
+
+def filter_near(queryset, latitude, longitude, radius_km, prefix=''):
+    """
+    Garde les lignes dont le point (prefix + latitude/longitude) est dans le rayon
+
+    Args:
+        queryset: Queryset de Tournament, ou d'un modèle lié (prefix='tournament__')
+        latitude, longitude: Le centre de recherche
+        radius_km: Le rayon en km
+        prefix: Chemin vers le tournoi depuis le modèle du queryset
+
+    Returns:
+        QuerySet: Annoté avec distance_km
+    """
+    min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, longitude, radius_km)
+    return (
+        queryset
+        .filter(**{
+            f'{prefix}latitude__range': (min_lat, max_lat),
+            f'{prefix}longitude__range': (min_lng, max_lng),
+        })
+        .annotate(distance_km=haversine_expression(f'{prefix}latitude', f'{prefix}longitude', latitude, longitude))
+        .filter(distance_km__lte=radius_km)
+    )
+
+
+def filter_teams_near(queryset, latitude, longitude, radius_km):
+    """
+    Garde les équipes des tournois dans le rayon
+
+    Les tournois du rayon sont choisis par une sous-requête (index
+    latitude/longitude), puis les équipes sont lues par tournament_id
+    (index de la clé étrangère).
+
+    Args:
+        queryset: Queryset de Team, déjà filtré (disponibilité...)
+        latitude, longitude: Le centre de recherche
+        radius_km: Le rayon en km
+
+    Returns:
+        QuerySet: Annoté avec distance_km (distance du tournoi)
+    """
+    nearby = filter_near(Tournament.objects.all(), latitude, longitude, radius_km).values('id')
+    return queryset.filter(tournament_id__in=nearby).annotate(
+        distance_km=haversine_expression('tournament__latitude', 'tournament__longitude', latitude, longitude)
+    )
@@ -0,0 +1,82 @@
+"""
+Compare le rendu et la lecture JSON : DRF (json) et FastJSON (orjson)
+
+Les données sont celles des listes de l'API (mêmes serializers), plus une
+liste de matchs en valeurs brutes (UUID, datetime non convertis).
+
+Exemples:
+    python manage.py benchmark_json
+    python manage.py benchmark_json --rows 10000 --repeat 10
+"""
+import io
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from matches.models import Match
+from matches.serializers import MatchListSerializer
+from tournaments.models import Team, Tournament
+from tournaments.serializers import TeamListSerializer, TournamentListSerializer
+from tournaments.views import annotate_tournament_counts
+from TeamSportFinder.renderers import FastJSONParser, FastJSONRenderer, orjson
+
+
+def list_payloads(rows):
+    """(nom, données) des listes comparées, rows lignes chacune"""
+    tournaments = annotate_tournament_counts(Tournament.objects.select_related('organizer')).order_by('id')[:rows]
+    teams = Team.objects.select_related('tournament').order_by('id')[:rows]
+    matches = Match.objects.select_related('team_a', 'team_b', 'tournament').order_by('id')[:rows]
+    return [
+        ('tournaments-list', TournamentListSerializer(tournaments, many=True).data),
+        ('teams-list', TeamListSerializer(teams, many=True).data),
+        ('matches-list', MatchListSerializer(matches, many=True).data),
+        ('matches (valeurs brutes)', list(Match.objects.order_by('id').values(
+            'id', 'team_a_id', 'team_b_id', 'tournament_id', 'date', 'ends_at', 'location',
+            'score_a', 'score_b', 'created_at')[:rows])),
+    ]
+
+
+def median_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+class Command(BaseCommand):
+    help = "Compare le rendu et la lecture JSON de DRF (json) et de FastJSON (orjson)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help="Lignes par liste")
+        parser.add_argument('--repeat', type=int, default=20, help="Mesures par cas (médiane)")
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError("orjson n'est pas installé : FastJSON utilise déjà json.")
+        repeat = options['repeat']
+        drf_renderer, fast_renderer = JSONRenderer(), FastJSONRenderer()
+        drf_parser, fast_parser = JSONParser(), FastJSONParser()
+
+        self.stdout.write(f"{'liste':<26} {'lignes':>7} {'octets':>10}   {'rendu json':>11} {'orjson':>8} "
+                          f"{'gain':>6}   {'lecture json':>13} {'orjson':>8} {'gain':>6}")
+        for name, data in list_payloads(options['rows']):
+            content = drf_renderer.render(data)
+            fast_content = fast_renderer.render(data)
+            if name != 'matches (valeurs brutes)' and json.loads(content) != json.loads(fast_content):
+                raise CommandError(f"{name} : les deux rendus diffèrent")
+
+            render_drf = median_ms(lambda: drf_renderer.render(data), repeat)
+            render_fast = median_ms(lambda: fast_renderer.render(data), repeat)
+            parse_drf = median_ms(lambda: drf_parser.parse(io.BytesIO(content)), repeat)
+            parse_fast = median_ms(lambda: fast_parser.parse(io.BytesIO(content)), repeat)
+            self.stdout.write(
+                f"{name:<26} {len(data):>7} {len(content):>10}   {render_drf:>8.2f} ms {render_fast:>5.2f} ms "
+                f"{render_drf / render_fast:>5.1f}x   {parse_drf:>10.2f} ms {parse_fast:>5.2f} ms "
+                f"{parse_drf / parse_fast:>5.1f}x"
+            )
@@ -0,0 +1,82 @@
+"""
+Compare les serializers de liste (instances) et leur plan values() (TeamSportFinder/rows.py)
+
+Pour chaque liste : lecture en base puis conversion, par les deux chemins.
+Le JSON des deux chemins est vérifié identique avant la mesure.
+
+Exemples:
+    python manage.py benchmark_serializers
+    python manage.py benchmark_serializers --rows 10000 --repeat 5
+"""
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from matches.models import Match
+from matches.serializers import MatchListSerializer
+from tournaments.models import Team, Tournament
+from tournaments.serializers import TeamListSerializer, TournamentListSerializer
+from tournaments.views import annotate_tournament_counts
+from TeamSportFinder.rows import row_plan
+
+
+def list_querysets(rows):
+    """(serializer, queryset) des listes comparées, comme les construisent les vues"""
+    return [
+        (TournamentListSerializer,
+         annotate_tournament_counts(Tournament.objects.select_related('organizer')).order_by('id')[:rows]),
+        (TeamListSerializer, Team.objects.select_related('tournament').order_by('id')[:rows]),
+        (MatchListSerializer, Match.objects.select_related('team_a', 'team_b', 'tournament').order_by('id')[:rows]),
+    ]
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+class Command(BaseCommand):
+    help = "Compare les serializers de liste et leur plan values() (lecture + conversion)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help="Lignes par liste")
+        parser.add_argument('--repeat', type=int, default=5, help="Mesures par cas (médiane)")
+
+    def handle(self, *args, **options):
+        renderer = JSONRenderer()
+        self.stdout.write(f"{'serializer':<26} {'lignes':>7}   {'instances':>22}   {'values()':>22}   "
+                          f"{'µs/ligne':>15} {'gain':>6}")
+        for serializer_class, queryset in list_querysets(options['rows']):
+            plan = row_plan(serializer_class)
+
+            def drf():
+                instances, fetch = timed(lambda: list(queryset.all()))
+                data, convert = timed(lambda: serializer_class(instances, many=True).data)
+                return data, fetch, convert
+
+            def planned():
+                rows, fetch = timed(lambda: list(plan.values(queryset.all())))
+                data, convert = timed(lambda: plan.serialize(rows, queryset))
+                return data, fetch, convert
+
+            drf_data, _, _ = drf()
+            planned_data, _, _ = planned()
+            if renderer.render(drf_data) != renderer.render(planned_data):
+                raise CommandError(f"{serializer_class.__name__} : les deux sorties diffèrent")
+
+            count = len(drf_data) or 1
+            drf_runs = [drf()[1:] for _ in range(options['repeat'])]
+            planned_runs = [planned()[1:] for _ in range(options['repeat'])]
+            drf_fetch, drf_convert = (statistics.median(run[i] for run in drf_runs) for i in (0, 1))
+            fast_fetch, fast_convert = (statistics.median(run[i] for run in planned_runs) for i in (0, 1))
+            drf_total, fast_total = drf_fetch + drf_convert, fast_fetch + fast_convert
+            self.stdout.write(
+                f"{serializer_class.__name__:<26} {len(drf_data):>7}   "
+                f"{drf_fetch:>7.1f} + {drf_convert:>7.1f} ms   {fast_fetch:>7.1f} + {fast_convert:>7.1f} ms   "
+                f"{drf_total * 1000 / count:>6.1f} -> {fast_total * 1000 / count:>5.1f} "
+                f"{drf_total / fast_total:>5.1f}x"
+            )
+        self.stdout.write("(lecture + conversion, médianes)")
@@ -0,0 +1,103 @@
+"""
+Mesure la latence de la recherche d'équipes (même requêtes que /api/teams/search/)
+
+Exemples:
+    python manage.py create_test_data --users 200000 --tournaments 62500 --teams-per 16 --matches-per 0
+    python manage.py benchmark_team_search --budget-ms 100
+    python manage.py benchmark_team_search --term "hockey montreal" --term "equipe 3" --repeat 20
+    python manage.py benchmark_team_search --near 45.5019,-73.5674 --radius-km 5 --budget-ms 50
+"""
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import F
+
+from tournaments.geo import filter_near, filter_teams_near, parse_near
+from tournaments.models import Team, Tournament
+from tournaments.search import search_teams
+
+DEFAULT_TERMS = [
+    'hockey',
+    'montreal',
+    'montral',
+    'soccer laval',
+    'ligue basketball de quebec',
+    'equipe 3',
+    'ultimat',
+    'gatineau volleyball',
+]
+
+
+class Command(BaseCommand):
+    help = "Mesure la latence (p50/p95) de la recherche d'équipes"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--term', action='append', dest='terms', help="Terme à rechercher (répétable)")
+        parser.add_argument('--repeat', type=int, default=10, help="Exécutions par terme")
+        parser.add_argument('--page-size', type=int, default=20, help="Taille de la page lue")
+        parser.add_argument('--budget-ms', type=float, default=None, help="Échoue si le p95 dépasse ce budget")
+        parser.add_argument('--near', help="Centre 'lat,lng' : mesure la recherche par rayon (sans terme par défaut)")
+        parser.add_argument('--radius-km', type=float, default=25, help="Rayon de la recherche --near")
+
+    def handle(self, *args, **options):
+        page_size = options['page_size']
+        near = None
+        if options['near']:
+            try:
+                near = parse_near(options['near'], options['radius_km'])
+            except ValueError as e:
+                raise CommandError(str(e))
+        terms = options['terms'] or ([''] if near else DEFAULT_TERMS)
+        self.stdout.write(f"{Team.objects.count()} équipes indexées")
+
+        if near:
+            self.benchmark_tournaments(near, options['repeat'], page_size)
+
+        timings = []
+        for term in terms:
+            term_timings = []
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                queryset = Team.objects.select_related('tournament').filter(current_capacity__lt=F('max_capacity'))
+                if near:
+                    queryset = filter_teams_near(queryset, *near)
+                queryset = search_teams(queryset, term)
+                if near and not term:
+                    queryset = queryset.order_by('distance_km', 'id')
+                # Comme le paginateur : COUNT(*) puis la première page
+                count = queryset.count()
+                page = list(queryset[:page_size])
+                term_timings.append((time.perf_counter() - start) * 1000)
+
+            timings.extend(term_timings)
+            best = page[0].name + ' / ' + page[0].tournament.name if page else '-'
+            self.stdout.write(
+                f"  {term!r:<32} {count:>8} résultats  p50 {statistics.median(term_timings):7.1f} ms  "
+                f"max {max(term_timings):7.1f} ms  1er: {best}"
+            )
+
+        p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+        self.stdout.write(f"Global : p50 {statistics.median(timings):.1f} ms, p95 {p95:.1f} ms")
+
+        budget = options['budget_ms']
+        if budget is not None:
+            if p95 > budget:
+                raise CommandError(f"p95 {p95:.1f} ms > budget {budget:.1f} ms")
+            self.stdout.write(self.style.SUCCESS(f"p95 dans le budget ({budget:.1f} ms)"))
+
+    def benchmark_tournaments(self, near, repeat, page_size):
+        """Requête par rayon sur la table des tournois seule (boîte + haversine)"""
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            queryset = filter_near(Tournament.objects.all(), *near).order_by('distance_km', 'id')
+            count = queryset.count()
+            page = list(queryset[:page_size])
+            timings.append((time.perf_counter() - start) * 1000)
+
+        nearest = f"{page[0].name} ({page[0].distance_km:.2f} km)" if page else '-'
+        self.stdout.write(
+            f"  tournois à {near[2]:g} km{'':<17} {count:>8} résultats  p50 {statistics.median(timings):7.1f} ms  "
+            f"max {max(timings):7.1f} ms  1er: {nearest}"
+        )
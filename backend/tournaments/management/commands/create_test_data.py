@@ -1,84 +1,70 @@
 """
 Commande pour créer des données de test pour Tournois, Équipes et Demandes
+
+Exemples:
+    python manage.py create_test_data
+    python manage.py create_test_data --users 100000 --tournaments 5000 --teams-per 16 --matches-per 60
 """
-import uuid
-from django.core.management.base import BaseCommand
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
 from accounts.models import User
-from tournaments.models import Tournament, Team
-from requestes.models import JoinRequest
+from tournaments.synthetic import SyntheticDataGenerator
 
 
 class Command(BaseCommand):
     help = "Crée des données de test pour le projet TeamSportFinder"
 
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200, help="Nombre d'utilisateurs (1 sur 20 est organisateur)")
+        parser.add_argument('--tournaments', type=int, default=10, help="Nombre de tournois")
+        parser.add_argument('--teams-per', type=int, default=8, help="Équipes par tournoi")
+        parser.add_argument('--matches-per', type=int, default=12, help="Matchs par tournoi")
+        parser.add_argument('--requests-per', type=int, default=3, help="Demandes d'adhésion par équipe")
+        parser.add_argument('--seed', type=int, default=42, help="Graine du générateur aléatoire")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Taille des lots bulk_create")
+        parser.add_argument('--prefix', default='synthetic', help="Préfixe des clerk_id et emails générés")
+        parser.add_argument('--flush', action='store_true', help="Supprime d'abord les données générées avec ce préfixe")
+
     def handle(self, *args, **options):
-        # --- Créer des utilisateurs ---
-        users_data = [
-            {"email": "alice@example.com", "full_name": "Alice Dupont"},
-            {"email": "bob@example.com", "full_name": "Bob Martin"},
-            {"email": "charlie@example.com", "full_name": "Charlie Tremblay"},
-        ]
-        users = []
-        for data in users_data:
-            user, created = User.objects.get_or_create(
-                email=data["email"],
-                defaults={
-                    "full_name": data["full_name"],
-                    "role": "player",
-                    # ⚠️ Génère un clerk_id unique pour éviter les doublons
-                    "clerk_id": str(uuid.uuid4()),
-                }
-            )
-            users.append(user)
-            self.stdout.write(
-                self.style.SUCCESS(f"Utilisateur {'créé' if created else 'existant'}: {user.full_name}")
+        prefix = options['prefix']
+        existing = User.objects.filter(clerk_id__startswith=f'{prefix}_')
+
+        if options['flush']:
+            deleted, _ = existing.delete()
+            self.stdout.write(self.style.WARNING(f"{deleted} lignes supprimées (préfixe '{prefix}')"))
+        elif existing.exists():
+            raise CommandError(
+                f"Des données avec le préfixe '{prefix}' existent déjà. "
+                f"Utilisez --flush ou un autre --prefix."
             )
 
-        # --- Créer un tournoi ---
-        tournament, created = Tournament.objects.get_or_create(
-            name="Hackathon Cup",
-            defaults={
-                "sport": "Soccer",
-                "city": "Montréal",
-                "organizer": users[0],  # Alice comme organisatrice
-                "start_date": "2025-12-01",
-            }
-        )
-        self.stdout.write(
-            self.style.SUCCESS(f"Tournament {'créé' if created else 'existant'}: {tournament.name}")
-        )
+        if options['users'] < 2:
+            raise CommandError("Il faut au moins 2 utilisateurs (un organisateur et un joueur).")
 
-        # --- Créer des équipes ---
-        teams_data = [
-            {"name": "Les Dragons", "tournament": tournament, "max_capacity": 5},
-            {"name": "Les Phoenix", "tournament": tournament, "max_capacity": 5},
-        ]
-        teams = []
-        for data in teams_data:
-            team, created = Team.objects.get_or_create(
-                name=data["name"],
-                tournament=data["tournament"],
-                defaults={"max_capacity": data["max_capacity"], "current_capacity": 0}
-            )
-            teams.append(team)
-            self.stdout.write(
-                self.style.SUCCESS(f"Équipe {'créée' if created else 'existante'}: {team.name}")
-            )
+        started = time.monotonic()
+        last_label = {'label': None, 'started': started}
 
-        # --- Créer des demandes d’adhésion ---
-        join_requests_data = [
-            {"player": users[1], "team": teams[0], "status": "pending"},
-            {"player": users[2], "team": teams[1], "status": "pending"},
-        ]
-        for data in join_requests_data:
-            jr, created = JoinRequest.objects.get_or_create(
-                player=data["player"],
-                team=data["team"],
-                defaults={
-                    "status": data["status"],
-                    "message": f"Je veux rejoindre {data['team'].name}",
-                }
-            )
-            self.stdout.write(
-                self.style.SUCCESS(f"JoinRequest {'créée' if created else 'existante'}: {jr}")
-            )
\ No newline at end of file
+        def progress(label, done, total):
+            if last_label['label'] != label:
+                last_label.update(label=label, started=time.monotonic())
+            elapsed = max(time.monotonic() - last_label['started'], 1e-6)
+            self.stdout.write(f"  {label}: {done}/{total} ({int(done / elapsed)} lignes/s)")
+
+        generator = SyntheticDataGenerator(
+            users=options['users'],
+            tournaments=options['tournaments'],
+            teams_per=options['teams_per'],
+            matches_per=options['matches_per'],
+            requests_per=options['requests_per'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            prefix=prefix,
+            progress=progress,
+        )
+        summary = generator.run()
+
+        for label, count in summary.items():
+            self.stdout.write(self.style.SUCCESS(f"{label}: {count} créés"))
+        self.stdout.write(self.style.SUCCESS(f"Terminé en {time.monotonic() - started:.1f} s"))
@@ -0,0 +1,135 @@
+"""
+Profile un endpoint de l'API sur les données en base (cProfile, N appels)
+
+La requête passe par toute la pile Django (middlewares, authentification
+Clerk, vue, ORM, serializers, rendu) avec un token de développement : sans
+CLERK_JWKS_URL uniquement. Chaque appel est fait dans une transaction
+annulée : un POST ou un DELETE ne modifie pas les données.
+
+Exemples:
+    python manage.py create_test_data --users 200000 --tournaments 62500 --teams-per 16
+    python manage.py profile_endpoint /api/tournaments/ --repeat 50
+    python manage.py profile_endpoint /api/matches/my/ --user user_000042 --sort cumulative
+    python manage.py profile_endpoint /api/join-requests/<id>/accept/ --method post --user <organisateur>
+"""
+import cProfile
+import io
+import json
+import pstats
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+
+from accounts.models import User
+from TeamSportFinder.testing import make_token
+
+# Couche d'une fonction d'après son fichier ou son nom (fonctions C), premier motif trouvé
+LAYERS = [
+    ('auth', ('clerk_auth/', '/jwt/')),
+    ('middleware', ('middleware', 'corsheaders/', 'TeamSportFinder/monitoring.py')),
+    ('serializers', ('rest_framework/serializers.py', 'rest_framework/fields.py', 'rest_framework/relations.py',
+                     'rest_framework/renderers.py', 'rest_framework/utils/', '/serializers.py', '/json/')),
+    ('orm', ('django/db/',)),
+    ('driver', ('psycopg2',)),
+    ('cache', ('django/core/cache/', '_pickle')),
+    ('drf', ('rest_framework/',)),
+    ('test client', ('django/test/',)),
+    ('app', (str(settings.BASE_DIR),)),
+]
+
+
+def layer_of(filename, name):
+    where = f'{filename} {name}'
+    for layer, patterns in LAYERS:
+        if any(pattern in where for pattern in patterns):
+            return layer
+    return 'other'
+
+
+class Command(BaseCommand):
+    help = "Profile un endpoint N fois et affiche les fonctions les plus coûteuses par couche"
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', help="Chemin de l'endpoint, ex. /api/tournaments/")
+        parser.add_argument('--method', default='get', choices=['get', 'post', 'put', 'patch', 'delete'])
+        parser.add_argument('--data', help="Corps JSON de la requête")
+        parser.add_argument('--user', help="clerk_id de l'utilisateur (défaut : le premier organisateur)")
+        parser.add_argument('--repeat', type=int, default=20, help="Appels profilés")
+        parser.add_argument('--warmup', type=int, default=2, help="Appels non mesurés (caches, connexions)")
+        parser.add_argument('--top', type=int, default=25, help="Fonctions affichées")
+        parser.add_argument('--per-layer', type=int, default=5, help="Fonctions affichées par couche")
+        parser.add_argument('--sort', default='tottime', choices=['tottime', 'cumulative', 'ncalls'])
+        parser.add_argument('--output', help="Écrit aussi les statistiques cumulées (.prof)")
+
+    def handle(self, *args, **options):
+        if settings.CLERK_JWKS_URL:
+            raise CommandError("Tokens de développement refusés : CLERK_JWKS_URL est configurée.")
+        user = self.get_user(options['user'])
+        data = json.loads(options['data']) if options['data'] else None
+
+        host = next((host for host in settings.ALLOWED_HOSTS if host != '*'), 'localhost').lstrip('.')
+        client = Client(SERVER_NAME=host, HTTP_AUTHORIZATION=f'Bearer {make_token(user.clerk_id)}')
+        call = getattr(client, options['method'])
+
+        def request():
+            with transaction.atomic():
+                if data is None:
+                    response = call(options['url'])
+                else:
+                    response = call(options['url'], data=data, content_type='application/json')
+                transaction.set_rollback(True)
+            return response
+
+        for _ in range(options['warmup']):
+            request()
+
+        profiler = cProfile.Profile()
+        timings = []
+        for _ in range(options['repeat']):
+            start = time.perf_counter()
+            response = profiler.runcall(request)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        self.stdout.write(
+            f"{options['method'].upper()} {options['url']} ({user.clerk_id}) -> {response.status_code}, "
+            f"{options['repeat']} appels : p50 {statistics.median(timings):.1f} ms, max {max(timings):.1f} ms "
+            f"(sous cProfile)"
+        )
+        if response.status_code >= 400:
+            self.stdout.write(self.style.WARNING(response.content[:300].decode(errors='replace')))
+
+        report = io.StringIO()
+        stats = pstats.Stats(profiler, stream=report)
+        if options['output']:
+            stats.dump_stats(options['output'])
+            self.stdout.write(f"Statistiques écrites dans {options['output']}")
+
+        self.print_layers(stats, options['per_layer'])
+        self.stdout.write(f"\nTop {options['top']} ({options['sort']}) :")
+        stats.strip_dirs().sort_stats(options['sort']).print_stats(options['top'])
+        self.stdout.write(report.getvalue())
+
+    def get_user(self, clerk_id):
+        users = User.objects.filter(clerk_id=clerk_id) if clerk_id else User.objects.filter(role='organizer')
+        user = users.order_by('created_at').first()
+        if user is None:
+            raise CommandError("Utilisateur introuvable (voir create_test_data).")
+        return user
+
+    def print_layers(self, stats, per_layer):
+        """Temps propre (tottime) par couche et fonctions les plus coûteuses de chacune"""
+        by_layer = {}
+        for (filename, line, name), (_, ncalls, tottime, _, _) in stats.stats.items():
+            by_layer.setdefault(layer_of(filename, name), []).append((tottime, ncalls, f'{name} ({filename}:{line})'))
+        total = sum(tottime for functions in by_layer.values() for tottime, _, _ in functions) or 1
+
+        self.stdout.write("\nTemps propre par couche :")
+        for layer, functions in sorted(by_layer.items(), key=lambda item: -sum(f[0] for f in item[1])):
+            layer_time = sum(tottime for tottime, _, _ in functions)
+            self.stdout.write(f"  {layer:<12} {layer_time * 1000:9.1f} ms  {layer_time / total:6.1%}")
+            for tottime, ncalls, label in sorted(functions, reverse=True)[:per_layer]:
+                self.stdout.write(f"      {tottime * 1000:9.1f} ms  {ncalls:>8}  {label}")
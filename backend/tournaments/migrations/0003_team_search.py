@@ -0,0 +1,42 @@
+# Generated by Django 5.0.1 on 2026-10-17 18:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+def index_existing_teams(apps, schema_editor):
+    from tournaments.search import refresh_team_search
+    refresh_team_search()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_alter_user_options'),
+        ('tournaments', '0002_alter_team_options_alter_tournament_options_and_more'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='team',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='team',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='team_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='team',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_document'], name='team_search_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.RunPython(index_existing_teams, migrations.RunPython.noop),
+    ]
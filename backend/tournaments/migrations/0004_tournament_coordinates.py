@@ -0,0 +1,38 @@
+# Generated by Django 5.0.1 on 2026-10-17 18:48
+
+from django.db import migrations, models
+
+
+def geocode_existing_tournaments(apps, schema_editor):
+    from tournaments.geo import lookup_city
+    Tournament = apps.get_model('tournaments', 'Tournament')
+    for city in Tournament.objects.values_list('city', flat=True).distinct():
+        coordinates = lookup_city(city)
+        if coordinates is not None:
+            Tournament.objects.filter(city=city).update(latitude=coordinates[0], longitude=coordinates[1])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_alter_user_options'),
+        ('tournaments', '0003_team_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tournament',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='tournament',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='tournament',
+            index=models.Index(fields=['latitude', 'longitude'], name='tournament_lat_lng_idx'),
+        ),
+        migrations.RunPython(geocode_existing_tournaments, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-17 21:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_alter_user_options'),
+        ('tournaments', '0005_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tournament',
+            index=models.Index(fields=['-created_at', 'id'], name='tournament_created_idx'),
+        ),
+    ]
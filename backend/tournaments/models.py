@@ -1,4 +1,6 @@
 import uuid
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 from accounts.models import User
@@ -13,11 +15,22 @@ class Tournament(models.Model):
     # organizer = models.ForeignKey(User , on_delete=models.CASCADE , related_name='tournaments ')
     organizer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='tournaments')
     created_at = models.DateTimeField(auto_now_add=True)
+    # Version du tournoi et de ses équipes (ETag / Last-Modified, voir tournaments.versions)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Coordonnées de la ville (gazetteer hors ligne, voir tournaments.geo)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
 
     class Meta:
         db_table = 'tournaments'
         verbose_name = "tournament"
         verbose_name_plural = "tournaments"
+        indexes = [
+            # Préfiltre "boîte englobante" de la recherche par rayon
+            models.Index(fields=['latitude', 'longitude'], name='tournament_lat_lng_idx'),
+            # Ordre de la liste paginée (les plus récents d'abord)
+            models.Index(fields=['-created_at', 'id'], name='tournament_created_idx'),
+        ]
 
 class Team(models.Model):
 # """Equipe dans un tournoi"""
@@ -29,6 +42,11 @@ class Team(models.Model):
     current_capacity = models.IntegerField(default = 0)
     members = models.ManyToManyField(User, related_name='teams',blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Version de l'équipe (y compris ses membres, voir requestes.services)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Index de recherche (nom de l'équipe + tournoi), maintenu par tournaments.search
+    search_vector = SearchVectorField(null=True, editable=False)
+    search_document = models.TextField(blank=True, default='', editable=False)
 
     @property
     def available_spots(self):
@@ -41,4 +59,8 @@ class Team(models.Model):
     class Meta:
         db_table = 'teams'
         verbose_name = "team"
-        verbose_name_plural = "teams"
\ No newline at end of file
+        verbose_name_plural = "teams"
+        indexes = [
+            GinIndex(fields=['search_vector'], name='team_search_vector_idx'),
+            GinIndex(fields=['search_document'], name='team_search_trgm_idx', opclasses=['gin_trgm_ops']),
+        ]
\ No newline at end of file
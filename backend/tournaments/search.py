@@ -0,0 +1,136 @@
+"""
+Recherche d'équipes : full-text PostgreSQL + trigrammes (fautes de frappe)
+
+Chaque équipe porte deux colonnes dénormalisées, calculées à partir de son
+nom et de son tournoi (nom, sport, ville) :
+    - search_vector (tsvector, index GIN) : correspondance par mots, classée
+      par ts_rank (nom de l'équipe > nom du tournoi > sport/ville)
+    - search_document (texte en minuscules, index GIN gin_trgm_ops) :
+      similarité par trigrammes, qui tolère les fautes de frappe et les mots
+      partiels ("montral")
+
+La recherche (search_teams) essaie d'abord le full-text, puis les
+trigrammes si aucun mot ne correspond.
+
+Les deux colonnes sont recalculées par refresh_team_search() : à la
+sauvegarde d'une équipe ou d'un tournoi (tournaments/signals.py) et après
+les chargements en masse (bulk_create ne déclenche pas les signaux).
+"""
+import re
+import unicodedata
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db import connection
+from django.db.models import F
+
+from tournaments.models import Team, Tournament
+
+SEARCH_CONFIG = 'simple'
+
+# Accents retirés des deux côtés ("Montréal" == "montreal"), sans l'extension unaccent.
+# Les majuscules accentuées sont listées : lower() ne les convertit pas avec une collation C.
+ACCENTED = 'àáâäãåçèéêëìíîïñòóôöõùúûüýÿÀÁÂÄÃÅÇÈÉÊËÌÍÎÏÑÒÓÔÖÕÙÚÛÜÝ'
+UNACCENTED = 'aaaaaaceeeeiiiinooooouuuuyyaaaaaaceeeeiiiinooooouuuuy'
+
+
+def refresh_team_search(team_ids=None, tournament_id=None, only_missing=False):
+    """
+    Recalcule search_vector et search_document en une requête UPDATE
+
+    Args:
+        team_ids: Limiter aux équipes données
+        tournament_id: Limiter aux équipes d'un tournoi
+        only_missing: Limiter aux équipes jamais indexées (après bulk_create)
+
+    Returns:
+        int: Le nombre d'équipes mises à jour
+    """
+    fold = f"translate(lower(%s), '{ACCENTED}', '{UNACCENTED}')"
+    conditions = ['tournament.id = team.tournament_id']
+    params = [SEARCH_CONFIG, SEARCH_CONFIG, SEARCH_CONFIG]
+    if team_ids is not None:
+        conditions.append('team.id = ANY(%s)')
+        params.append(list(team_ids))
+    if tournament_id is not None:
+        conditions.append('team.tournament_id = %s')
+        params.append(tournament_id)
+    if only_missing:
+        conditions.append('team.search_vector IS NULL')
+
+    sql = f"""
+        UPDATE {Team._meta.db_table} AS team
+        SET search_document = {fold % "concat_ws(' ', team.name, tournament.name, tournament.sport, tournament.city)"},
+            search_vector =
+                setweight(to_tsvector(%s::regconfig, {fold % 'team.name'}), 'A')
+                || setweight(to_tsvector(%s::regconfig, {fold % 'tournament.name'}), 'B')
+                || setweight(to_tsvector(%s::regconfig, {fold % "concat_ws(' ', tournament.sport, tournament.city)"}), 'C')
+        FROM {Tournament._meta.db_table} AS tournament
+        WHERE {' AND '.join(conditions)}
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def normalize_term(term):
+    """Minuscules, sans accents ni espaces superflus (comme search_document)"""
+    decomposed = unicodedata.normalize('NFKD', term.lower())
+    term = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(term.split())
+
+
+def prefix_query(term):
+    """
+    tsquery où le dernier mot est un préfixe (saisie en cours) :
+    "hockey mont" -> 'hockey' & 'mont':*
+
+    Les mots complets restent exacts : PostgreSQL connaît leur fréquence
+    (statistiques du tsvector) et choisit le bon plan pour les mots courants.
+
+    Returns:
+        SearchQuery ou None: None si le terme ne contient aucun mot
+    """
+    words = re.findall(r'\w+', term)
+    if not words:
+        return None
+    lexemes = [f"'{word}'" for word in words]
+    lexemes[-1] += ':*'
+    return SearchQuery(' & '.join(lexemes), config=SEARCH_CONFIG, search_type='raw')
+
+
+def search_teams(queryset, term):
+    """
+    Filtre et classe un queryset d'équipes selon le terme recherché
+
+    - Full-text d'abord : tous les mots doivent être présents (le dernier en
+      préfixe), classement par ts_rank (index GIN sur search_vector)
+    - Si rien ne correspond (faute de frappe), similarité par trigrammes sur
+      search_document (index GIN gin_trgm_ops)
+
+    Le score est calculé et trié par PostgreSQL ; la pagination découpe le
+    queryset classé (toutes les correspondances sont comptées).
+
+    Args:
+        queryset: Queryset de Team, déjà filtré (tournoi, disponibilité...)
+        term: Le texte saisi par l'utilisateur
+
+    Returns:
+        QuerySet: Le queryset annoté (score) et trié par pertinence
+    """
+    term = normalize_term(term)
+    query = prefix_query(term)
+    if query is None:
+        return queryset
+
+    matches = queryset.filter(search_vector=query)
+    score = SearchRank(F('search_vector'), query)
+    if not matches.exists():
+        # %> (trigram_word_similar) : seuil pg_trgm.word_similarity_threshold (0.6 par défaut)
+        matches = queryset.filter(search_document__trigram_word_similar=term)
+        score = TrigramWordSimilarity(term, 'search_document')
+
+    return (
+        matches
+        .annotate(score=score)
+        .order_by('-score', 'id')
+    )
@@ -1,7 +1,9 @@
 from .models import Team, Tournament
+from django.db.models import Sum
 from rest_framework import serializers
 from accounts.models import User
 from accounts.serializers import UserSerializer
+from TeamSportFinder.rows import Column
 
 # --- TEAM SERIALIZERS ---
 
@@ -85,6 +87,7 @@ class TeamListSerializer(serializers.ModelSerializer):
     tournament_id = serializers.SerializerMethodField()
     available_spots = serializers.IntegerField(read_only=True)
     is_full = serializers.BooleanField(read_only=True)
+    distance_km = serializers.SerializerMethodField()
 
     class Meta:
         model = Team
@@ -97,9 +100,19 @@ class TeamListSerializer(serializers.ModelSerializer):
             'current_capacity',
             'available_spots',
             'is_full',
+            'distance_km',
             'created_at',
         ]
         read_only_fields = ['id', 'tournament_name', 'tournament_id', 'created_at', 'available_spots', 'is_full']
+
+    # Même sortie depuis values() (TeamSportFinder/rows.py)
+    values_fields = {
+        'tournament_name': 'tournament__name',
+        'tournament_id': Column('tournament_id', str),
+        'available_spots': lambda row: row['max_capacity'] - row['current_capacity'],
+        'is_full': lambda row: row['current_capacity'] >= row['max_capacity'],
+        'distance_km': Column('distance_km', lambda distance_km: round(distance_km, 2), optional=True),
+    }
     
     def get_tournament_name(self, obj):
         """Retourne le nom du tournoi"""
@@ -109,6 +122,11 @@ class TeamListSerializer(serializers.ModelSerializer):
         """Retourne l'ID du tournoi"""
         return str(obj.tournament.id) if obj.tournament else None
 
+    def get_distance_km(self, obj):
+        """Distance au point ?near= (annotée par la vue), sinon None"""
+        distance_km = getattr(obj, 'distance_km', None)
+        return round(distance_km, 2) if distance_km is not None else None
+
 
 class TeamSerializer(serializers.ModelSerializer):
     """
@@ -193,20 +211,25 @@ class TournamentSerializer(serializers.ModelSerializer):
             'organizer_id',
             'team_count',
             'total_players',
+            'latitude',
+            'longitude',
             'created_at',
         ]
-        read_only_fields = ['id', 'organizer', 'organizer_id', 'created_at']
+        read_only_fields = ['id', 'organizer', 'organizer_id', 'latitude', 'longitude', 'created_at']
     
     def get_team_count(self, obj):
-        """Retourne le nombre d'équipes dans le tournoi"""
+        """Retourne le nombre d'équipes dans le tournoi (annoté par la vue si possible)"""
+        team_count = getattr(obj, 'team_count', None)
+        if team_count is not None:
+            return team_count
         return obj.teams.count()
     
     def get_total_players(self, obj):
         """Retourne le nombre total de joueurs dans toutes les équipes du tournoi"""
-        total = 0
-        for team in obj.teams.all():
-            total += team.current_capacity
-        return total
+        total_players = getattr(obj, 'total_players', None)
+        if total_players is not None:
+            return total_players
+        return obj.teams.aggregate(total=Sum('current_capacity'))['total'] or 0
 
 
 class TournamentListSerializer(serializers.ModelSerializer):
@@ -226,14 +249,25 @@ class TournamentListSerializer(serializers.ModelSerializer):
             'start_date',
             'organizer_name',
             'team_count',
+            'latitude',
+            'longitude',
             'created_at',
         ]
-        read_only_fields = ['id', 'organizer_name', 'created_at']
+        read_only_fields = ['id', 'organizer_name', 'latitude', 'longitude', 'created_at']
+
+    # Même sortie depuis values() (TeamSportFinder/rows.py) : team_count doit être annoté
+    values_fields = {
+        'organizer_name': 'organizer__full_name',
+        'team_count': 'team_count',
+    }
     
     def get_organizer_name(self, obj):
         """Retourne le nom de l'organisateur"""
         return obj.organizer.full_name if obj.organizer else None
     
     def get_team_count(self, obj):
-        """Retourne le nombre d'équipes dans le tournoi"""
+        """Retourne le nombre d'équipes dans le tournoi (annoté par la vue si possible)"""
+        team_count = getattr(obj, 'team_count', None)
+        if team_count is not None:
+            return team_count
         return obj.teams.count()
\ No newline at end of file
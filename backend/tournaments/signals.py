@@ -0,0 +1,76 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from accounts.models import User
+from .cache import bump_tournaments
+from .geo import lookup_city
+from .models import Team, Tournament
+from .search import refresh_team_search
+from .versions import touch_tournaments
+
+SEARCHED_TOURNAMENT_FIELDS = {'name', 'sport', 'city'}
+
+
+@receiver(post_save, sender=Team)
+def index_team(sender, instance, created, update_fields=None, **kwargs):
+    """Recalcule l'index de recherche quand le nom de l'équipe peut avoir changé"""
+    if created or update_fields is None or 'name' in update_fields:
+        refresh_team_search(team_ids=[instance.id])
+
+
+@receiver(post_save, sender=Team)
+def touch_team_tournament(sender, instance, **kwargs):
+    """La liste des tournois affiche le nombre d'équipes et de joueurs"""
+    touch_tournaments(tournament_ids=[instance.tournament_id])
+
+
+@receiver(post_delete, sender=Team)
+def bump_team_tournament(sender, instance, **kwargs):
+    """Équipe supprimée : le tournoi n'est plus servi depuis le cache (sans requête)"""
+    bump_tournaments([instance.tournament_id])
+
+
+@receiver(m2m_changed, sender=Team.members.through)
+def touch_member_tournaments(sender, instance, action, reverse, pk_set, **kwargs):
+    """Membres ajoutés ou retirés (team.members ou user.teams)"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        touch_tournaments(team_ids=[instance.id])
+    elif pk_set:
+        touch_tournaments(team_ids=pk_set)
+    elif action == 'post_clear':
+        # user.teams.clear() : les équipes ne sont plus connues
+        bump_tournaments()
+
+
+@receiver(post_save, sender=Tournament)
+@receiver(post_delete, sender=Tournament)
+def bump_tournament(sender, instance, **kwargs):
+    """Le tournoi a changé (save() a déjà avancé updated_at)"""
+    bump_tournaments([instance.id])
+
+
+@receiver(post_save, sender=User)
+def touch_organizer_tournaments(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Le nom de l'organisateur est affiché dans la liste et le détail de ses
+    tournois : leur version avance (ETag sans cache partagé) avec leurs générations
+    """
+    if not created and (update_fields is None or 'full_name' in update_fields):
+        touch_tournaments(organizer_id=instance.id)
+
+
+@receiver(post_save, sender=Tournament)
+def index_tournament_teams(sender, instance, created, update_fields=None, **kwargs):
+    """Le nom, le sport et la ville du tournoi font partie de l'index des équipes"""
+    if created:
+        return  # pas encore d'équipes
+    if update_fields is None or SEARCHED_TOURNAMENT_FIELDS & set(update_fields):
+        refresh_team_search(tournament_id=instance.id)
+
+
+@receiver(pre_save, sender=Tournament)
+def geocode_tournament(sender, instance, **kwargs):
+    """Place le tournoi sur sa ville (gazetteer) ; une ville inconnue n'a pas de coordonnées"""
+    instance.latitude, instance.longitude = lookup_city(instance.city) or (None, None)
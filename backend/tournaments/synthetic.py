@@ -0,0 +1,295 @@
+"""
+Générateur de données synthétiques à grande échelle (tests de charge)
+
+Toutes les lignes sont créées avec bulk_create par lots, y compris la table
+de liaison Team.members ; les UUID sont tirés du générateur aléatoire pour
+que deux exécutions avec la même graine produisent les mêmes données.
+"""
+import random
+import uuid
+from datetime import date, timedelta
+
+from django.db import connection
+from django.utils import timezone
+
+from accounts.models import User
+from matches.models import DEFAULT_MATCH_DURATION, Match, Standing
+from matches.scheduling import round_robin_rounds
+from matches.standings import rebuild_standings
+from players.models import PlayerProfile
+from requestes.models import JoinRequest
+from tournaments.geo import lookup_city
+from tournaments.models import Tournament, Team
+from tournaments.search import refresh_team_search
+
+SPORTS = ['Soccer', 'Basketball', 'Hockey', 'Volleyball', 'Baseball', 'Ultimate']
+CITIES = ['Montréal', 'Québec', 'Laval', 'Gatineau', 'Longueuil', 'Sherbrooke', 'Trois-Rivières', 'Lévis']
+LEVELS = ['beginner', 'intermediate', 'advanced']
+POSITIONS = ['', 'Gardien', 'Défenseur', 'Milieu', 'Attaquant']
+FIRST_NAMES = ['Alice', 'Bob', 'Charlie', 'Diane', 'Étienne', 'Fatima', 'Gabriel', 'Hélène', 'Idris', 'Julie']
+LAST_NAMES = ['Dupont', 'Martin', 'Tremblay', 'Gagnon', 'Roy', 'Côté', 'Bouchard', 'Gauthier', 'Morin', 'Lavoie']
+
+
+class SyntheticDataGenerator:
+    """
+    Génère utilisateurs, profils, tournois, équipes, membres, matchs et demandes
+
+    Utilisation:
+        generator = SyntheticDataGenerator(users=100000, tournaments=5000, teams_per=16, matches_per=60)
+        summary = generator.run()
+
+    Args:
+        users: Nombre d'utilisateurs (1 sur 20 est organisateur)
+        tournaments: Nombre de tournois
+        teams_per: Équipes par tournoi
+        matches_per: Matchs par tournoi (paires d'équipes distinctes)
+        requests_per: Demandes d'adhésion par équipe
+        seed: Graine du générateur aléatoire
+        batch_size: Taille des lots bulk_create
+        prefix: Préfixe des clerk_id/emails générés
+        progress: Fonction appelée après chaque lot : progress(label, done, total)
+    """
+
+    def __init__(self, users=1000, tournaments=50, teams_per=8, matches_per=12, requests_per=3,
+                 seed=42, batch_size=5000, prefix='synthetic', progress=None):
+        self.users = users
+        self.tournaments = tournaments
+        self.teams_per = teams_per
+        self.matches_per = matches_per
+        self.requests_per = requests_per
+        self.batch_size = batch_size
+        self.prefix = prefix
+        self.progress = progress or (lambda label, done, total: None)
+        # Le préfixe fait partie de la graine : deux préfixes n'ont jamais les mêmes UUID
+        self.rng = random.Random(f'{prefix}:{seed}')
+        # Scores tirés à part : ajouter les scores n'a pas changé les autres données
+        self.score_rng = random.Random(f'{prefix}:{seed}:scores')
+
+        self.organizer_ids = []
+        self.player_ids = []
+        self.tournament_ids = []
+        self.team_ids = []
+        self.summary = {}
+
+    def run(self):
+        """
+        Crée toutes les données et retourne le nombre de lignes par table
+
+        Returns:
+            dict: {'users': int, 'profiles': int, 'tournaments': int, ...}
+        """
+        self.create_users()
+        self.create_profiles()
+        self.create_tournaments()
+        members = self.create_teams()
+        self.index_teams()
+        self.create_memberships(members)
+        self.create_matches()
+        self.build_standings()
+        self.create_join_requests(members)
+        self.analyze()
+        return self.summary
+
+    def analyze(self):
+        """
+        Met à jour les statistiques du planificateur PostgreSQL après le chargement
+        (sinon il planifie comme si les tables étaient vides)
+        """
+        if connection.vendor != 'postgresql':
+            return
+        models = [User, PlayerProfile, Tournament, Team, Team.members.through, Match, Standing, JoinRequest]
+        with connection.cursor() as cursor:
+            for model in models:
+                cursor.execute(f'ANALYZE "{model._meta.db_table}"')
+
+    # --- Utilitaires ---
+
+    def new_id(self):
+        """UUID reproductible (dépend de la graine)"""
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def save_in_batches(self, label, model, rows, total):
+        """
+        Insère les objets produits par l'itérable rows par lots de batch_size
+
+        Returns:
+            int: Le nombre d'objets insérés
+        """
+        done = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                model.objects.bulk_create(batch, batch_size=self.batch_size)
+                done += len(batch)
+                batch = []
+                self.progress(label, done, total)
+        if batch:
+            model.objects.bulk_create(batch, batch_size=self.batch_size)
+            done += len(batch)
+            self.progress(label, done, total)
+        self.summary[label] = done
+        return done
+
+    # --- Tables ---
+
+    def create_users(self):
+        organizer_count = max(1, self.users // 20)
+
+        def rows():
+            for i in range(self.users):
+                user_id = self.new_id()
+                role = 'organizer' if i < organizer_count else 'player'
+                (self.organizer_ids if role == 'organizer' else self.player_ids).append(user_id)
+                yield User(
+                    id=user_id,
+                    clerk_id=f'{self.prefix}_{i}',
+                    email=f'{self.prefix}_{i}@example.com',
+                    full_name=f'{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}',
+                    role=role,
+                )
+
+        self.save_in_batches('users', User, rows(), self.users)
+
+    def create_profiles(self):
+        def rows():
+            for player_id in self.player_ids:
+                yield PlayerProfile(
+                    user_id=player_id,
+                    city=self.rng.choice(CITIES),
+                    favorite_sport=self.rng.choice(SPORTS),
+                    level=self.rng.choice(LEVELS),
+                    position=self.rng.choice(POSITIONS),
+                )
+
+        self.save_in_batches('profiles', PlayerProfile, rows(), len(self.player_ids))
+
+    def create_tournaments(self):
+        today = date.today()
+
+        def rows():
+            for i in range(self.tournaments):
+                tournament_id = self.new_id()
+                self.tournament_ids.append(tournament_id)
+                sport = self.rng.choice(SPORTS)
+                city = self.rng.choice(CITIES)
+                # Terrain quelque part dans la ville (±8 km environ)
+                latitude, longitude = lookup_city(city)
+                yield Tournament(
+                    id=tournament_id,
+                    name=f'Ligue {sport} de {city} #{i}',
+                    sport=sport,
+                    city=city,
+                    start_date=today + timedelta(days=self.rng.randint(-90, 180)),
+                    organizer_id=self.organizer_ids[i % len(self.organizer_ids)],
+                    latitude=latitude + self.rng.uniform(-0.07, 0.07),
+                    longitude=longitude + self.rng.uniform(-0.1, 0.1),
+                )
+
+        self.save_in_batches('tournaments', Tournament, rows(), self.tournaments)
+
+    def create_teams(self):
+        """
+        Crée les équipes et tire leurs membres (current_capacity = nombre de membres)
+
+        Returns:
+            dict: team_id -> liste des user_id membres
+        """
+        members = {}
+
+        def rows():
+            for tournament_id in self.tournament_ids:
+                for j in range(self.teams_per):
+                    team_id = self.new_id()
+                    self.team_ids.append(team_id)
+                    max_capacity = self.rng.choice([8, 10, 12, 15])
+                    size = min(self.rng.randint(0, max_capacity), len(self.player_ids))
+                    members[team_id] = self.rng.sample(self.player_ids, size)
+                    yield Team(
+                        id=team_id,
+                        name=f'Équipe {j + 1}',
+                        tournament_id=tournament_id,
+                        max_capacity=max_capacity,
+                        current_capacity=size,
+                    )
+
+        self.save_in_batches('teams', Team, rows(), self.tournaments * self.teams_per)
+        return members
+
+    def index_teams(self):
+        """Calcule l'index de recherche des équipes (bulk_create ne déclenche pas les signaux)"""
+        total = len(self.team_ids)
+        self.summary['search_index'] = refresh_team_search(only_missing=True)
+        self.progress('search_index', total, total)
+
+    def create_memberships(self, members):
+        Membership = Team.members.through
+
+        def rows():
+            for team_id, user_ids in members.items():
+                for user_id in user_ids:
+                    yield Membership(team_id=team_id, user_id=user_id)
+
+        total = sum(len(user_ids) for user_ids in members.values())
+        self.save_in_batches('memberships', Membership, rows(), total)
+
+    def create_matches(self):
+        now = timezone.now()
+        # Paires dans l'ordre des journées d'un championnat : une équipe ne joue
+        # qu'une fois par journée (aucun conflit d'équipe)
+        pairs = [pair for day in round_robin_rounds(range(self.teams_per)) for pair in day]
+        per_round = max(1, self.teams_per // 2)
+
+        def rows():
+            for index, tournament_id in enumerate(self.tournament_ids):
+                teams = self.team_ids[index * self.teams_per:(index + 1) * self.teams_per]
+                start = now + timedelta(days=self.rng.randint(-60, 120))
+                for m in range(min(self.matches_per, len(pairs))):
+                    a, b = pairs[m]
+                    # Une journée par semaine, plusieurs créneaux horaires par journée
+                    day = start + timedelta(weeks=m // per_round)
+                    kickoff = day.replace(hour=9 + m % per_round % 12, minute=0, second=0, microsecond=0)
+                    # Les matchs déjà joués ont leur score
+                    played = day < now
+                    yield Match(
+                        id=self.new_id(),
+                        team_a_id=teams[a],
+                        team_b_id=teams[b],
+                        tournament_id=tournament_id,
+                        date=kickoff,
+                        ends_at=kickoff + DEFAULT_MATCH_DURATION,
+                        location=f'Terrain {m % per_round + 1}',
+                        score_a=self.score_rng.randint(0, 5) if played else None,
+                        score_b=self.score_rng.randint(0, 5) if played else None,
+                    )
+
+        total = self.tournaments * min(self.matches_per, len(pairs))
+        self.save_in_batches('matches', Match, rows(), total)
+
+    def build_standings(self):
+        """Calcule les classements (bulk_create ne déclenche pas les signaux)"""
+        total = len(self.team_ids)
+        self.summary['standings'] = rebuild_standings()
+        self.progress('standings', total, total)
+
+    def create_join_requests(self, members):
+        def rows():
+            for team_id, user_ids in members.items():
+                current = set(user_ids)
+                requesters = set()
+                for player_id in self.rng.sample(self.player_ids, min(self.requests_per * 2, len(self.player_ids))):
+                    if len(requesters) >= self.requests_per:
+                        break
+                    if player_id in current:
+                        continue
+                    requesters.add(player_id)
+                    yield JoinRequest(
+                        id=self.new_id(),
+                        player_id=player_id,
+                        team_id=team_id,
+                        status='rejected' if self.rng.random() < 0.2 else 'pending',
+                        message='Bonjour, je souhaite rejoindre votre équipe !',
+                    )
+
+        total = len(members) * self.requests_per
+        self.save_in_batches('join_requests', JoinRequest, rows(), total)
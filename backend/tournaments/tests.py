@@ -1,3 +1,847 @@
-from django.test import TestCase
+import io
+import json
+import os
+import pstats
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest import skipIf
 
-# Create your tests here.
+import jwt
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone as django_timezone
+
+from TeamSportFinder.metrics import REQUESTS, registry
+from TeamSportFinder.monitoring import normalize_sql
+from TeamSportFinder.renderers import FastJSONParser, FastJSONRenderer, orjson
+from TeamSportFinder.rows import RowPlan, row_plan
+from TeamSportFinder.testing import QueryBudgetTestCase
+from accounts.models import User
+from tournaments.cache import response_cache
+from tournaments.geo import filter_teams_near, haversine_km, lookup_city, normalize_city
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from tournaments.models import Tournament, Team
+from tournaments.serializers import TeamListSerializer, TournamentListSerializer
+from tournaments.versions import touch_tournaments
+from tournaments.views import annotate_tournament_counts
+from matches.models import Match
+from matches.serializers import MatchListSerializer
+from tournaments.synthetic import SyntheticDataGenerator
+from requestes.services import add_player_to_team
+
+
+@override_settings(CLERK_JWKS_URL=None)
+class TournamentCountsTests(TestCase):
+    """team_count et total_players viennent d'annotations SQL"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organizer = User.objects.create(
+            clerk_id='org_1', email='org@example.com', full_name='Org', role='organizer'
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def create_tournaments(self, count):
+        for i in range(count):
+            tournament = Tournament.objects.create(
+                name=f'Tournoi {i}', sport='Soccer', city='Montréal',
+                start_date='2025-12-01', organizer=self.organizer,
+            )
+            Team.objects.create(name='A', tournament=tournament, current_capacity=3)
+            Team.objects.create(name='B', tournament=tournament, current_capacity=4)
+
+    def get(self, url):
+        token = jwt.encode({'sub': 'org_1', 'exp': int(time.time()) + 300}, 'dev', algorithm='HS256')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(response.status_code, 200)
+        return response.json(), len(queries.captured_queries)
+
+    def test_list_query_count_is_constant(self):
+        self.create_tournaments(1)
+        self.get('/api/tournaments/?page=1')  # utilisateur en cache, liste absente du cache
+        _, small = self.get('/api/tournaments/')
+        self.create_tournaments(10)
+        data, large = self.get('/api/tournaments/')
+
+        self.assertEqual(small, large)
+        self.assertEqual(data['results'][0]['team_count'], 2)
+
+    def test_detail_counts(self):
+        self.create_tournaments(1)
+        tournament = Tournament.objects.get()
+        data, _ = self.get(f'/api/tournaments/{tournament.id}/')
+
+        self.assertEqual(data['team_count'], 2)
+        self.assertEqual(data['total_players'], 7)
+
+
+@override_settings(CLERK_JWKS_URL=None)
+class ConditionalGetTests(TestCase):
+    """ETag / Last-Modified : 304 tant que la version ne change pas"""
+
+    @classmethod
+    def setUpTestData(cls):
+        organizer = User.objects.create(
+            clerk_id='org_1', email='org@example.com', full_name='Org', role='organizer'
+        )
+        cls.player = User.objects.create(
+            clerk_id='player_1', email='player@example.com', full_name='Player', role='player'
+        )
+        cls.tournament = Tournament.objects.create(name='Ligue', sport='Soccer', city='Laval',
+                                                   start_date='2025-12-01', organizer=organizer)
+        cls.team = Team.objects.create(name='A', tournament=cls.tournament)
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, url, **headers):
+        token = jwt.encode({'sub': 'player_1', 'exp': int(time.time()) + 300}, 'dev', algorithm='HS256')
+        return self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {token}', **headers)
+
+    def test_tournament_list_revalidation(self):
+        response = self.get('/api/tournaments/')
+        etag = response['ETag']
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        response = self.get('/api/tournaments/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        # Autre page, autre ETag
+        self.assertNotEqual(self.get('/api/tournaments/?page=1')['ETag'], etag)
+
+        # Une nouvelle équipe change team_count dans la liste
+        Team.objects.create(name='B', tournament=self.tournament)
+        self.assertEqual(self.get('/api/tournaments/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    @override_settings(TOURNAMENT_CACHE_ENABLED=False)
+    def test_organizer_rename_changes_list_version(self):
+        etag = self.get('/api/tournaments/')['ETag']
+        organizer = self.tournament.organizer
+        organizer.full_name = 'Organisatrice'
+        organizer.save()
+
+        response = self.get('/api/tournaments/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'][0]['organizer_name'], 'Organisatrice')
+
+    def test_team_detail_revalidation(self):
+        url = f'/api/teams/{self.team.id}/'
+        response = self.get(url)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        self.assertEqual(self.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+        # Un nouveau membre (UPDATE ensembliste) change la version de l'équipe
+        add_player_to_team(self.team.id, self.player.id)
+        response = self.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['members_count'], 1)
+
+    def test_unknown_team_is_not_cached(self):
+        response = self.get('/api/teams/00000000-0000-4000-8000-000000000000/', HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('ETag', response)
+
+
+@override_settings(CLERK_JWKS_URL=None, TOURNAMENT_CACHE_ENABLED=True)
+class ResponseCacheTests(TestCase):
+    """Liste et détail des tournois en cache, invalidés par générations"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organizer = User.objects.create(
+            clerk_id='org_1', email='org@example.com', full_name='Org', role='organizer'
+        )
+        cls.player = User.objects.create(
+            clerk_id='player_1', email='player@example.com', full_name='Player', role='player'
+        )
+        cls.tournament = Tournament.objects.create(name='Ligue', sport='Soccer', city='Laval',
+                                                   start_date='2025-12-01', organizer=cls.organizer)
+        cls.team = Team.objects.create(name='A', tournament=cls.tournament)
+
+    def setUp(self):
+        cache.clear()
+        response_cache.clear_stats()
+
+    def get(self, url, clerk_id='player_1'):
+        token = jwt.encode({'sub': clerk_id, 'exp': int(time.time()) + 300}, 'dev', algorithm='HS256')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(response.status_code, 200)
+        return response, [query['sql'] for query in queries.captured_queries]
+
+    def test_hit_skips_database(self):
+        url = f'/api/tournaments/{self.tournament.id}/'
+        first, _ = self.get(url)
+        second, queries = self.get(url)
+
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.json(), first.json())
+        self.assertFalse([sql for sql in queries if 'tournaments' in sql])
+
+    def test_shared_between_users(self):
+        self.get('/api/tournaments/')
+        response, _ = self.get('/api/tournaments/', clerk_id='org_1')
+        self.assertEqual(response['X-Cache'], 'HIT')
+        # Autres paramètres, autre entrée
+        response, _ = self.get('/api/tournaments/?page=1')
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+    def test_team_changes_invalidate(self):
+        url = f'/api/tournaments/{self.tournament.id}/'
+        self.get('/api/tournaments/')
+        self.get(url)
+
+        team = Team.objects.create(name='B', tournament=self.tournament)
+        response, _ = self.get('/api/tournaments/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['results'][0]['team_count'], 2)
+
+        team.delete()
+        response, _ = self.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['team_count'], 1)
+
+    def test_member_accept_invalidates_detail(self):
+        url = f'/api/tournaments/{self.tournament.id}/'
+        self.get(url)
+        add_player_to_team(self.team.id, self.player.id)
+
+        response, _ = self.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['total_players'], 1)
+
+    def test_members_m2m_invalidates(self):
+        other = Tournament.objects.create(name='Coupe', sport='Soccer', city='Laval',
+                                          start_date='2025-12-01', organizer=self.organizer)
+        url = f'/api/tournaments/{self.tournament.id}/'
+        self.get(url)
+        self.get(f'/api/tournaments/{other.id}/')
+
+        self.team.members.add(self.player)
+        self.assertEqual(self.get(url)[0]['X-Cache'], 'MISS')
+        # Les autres tournois restent en cache
+        self.assertEqual(self.get(f'/api/tournaments/{other.id}/')[0]['X-Cache'], 'HIT')
+
+    def test_organizer_rename_invalidates(self):
+        url = f'/api/tournaments/{self.tournament.id}/'
+        self.get('/api/tournaments/')
+        self.get(url)
+
+        self.organizer.full_name = 'Organisatrice'
+        self.organizer.save()
+        self.assertEqual(self.get('/api/tournaments/')[0].json()['results'][0]['organizer_name'], 'Organisatrice')
+        self.assertEqual(self.get(url)[0].json()['organizer']['full_name'], 'Organisatrice')
+
+    def test_unknown_tournament_is_not_cached(self):
+        token = jwt.encode({'sub': 'player_1', 'exp': int(time.time()) + 300}, 'dev', algorithm='HS256')
+        response = self.client.get('/api/tournaments/00000000-0000-4000-8000-000000000000/',
+                                   HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('X-Cache', response)
+
+    @override_settings(TOURNAMENT_CACHE_ENABLED=False)
+    def test_disabled_without_shared_cache(self):
+        first = self.get('/api/tournaments/')[0]
+        self.assertNotIn('X-Cache', first)
+
+        Team.objects.create(name='B', tournament=self.tournament)
+        touch_tournaments(tournament_ids=[self.tournament.id])
+        second = self.get('/api/tournaments/')[0]
+        self.assertNotIn('X-Cache', second)
+        self.assertNotEqual(first['ETag'], second['ETag'])
+        self.assertEqual(second.json()['results'][0]['team_count'], 2)
+
+    def test_hit_ratio(self):
+        for _ in range(4):
+            self.get('/api/tournaments/')
+        stats = response_cache.stats()['tournaments-list']
+        self.assertEqual((stats['hits'], stats['misses']), (3, 1))
+        self.assertEqual(stats['hit_ratio'], 0.75)
+
+
+@override_settings(CLERK_JWKS_URL=None, SERVER_TIMING=True)
+class MonitoringTests(TestCase):
+    """Server-Timing et journal des requêtes lentes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        organizer = User.objects.create(
+            clerk_id='org_1', email='org@example.com', full_name='Org', role='organizer'
+        )
+        cls.tournament = Tournament.objects.create(name='Ligue', sport='Soccer', city='Laval',
+                                                   start_date='2025-12-01', organizer=organizer)
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, url):
+        token = jwt.encode({'sub': 'org_1', 'exp': int(time.time()) + 300}, 'dev', algorithm='HS256')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {token}')
+        return response, len(queries.captured_queries)
+
+    def test_server_timing(self):
+        response, queries = self.get(f'/api/tournaments/{self.tournament.id}/')
+        timing = dict(
+            (metric.split(';')[0], metric) for metric in response['Server-Timing'].split(', ')
+        )
+        self.assertEqual(set(timing), {'db', 'auth', 'app', 'total'})
+        self.assertIn(f'desc="{queries} SQL"', timing['db'])
+
+    @override_settings(SERVER_TIMING=False)
+    def test_server_timing_disabled(self):
+        response, _ = self.get('/api/tournaments/')
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(SLOW_QUERY_MS=0)
+    def test_slow_log(self):
+        with self.assertLogs('TeamSportFinder.slow', 'WARNING') as logs:
+            self.get(f'/api/tournaments/{self.tournament.id}/')
+        entry = json.loads(logs.records[0].getMessage())
+
+        self.assertEqual(entry['action'], 'TournamentViewSet.retrieve')
+        self.assertEqual(entry['status'], 200)
+        self.assertEqual(len(entry['slow_queries']), entry['queries'])
+        self.assertTrue(all('?' in query['sql'] for query in entry['slow_queries']))
+
+    def test_fast_requests_are_not_logged(self):
+        with self.assertNoLogs('TeamSportFinder.slow', 'WARNING'):
+            self.get('/api/tournaments/')
+
+    def test_normalize_sql(self):
+        self.assertEqual(
+            normalize_sql("SELECT * FROM t0\n WHERE id IN (%s, %s, %s) AND name = 'a''b' AND n > 3"),
+            'SELECT * FROM t0 WHERE id IN (?) AND name = ? AND n > ?',
+        )
+        self.assertEqual(normalize_sql('INSERT INTO t (a) VALUES (%s), (%s)'), 'INSERT INTO t (a) VALUES (?)')
+
+
+@override_settings(CLERK_JWKS_URL=None, METRICS_TOKEN='secret', METRICS_DIR=None, TOURNAMENT_CACHE_ENABLED=True)
+class MetricsTests(TestCase):
+    """Registre de métriques et GET /metrics"""
+
+    @classmethod
+    def setUpTestData(cls):
+        organizer = User.objects.create(
+            clerk_id='org_1', email='org@example.com', full_name='Org', role='organizer'
+        )
+        cls.tournament = Tournament.objects.create(name='Ligue', sport='Soccer', city='Laval',
+                                                   start_date='2025-12-01', organizer=organizer)
+
+    def setUp(self):
+        cache.clear()
+        response_cache.clear_stats()
+        registry.reset()
+
+    def get(self, url):
+        token = jwt.encode({'sub': 'org_1', 'exp': int(time.time()) + 300}, 'dev', algorithm='HS256')
+        return self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def scrape(self):
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        return response.content.decode().splitlines()
+
+    def test_requests_labeled_by_action(self):
+        self.get('/api/tournaments/')
+        self.get('/api/tournaments/')
+        self.get(f'/api/tournaments/{self.tournament.id}/standings/')
+        lines = self.scrape()
+
+        self.assertIn('http_requests_total{action="tournaments-list",method="GET",status="200"} 2', lines)
+        self.assertIn('http_requests_total{action="tournaments-standings",method="GET",status="200"} 1', lines)
+        self.assertIn('http_request_duration_seconds_count{action="tournaments-list"} 2', lines)
+        self.assertIn('http_request_duration_seconds_bucket{action="tournaments-list",le="+Inf"} 2', lines)
+        self.assertIn('response_cache_hits_total{endpoint="tournaments-list"} 1', lines)
+        self.assertTrue(any(line.startswith('http_response_bytes_total{action="tournaments-list"}') for line in lines))
+        self.assertTrue(any(line.startswith('clerk_token_cache_hits_total ') for line in lines))
+
+    def test_threads_are_summed(self):
+        def work():
+            for _ in range(1000):
+                REQUESTS.inc(action='test', method='GET', status=200)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(registry.snapshot()[('http_requests_total', ('test', 'GET', '200'))], 4000)
+
+    def test_finished_threads_are_folded(self):
+        for _ in range(20):
+            thread = threading.Thread(target=REQUESTS.inc, kwargs={'action': 'test', 'method': 'GET', 'status': 200})
+            thread.start()
+            thread.join()
+
+        self.assertLessEqual(len(registry._shards), 2)  # le dernier thread et celui du test
+        self.assertEqual(registry.snapshot()[('http_requests_total', ('test', 'GET', '200'))], 20)
+
+    def test_processes_are_summed(self):
+        with tempfile.TemporaryDirectory() as directory, override_settings(METRICS_DIR=directory):
+            # État écrit par un autre processus
+            with open(os.path.join(directory, '1.json'), 'w') as f:
+                json.dump([['http_requests_total', ['tournaments-list', 'GET', '200'], 5]], f)
+            self.get('/api/tournaments/')
+            lines = self.scrape()
+            self.assertTrue(os.path.exists(os.path.join(directory, f'{os.getpid()}.json')))
+
+        self.assertIn('http_requests_total{action="tournaments-list",method="GET",status="200"} 6', lines)
+
+    def test_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer other').status_code, 403)
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(METRICS_TOKEN=None)
+    def test_no_token_outside_debug(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        with override_settings(DEBUG=True):
+            self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+
+@override_settings(CLERK_JWKS_URL=None, PROFILING_ENABLED=True, METRICS_TOKEN='secret')
+class ProfilingTests(TestCase):
+    """X-Profile : profil de la requête enregistré et téléchargeable"""
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create(clerk_id='org_1', email='org@example.com', full_name='Org', role='organizer')
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        settings_override = override_settings(PROFILE_DIR=self.directory)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def get(self, url, **headers):
+        token = jwt.encode({'sub': 'org_1', 'exp': int(time.time()) + 300}, 'dev', algorithm='HS256')
+        headers.setdefault('HTTP_X_PROFILE_TOKEN', 'secret')
+        return self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {token}', **headers)
+
+    def test_cprofile(self):
+        response = self.get('/api/tournaments/', HTTP_X_PROFILE='1')
+        self.assertEqual(response.status_code, 200)
+        url = response['X-Profile-Url']
+        self.assertEqual(url, f"/profiles/{response['X-Profile-Id']}.prof")
+
+        stats = pstats.Stats(os.path.join(self.directory, url.split('/')[-1]))
+        self.assertTrue(any(name == 'resolve_clerk_principal' for _, _, name in stats.stats))
+
+        download = self.get(url)
+        self.assertEqual(download.status_code, 200)
+        self.assertIn('attachment', download['Content-Disposition'])
+
+    def test_sampler(self):
+        response = self.get('/api/tournaments/?profile=sample')
+        self.assertTrue(response['X-Profile-Url'].endswith('.collapsed'))
+        self.assertTrue(os.path.exists(os.path.join(self.directory, response['X-Profile-Url'].split('/')[-1])))
+
+    def test_not_requested(self):
+        self.assertNotIn('X-Profile-Id', self.get('/api/tournaments/'))
+
+    def test_token_required(self):
+        self.assertNotIn('X-Profile-Id', self.get('/api/tournaments/', HTTP_X_PROFILE='1', HTTP_X_PROFILE_TOKEN=''))
+        self.assertNotIn('X-Profile-Id', self.get('/api/tournaments/?profile=sample', HTTP_X_PROFILE_TOKEN='x'))
+
+        url = self.get('/api/tournaments/', HTTP_X_PROFILE='1')['X-Profile-Url']
+        self.assertEqual(self.get(url, HTTP_X_PROFILE_TOKEN='').status_code, 403)
+        self.assertEqual(self.client.get(url, HTTP_X_PROFILE_TOKEN='secret').status_code, 200)
+
+    @override_settings(METRICS_TOKEN=None)
+    def test_no_token_outside_debug(self):
+        self.assertNotIn('X-Profile-Id', self.get('/api/tournaments/', HTTP_X_PROFILE='1'))
+        self.assertEqual(self.get(f"/profiles/{'0' * 32}.prof").status_code, 403)
+
+    @override_settings(PROFILING_ENABLED=False)
+    def test_disabled(self):
+        self.assertNotIn('X-Profile-Id', self.get('/api/tournaments/', HTTP_X_PROFILE='1'))
+        self.assertEqual(self.get(f"/profiles/{'0' * 32}.prof").status_code, 404)
+
+    @override_settings(PROFILE_KEEP=2)
+    def test_old_profiles_are_removed(self):
+        for _ in range(4):
+            self.get('/api/tournaments/', HTTP_X_PROFILE='1')
+        self.assertEqual(len(os.listdir(self.directory)), 2)
+
+
+@skipIf(orjson is None, "orjson n'est pas installé : FastJSON utilise les classes de DRF")
+class FastJSONTests(SimpleTestCase):
+    """FastJSONRenderer / FastJSONParser : même JSON que DRF"""
+
+    def test_same_bytes_as_drf(self):
+        data = {
+            'results': [{'id': str(uuid.uuid4()), 'name': 'Équipe « A »', 'score': None, 'full': False,
+                         'distance_km': 1.25, 'tags': ['a', 'b']}],
+            'next': 'http://testserver/api/tournaments/?page=2',
+            'separator': 'a\u2028b',
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_native_types(self):
+        team_id = uuid.uuid4()
+        content = FastJSONRenderer().render({
+            'id': team_id,
+            'date': datetime(2026, 4, 4, 9, 0, 0, 123456, tzinfo=timezone.utc),
+            'price': Decimal('12.50'),
+        })
+        self.assertEqual(json.loads(content), {
+            'id': str(team_id), 'date': '2026-04-04T09:00:00.123456Z', 'price': 12.5,
+        })
+
+    def test_indent_uses_drf(self):
+        content = FastJSONRenderer().render({'a': 1}, 'application/json; indent=2')
+        self.assertEqual(content, b'{\n  "a": 1\n}')
+
+    def test_parser(self):
+        content = b'{"name": "\xc3\x89quipe", "ids": [1, 2]}'
+        self.assertEqual(FastJSONParser().parse(io.BytesIO(content)), JSONParser().parse(io.BytesIO(content)))
+        for invalid in (b'{"a": ', b'{"a": NaN}'):
+            with self.assertRaises(ParseError):
+                FastJSONParser().parse(io.BytesIO(invalid))
+
+
+@override_settings(CLERK_JWKS_URL=None)
+class ValuesRowsTests(TestCase):
+    """Plans values() des serializers de liste : même JSON que les serializers"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organizer = User.objects.create(
+            clerk_id='org_1', email='org@example.com', full_name='Org', role='organizer'
+        )
+        for city in ('Montréal', 'Atlantide'):
+            tournament = Tournament.objects.create(name=f'Ligue {city}', sport='Soccer', city=city,
+                                                   start_date='2025-12-01', organizer=cls.organizer)
+            team_a = Team.objects.create(name=f'A {city}', tournament=tournament, max_capacity=1)
+            team_b = Team.objects.create(name=f'B {city}', tournament=tournament)
+            player = User.objects.create(clerk_id=f'p_{city}', email=f'{city}@example.com',
+                                         full_name='Joueur', role='player')
+            add_player_to_team(team_a.id, player.id)
+            Match.objects.create(team_a=team_a, team_b=team_b, date='2026-03-01T18:00:00.250000Z',
+                                 location='Stade', score_a=2, score_b=1)
+            Match.objects.create(team_a=team_b, team_b=team_a, date='2026-03-08T18:00:00Z', location='Parc')
+
+    def assertSameOutput(self, serializer_class, queryset):
+        plan = row_plan(serializer_class)
+        renderer = JSONRenderer()
+        self.assertEqual(renderer.render(plan.serialize(plan.values(queryset), queryset)),
+                         renderer.render(serializer_class(queryset, many=True).data))
+
+    def test_same_output_as_serializers(self):
+        tournaments = annotate_tournament_counts(Tournament.objects.select_related('organizer')).order_by('name')
+        self.assertSameOutput(TournamentListSerializer, tournaments)
+        self.assertSameOutput(TeamListSerializer, Team.objects.select_related('tournament').order_by('name'))
+        near = filter_teams_near(Team.objects.all(), 45.5019, -73.5674, 50)
+        self.assertSameOutput(TeamListSerializer, near.order_by('distance_km', 'id'))
+        with django_timezone.override('America/Montreal'):
+            self.assertSameOutput(MatchListSerializer, Match.objects.order_by('date', 'id'))
+
+    def test_method_fields_must_be_described(self):
+        class Serializer(TournamentListSerializer):
+            values_fields = {}
+
+        with self.assertRaisesMessage(ValueError, 'organizer_name'):
+            RowPlan(Serializer)
+
+    def test_list_actions(self):
+        token = jwt.encode({'sub': 'org_1', 'exp': int(time.time()) + 300}, 'dev', algorithm='HS256')
+        response = self.client.get('/api/matches/my/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        expected = MatchListSerializer(Match.objects.order_by('date', 'id'), many=True).data
+        self.assertEqual(response.json()['results'], json.loads(JSONRenderer().render(expected)))
+
+        response = self.client.get('/api/tournaments/my/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(sorted((item['name'], item['team_count']) for item in response.json()),
+                         [('Ligue Atlantide', 2), ('Ligue Montréal', 2)])
+
+
+@override_settings(CLERK_JWKS_URL=None)
+class TeamSearchTests(TestCase):
+    """Recherche full-text + trigrammes, classée et paginée"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organizer = User.objects.create(
+            clerk_id='org_1', email='org@example.com', full_name='Org', role='organizer'
+        )
+        hockey = Tournament.objects.create(
+            name='Ligue de hockey', sport='Hockey', city='Montréal',
+            start_date='2025-12-01', organizer=cls.organizer,
+        )
+        soccer = Tournament.objects.create(
+            name='Coupe du printemps', sport='Soccer', city='Québec',
+            start_date='2025-12-01', organizer=cls.organizer,
+        )
+        cls.tigres = Team.objects.create(name='Les Tigres', tournament=hockey)
+        cls.castors = Team.objects.create(name='Castors de Montréal', tournament=soccer)
+        cls.hiboux = Team.objects.create(name='Hiboux', tournament=soccer)
+
+    def search(self, term):
+        token = jwt.encode({'sub': 'org_1', 'exp': int(time.time()) + 300}, 'dev', algorithm='HS256')
+        response = self.client.get('/api/teams/search/', {'search': term}, HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(response.status_code, 200)
+        return [item['name'] for item in response.json()['results']]
+
+    def test_matches_tournament_fields_without_accents(self):
+        self.assertCountEqual(self.search('quebec'), ['Castors de Montréal', 'Hiboux'])
+        self.assertEqual(self.search('hockey'), ['Les Tigres'])
+
+    def test_team_name_ranks_first(self):
+        self.assertEqual(self.search('montreal'), ['Castors de Montréal', 'Les Tigres'])
+
+    def test_typo_tolerance(self):
+        self.assertEqual(self.search('tigrs'), ['Les Tigres'])
+        self.assertEqual(self.search('hokey'), ['Les Tigres'])
+
+    def test_index_follows_renames(self):
+        self.hiboux.name = 'Faucons'
+        self.hiboux.save()
+        tournament = self.tigres.tournament
+        tournament.city = 'Sherbrooke'
+        tournament.save()
+
+        self.assertEqual(self.search('faucons'), ['Faucons'])
+        self.assertEqual(self.search('sherbrooke'), ['Les Tigres'])
+
+
+@override_settings(CLERK_JWKS_URL=None)
+class TeamsNearTests(TestCase):
+    """Recherche par rayon : gazetteer, boîte englobante et haversine"""
+
+    @classmethod
+    def setUpTestData(cls):
+        organizer = User.objects.create(
+            clerk_id='org_1', email='org@example.com', full_name='Org', role='organizer'
+        )
+        for name, city in [('Centre', 'Montréal'), ('Nord', 'Laval'), ('Loin', 'Québec'), ('Nulle part', 'Atlantide')]:
+            tournament = Tournament.objects.create(
+                name=f'Ligue {name}', sport='Soccer', city=city,
+                start_date='2025-12-01', organizer=organizer,
+            )
+            Team.objects.create(name=name, tournament=tournament)
+
+    def near(self, params):
+        token = jwt.encode({'sub': 'org_1', 'exp': int(time.time()) + 300}, 'dev', algorithm='HS256')
+        return self.client.get('/api/teams/search/', params, HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_gazetteer_lookup(self):
+        self.assertEqual(normalize_city('ST-JÉRÔME'), 'saint jerome')
+        self.assertEqual(lookup_city('St-Jérôme'), lookup_city('Saint-Jérôme'))
+        self.assertIsNone(lookup_city('Atlantide'))
+        self.assertAlmostEqual(haversine_km(*lookup_city('Montréal'), *lookup_city('Québec')), 233, delta=5)
+
+    def test_tournaments_are_geocoded(self):
+        tournament = Tournament.objects.get(city='Laval')
+        self.assertEqual((tournament.latitude, tournament.longitude), lookup_city('Laval'))
+        self.assertIsNone(Tournament.objects.get(city='Atlantide').latitude)
+
+    def test_unknown_city_clears_coordinates(self):
+        tournament = Tournament.objects.get(city='Laval')
+        tournament.city = 'Atlantide'
+        tournament.save()
+        tournament.refresh_from_db()
+        self.assertEqual((tournament.latitude, tournament.longitude), (None, None))
+
+    def test_every_team_in_radius_is_counted(self):
+        organizer = User.objects.get(clerk_id='org_1')
+        latitude, longitude = lookup_city('Montréal')
+        tournaments = Tournament.objects.bulk_create(
+            Tournament(name=f'Ligue {i}', sport='Soccer', city='Montréal', start_date='2025-12-01',
+                       organizer=organizer, latitude=latitude, longitude=longitude)
+            for i in range(250)
+        )
+        Team.objects.bulk_create(Team(name=f'Équipe {i}', tournament=t) for i, t in enumerate(tournaments))
+
+        response = self.near({'near': '45.5019,-73.5674', 'radius_km': 5})
+        self.assertEqual(response.json()['count'], 251)
+
+    def test_sorted_by_distance(self):
+        response = self.near({'near': '45.5019,-73.5674', 'radius_km': 50})
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual([team['name'] for team in results], ['Centre', 'Nord'])
+        self.assertLess(results[0]['distance_km'], results[1]['distance_km'])
+
+    def test_radius_excludes_far_teams(self):
+        response = self.near({'near': '45.5019,-73.5674', 'radius_km': 5})
+        self.assertEqual([team['name'] for team in response.json()['results']], ['Centre'])
+
+    def test_invalid_parameters(self):
+        for params in [{'near': 'montreal'}, {'near': '95,0'}, {'near': '45.5,-73.5', 'radius_km': 0}]:
+            response = self.near(params)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('near', response.json())
+
+
+class SyntheticDataGeneratorTests(TestCase):
+    """Le générateur crée des données cohérentes et reproductibles"""
+
+    def generate(self, prefix, seed=7):
+        generator = SyntheticDataGenerator(
+            users=60, tournaments=3, teams_per=4, matches_per=6, requests_per=2,
+            seed=seed, batch_size=10, prefix=prefix,
+        )
+        return generator, generator.run()
+
+    def test_counts_and_capacities(self):
+        generator, summary = self.generate('gen')
+
+        self.assertEqual(summary['users'], 60)
+        self.assertEqual(Tournament.objects.count(), 3)
+        self.assertEqual(Team.objects.count(), 12)
+        self.assertEqual(summary['matches'], 18)
+        for team in Team.objects.all():
+            self.assertEqual(team.members.count(), team.current_capacity)
+            self.assertLessEqual(team.current_capacity, team.max_capacity)
+
+    def test_same_seed_same_data(self):
+        first, _ = self.generate('gen')
+        snapshot = list(Team.objects.order_by('id').values_list('id', 'current_capacity', 'max_capacity'))
+        User.objects.all().delete()
+
+        second, _ = self.generate('gen')
+        self.assertEqual(first.team_ids, second.team_ids)
+        self.assertEqual(
+            list(Team.objects.order_by('id').values_list('id', 'current_capacity', 'max_capacity')),
+            snapshot,
+        )
+
+
+class TournamentQueryBudgetTests(QueryBudgetTestCase):
+    """Budgets de requêtes SQL des actions de TournamentViewSet et TeamViewSet"""
+
+    def test_tournaments_list(self):
+        self.assertQueryBudget('tournaments-list', 'get', '/api/tournaments/', self.player, budget=4)
+
+    @override_settings(TOURNAMENT_CACHE_ENABLED=True)
+    def test_tournaments_list_shared_cache(self):
+        # Version lue dans le cache : pas d'agrégat pour l'ETag
+        self.assertQueryBudget('tournaments-list (miss)', 'get', '/api/tournaments/', self.player, budget=3)
+
+    @override_settings(TOURNAMENT_CACHE_ENABLED=True)
+    def test_tournaments_list_not_modified(self):
+        etag = self.request('get', '/api/tournaments/', self.player)[0]['ETag']
+        self.assertQueryBudget('tournaments-list (304)', 'get', '/api/tournaments/', self.player, budget=1,
+                               status=304, headers={'HTTP_IF_NONE_MATCH': etag})
+
+    @override_settings(TOURNAMENT_CACHE_ENABLED=True)
+    def test_tournaments_list_cached(self):
+        self.request('get', '/api/tournaments/', self.organizer)
+        response = self.assertQueryBudget('tournaments-list (cache)', 'get', '/api/tournaments/', self.player,
+                                          budget=1)
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_tournaments_retrieve(self):
+        url = f'/api/tournaments/{self.tournament.id}/'
+        self.assertQueryBudget('tournaments-detail', 'get', url, self.player, budget=2)
+
+    @override_settings(TOURNAMENT_CACHE_ENABLED=True)
+    def test_tournaments_retrieve_cached(self):
+        url = f'/api/tournaments/{self.tournament.id}/'
+        self.request('get', url, self.organizer)
+        response = self.assertQueryBudget('tournaments-detail (cache)', 'get', url, self.player, budget=1)
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_tournaments_my(self):
+        self.assertQueryBudget('tournaments-my', 'get', '/api/tournaments/my/', self.organizer, budget=2)
+
+    def test_tournaments_teams(self):
+        url = f'/api/tournaments/{self.tournament.id}/teams/'
+        self.assertQueryBudget('tournaments-teams', 'get', url, self.player, budget=7)
+
+    def test_tournaments_standings(self):
+        url = f'/api/tournaments/{self.tournament.id}/standings/'
+        response = self.assertQueryBudget('tournaments-standings', 'get', url, self.player, budget=2)
+        self.assertTrue(response.json())
+
+    def test_tournaments_generate_schedule(self):
+        url = f'/api/tournaments/{self.tournament.id}/generate-schedule/'
+        data = {'start': '2026-04-04T09:00:00Z', 'replace': True}
+        self.assertQueryBudget('tournaments-generate-schedule', 'post', url, self.organizer,
+                               budget=9, data=data, status=201)
+
+    def test_tournaments_create(self):
+        data = {'name': 'Coupe', 'sport': 'Soccer', 'city': 'Laval', 'start_date': '2026-01-01'}
+        self.assertQueryBudget('tournaments-create', 'post', '/api/tournaments/', self.organizer,
+                               budget=2, data=data, status=201)
+
+    def test_tournaments_update(self):
+        url = f'/api/tournaments/{self.tournament.id}/'
+        data = {'name': 'Coupe', 'sport': 'Soccer', 'city': 'Laval', 'start_date': '2026-01-01'}
+        self.assertQueryBudget('tournaments-update', 'put', url, self.organizer, budget=4, data=data)
+
+    def test_tournaments_partial_update(self):
+        url = f'/api/tournaments/{self.tournament.id}/'
+        self.assertQueryBudget('tournaments-partial-update', 'patch', url, self.organizer,
+                               budget=4, data={'city': 'Laval'})
+
+    def test_tournaments_destroy(self):
+        url = f'/api/tournaments/{self.tournament.id}/'
+        self.assertQueryBudget('tournaments-destroy', 'delete', url, self.organizer, budget=12, status=204)
+
+    def test_teams_list(self):
+        self.assertQueryBudget('teams-list', 'get', '/api/teams/', self.player, budget=4)
+
+    def test_teams_retrieve(self):
+        url = f'/api/teams/{self.team.id}/'
+        self.assertQueryBudget('teams-detail', 'get', url, self.player, budget=4)
+
+    def test_teams_retrieve_not_modified(self):
+        url = f'/api/teams/{self.team.id}/'
+        etag = self.request('get', url, self.player)[0]['ETag']
+        self.assertQueryBudget('teams-detail (304)', 'get', url, self.player, budget=2,
+                               status=304, headers={'HTTP_IF_NONE_MATCH': etag})
+
+    def test_teams_search(self):
+        url = f'/api/teams/search/?tournament_id={self.tournament.id}'
+        self.assertQueryBudget('teams-search', 'get', url, self.player, budget=4)
+
+    def test_teams_search_term(self):
+        url = f'/api/teams/search/?search={self.tournament.sport}+{self.tournament.city}'
+        self.assertQueryBudget('teams-search (texte)', 'get', url, self.player, budget=5)
+
+    def test_teams_search_near(self):
+        url = f'/api/teams/search/?near={self.tournament.latitude},{self.tournament.longitude}&radius_km=10'
+        self.assertQueryBudget('teams-search (rayon)', 'get', url, self.player, budget=4)
+
+    def test_teams_members(self):
+        url = f'/api/teams/{self.team.id}/members/'
+        self.assertQueryBudget('teams-members', 'get', url, self.player, budget=3)
+
+    # Les modifications d'équipe recalculent ses lignes de recommandation après le commit (+8 requêtes)
+    def test_teams_create(self):
+        data = {'name': 'Nouvelle', 'tournament_id': str(self.tournament.id), 'max_capacity': 12}
+        self.assertQueryBudget('teams-create', 'post', '/api/teams/', self.organizer,
+                               budget=7, data=data, status=201)
+
+    def test_teams_update(self):
+        url = f'/api/teams/{self.team.id}/'
+        self.assertQueryBudget('teams-update', 'put', url, self.organizer, budget=14,
+                               data={'name': 'Renommée', 'max_capacity': 12})
+
+    def test_teams_partial_update(self):
+        url = f'/api/teams/{self.team.id}/'
+        self.assertQueryBudget('teams-partial-update', 'patch', url, self.organizer, budget=14,
+                               data={'max_capacity': 12})
+
+    def test_teams_destroy(self):
+        url = f'/api/teams/{self.team.id}/'
+        self.assertQueryBudget('teams-destroy', 'delete', url, self.organizer, budget=10, status=204)
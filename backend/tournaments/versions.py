@@ -0,0 +1,55 @@
+"""
+Versions des tournois et des équipes (updated_at) pour les GET conditionnels
+
+updated_at (auto_now) change à chaque save(). Les écritures qui passent par
+des UPDATE ensemblistes ou qui changent ce qu'affiche un autre objet doivent
+mettre la version à jour elles-mêmes :
+    - une équipe créée, modifiée ou supprimée change la liste des tournois
+      (team_count, total_players) : touch_tournaments(tournament_ids=[...])
+    - une adhésion acceptée change l'équipe (membres, current_capacity) et
+      son tournoi : updated_at=now dans l'UPDATE de l'équipe, puis
+      touch_tournaments(team_ids=[...])
+    - un organisateur renommé change la liste et le détail de ses tournois :
+      touch_tournaments(organizer_id=...)
+
+touch_tournaments() avance aussi les générations du cache des réponses
+(tournaments/cache.py) des tournois touchés.
+"""
+from django.db import connection
+from django.utils import timezone
+
+from tournaments.cache import bump_tournaments
+from tournaments.models import Team, Tournament
+
+
+def touch_tournaments(tournament_ids=None, team_ids=None, organizer_id=None, now=None):
+    """
+    Avance la version des tournois donnés, des tournois des équipes données
+    ou de ceux d'un organisateur (une requête)
+
+    Returns:
+        int: Le nombre de tournois mis à jour
+    """
+    conditions, params = [], [now or timezone.now()]
+    if tournament_ids is not None:
+        conditions.append('id = ANY(%s::uuid[])')
+        params.append(list(tournament_ids))
+    if team_ids is not None:
+        conditions.append(f'id IN (SELECT tournament_id FROM {Team._meta.db_table} WHERE id = ANY(%s::uuid[]))')
+        params.append(list(team_ids))
+    if organizer_id is not None:
+        conditions.append('organizer_id = %s')
+        params.append(organizer_id)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+    # RETURNING : les tournois touchés, pour le cache, sans requête de plus
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE {Tournament._meta.db_table} SET updated_at = %s {where} RETURNING id',
+            params,
+        )
+        touched = [row[0] for row in cursor.fetchall()]
+
+    if touched or not conditions:
+        bump_tournaments(touched if conditions else None)
+    return len(touched)
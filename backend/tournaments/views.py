@@ -1,10 +1,17 @@
-from django.db import models as django_models
+import uuid
+
+from django.db import models as django_models, transaction
+from django.db.models import Count, Max, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
-from rest_framework.exceptions import PermissionDenied, NotFound
+from rest_framework.exceptions import PermissionDenied, NotFound, ValidationError
 
 from tournaments.models import Tournament, Team
+from tournaments.geo import filter_teams_near, parse_near
+from tournaments.search import search_teams
 from tournaments.serializers import (
     TournamentSerializer,
     TournamentCreateSerializer,
@@ -14,19 +21,83 @@ from tournaments.serializers import (
     TeamListSerializer,
     TeamUpdateSerializer
 )
+from TeamSportFinder.conditional import conditional_get
+from TeamSportFinder.rows import ValuesRowsMixin
+from tournaments.cache import DETAILS, LIST, cached_response, response_cache, view_generations
+from tournaments.versions import touch_tournaments
 from accounts.permissions import IsOrganizer, IsPlayerOrOrganizer
 from accounts.serializers import UserSerializer
+from matches.models import Match, Standing
+from matches.conflicts import lock_tournament
+from matches.scheduling import ScheduleError, generate_schedule
+from matches.serializers import ScheduleGenerateSerializer, StandingSerializer
+from matches.standings import RANKING_ORDER, rebuild_standings
+
+
+def annotate_tournament_counts(queryset):
+    """
+    Ajoute team_count et total_players calculés par la base de données
+    (une seule requête pour toute la liste au lieu d'une par tournoi)
+
+    Sous-requêtes corrélées plutôt que GROUP BY : une page triée par
+    created_at ne compte que ses propres tournois (index tournament_created_idx)
+    et le COUNT de la pagination ne calcule pas les agrégats.
+    """
+    teams = Team.objects.filter(tournament=OuterRef('pk')).order_by().values('tournament')
+    return queryset.annotate(
+        team_count=Coalesce(Subquery(teams.annotate(count=Count('id')).values('count')), 0),
+        total_players=Coalesce(Subquery(teams.annotate(total=Sum('current_capacity')).values('total')), 0),
+    )
 
 
-class TournamentViewSet(viewsets.ModelViewSet):
+def tournament_list_scopes(view, request, *args, **kwargs):
+    """La liste dépend de tous les tournois"""
+    return [LIST]
+
+
+def tournament_scopes(view, request, *args, **kwargs):
+    """Le détail dépend du tournoi et des organisateurs ; None pour un id invalide (404)"""
+    try:
+        return [DETAILS, str(uuid.UUID(str(kwargs.get('pk'))))]
+    except ValueError:
+        return None
+
+
+def tournament_list_version(view, request, *args, **kwargs):
+    """
+    Version de la liste des tournois : sa génération, lue dans le cache (aucune
+    requête SQL), ou sans cache partagé la dernière modification et le nombre
+    de tournois
+    """
+    if response_cache.enabled():
+        return view_generations(view, tournament_list_scopes(view, request)), None
+    stamp = Tournament.objects.aggregate(modified=Max('updated_at'), count=Count('id'))
+    return (stamp['modified'], stamp['count']), stamp['modified']
+
+
+def team_version(view, request, *args, **kwargs):
+    """Version d'une équipe : l'équipe (membres compris) et son tournoi"""
+    try:
+        team_id = uuid.UUID(str(kwargs.get('pk')))
+    except ValueError:
+        return None, None
+    stamp = Team.objects.filter(id=team_id).values_list('updated_at', 'tournament__updated_at').first()
+    if stamp is None:
+        return None, None
+    return stamp, max(stamp)
+
+
+class TournamentViewSet(ValuesRowsMixin, viewsets.ModelViewSet):
     """
     ViewSet pour gérer les tournois
     
     Endpoints:
-    - GET /api/tournaments/ : Lister tous les tournois (joueurs et organisateurs)
-    - GET /api/tournaments/{id}/ : Détails d'un tournoi
+    - GET /api/tournaments/ : Lister tous les tournois (joueurs et organisateurs, ETag, cache)
+    - GET /api/tournaments/{id}/ : Détails d'un tournoi (cache)
     - GET /api/tournaments/my/ : Mes tournois (organisateur uniquement)
     - GET /api/tournaments/{id}/teams/ : Équipes d'un tournoi
+    - GET /api/tournaments/{id}/standings/ : Classement d'un tournoi
+    - POST /api/tournaments/{id}/generate-schedule/ : Générer le calendrier (organisateur propriétaire uniquement)
     - POST /api/tournaments/ : Créer un tournoi (organisateur uniquement)
     - PUT /api/tournaments/{id}/ : Modifier un tournoi (organisateur propriétaire uniquement)
     - PATCH /api/tournaments/{id}/ : Modifier partiellement (organisateur propriétaire uniquement)
@@ -34,6 +105,8 @@ class TournamentViewSet(viewsets.ModelViewSet):
     """
     queryset = Tournament.objects.all()
     permission_classes = [permissions.IsAuthenticated]
+    # Listes construites depuis values() (TeamSportFinder/rows.py)
+    values_row_actions = ('list', 'my')
 
     def get_serializer_class(self):
         """Retourne le serializer approprié selon l'action"""
@@ -63,9 +136,23 @@ class TournamentViewSet(viewsets.ModelViewSet):
         """Retourne les tournois selon le contexte"""
         # Pour l'action 'my', on filtre par organisateur
         if self.action == 'my':
-            return Tournament.objects.filter(organizer=self.request.user)
+            queryset = Tournament.objects.filter(organizer=self.request.user)
         # Sinon, retourner tous les tournois
-        return Tournament.objects.all().select_related('organizer').prefetch_related('teams')
+        else:
+            queryset = Tournament.objects.all()
+        # Ordre stable pour la pagination (et les pages en cache)
+        return annotate_tournament_counts(queryset.select_related('organizer')).order_by('-created_at', 'id')
+
+    @conditional_get(tournament_list_version)
+    @cached_response('tournaments-list', tournament_list_scopes)
+    def list(self, request, *args, **kwargs):
+        """Liste paginée ; 304 si la liste n'a pas changé depuis l'ETag du client"""
+        return super().list(request, *args, **kwargs)
+
+    @cached_response('tournaments-detail', tournament_scopes)
+    def retrieve(self, request, *args, **kwargs):
+        """Détail d'un tournoi (cache partagé, ETag)"""
+        return super().retrieve(request, *args, **kwargs)
 
     def perform_create(self, serializer):
         """Crée un tournoi avec l'organisateur connecté"""
@@ -141,14 +228,88 @@ class TournamentViewSet(viewsets.ModelViewSet):
         serializer = TeamSerializer(teams, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=['get'], url_path='standings', permission_classes=[permissions.IsAuthenticated, IsPlayerOrOrganizer])
+    def standings(self, request, pk=None):
+        """
+        GET /api/tournaments/{id}/standings/
+        Classement du tournoi : une lecture dans l'ordre de l'index standing_ranking_idx
+        (points, différence de buts, buts marqués)
+        """
+        try:
+            tournament_id = uuid.UUID(str(pk))
+        except ValueError:
+            raise NotFound("Tournoi introuvable.")
+
+        standings = list(
+            Standing.objects.filter(tournament_id=tournament_id)
+            .select_related('team')
+            .order_by(*RANKING_ORDER)
+        )
+        # Aucune ligne : tournoi sans équipe ou inexistant
+        if not standings and not Tournament.objects.filter(id=tournament_id).exists():
+            raise NotFound("Tournoi introuvable.")
+
+        for rank, standing in enumerate(standings, start=1):
+            standing.rank = rank
+        serializer = StandingSerializer(standings, many=True)
+        return Response(serializer.data)
+
+    @action(detail=True, methods=['post'], url_path='generate-schedule', permission_classes=[permissions.IsAuthenticated, IsOrganizer])
+    def generate_schedule(self, request, pk=None):
+        """
+        POST /api/tournaments/{id}/generate-schedule/
+        Crée tous les matchs du tournoi (championnat ou élimination directe) en un bulk_create
+        - Les équipes sont têtes de série dans leur ordre de création
+        - replace=true supprime d'abord les matchs existants du tournoi
+        """
+        tournament = get_object_or_404(Tournament.objects.only('id', 'organizer_id'), pk=pk)
+
+        # Vérifier que l'utilisateur est l'organisateur du tournoi
+        if tournament.organizer_id != request.user.id:
+            raise PermissionDenied("Vous n'êtes pas autorisé à modifier ce tournoi.")
+
+        serializer = ScheduleGenerateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        options = serializer.validated_data
+
+        with transaction.atomic():
+            # Deux générations simultanées (double clic, nouvel essai) passent l'une après l'autre
+            lock_tournament(tournament.id)
+            team_ids = list(
+                Team.objects.filter(tournament_id=tournament.id).order_by('created_at', 'id')
+                .values_list('id', flat=True)
+            )
+            if options['replace']:
+                deleted, _ = Match.objects.filter(tournament_id=tournament.id).delete()
+                if deleted:
+                    rebuild_standings(tournament_id=tournament.id)
+            elif Match.objects.filter(tournament_id=tournament.id).exists():
+                return Response(
+                    {"error": "Ce tournoi a déjà des matchs (replace=true pour les remplacer)."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            try:
+                summary = generate_schedule(
+                    tournament, team_ids, options['format'], options['start'], options['locations'],
+                    match_duration_minutes=options['match_duration_minutes'],
+                    days_between_rounds=options['days_between_rounds'],
+                    legs=options['legs'],
+                )
+            except ScheduleError as e:
+                transaction.set_rollback(True)
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(summary, status=status.HTTP_201_CREATED)
 
-class TeamViewSet(viewsets.ModelViewSet):
+
+class TeamViewSet(ValuesRowsMixin, viewsets.ModelViewSet):
     """
     ViewSet pour gérer les équipes
     
     Endpoints:
     - GET /api/teams/ : Lister toutes les équipes (avec filtres)
-    - GET /api/teams/{id}/ : Détails d'une équipe
+    - GET /api/teams/{id}/ : Détails d'une équipe (ETag / Last-Modified)
     - GET /api/teams/search/ : Rechercher des équipes disponibles (joueurs)
     - GET /api/teams/{id}/members/ : Membres d'une équipe
     - POST /api/teams/ : Créer une équipe (organisateur uniquement)
@@ -158,6 +319,8 @@ class TeamViewSet(viewsets.ModelViewSet):
     """
     queryset = Team.objects.all()
     permission_classes = [permissions.IsAuthenticated]
+    # Listes construites depuis values() (TeamSportFinder/rows.py)
+    values_row_actions = ('list', 'search')
 
     def get_serializer_class(self):
         """Retourne le serializer approprié selon l'action"""
@@ -196,17 +359,32 @@ class TeamViewSet(viewsets.ModelViewSet):
                 pass  # Ignorer si l'UUID est invalide
         
         # Filtre par disponibilité (query param: ?available=true)
-        available = self.request.query_params.get('available', None)
+        # La recherche ne montre par défaut que les équipes non pleines
+        available = self.request.query_params.get('available', 'true' if self.action == 'search' else None)
         if available == 'true':
             queryset = queryset.filter(current_capacity__lt=django_models.F('max_capacity'))
         
-        # Filtre par recherche de nom (query param: ?search=...)
+        # Équipes dont le tournoi est dans un rayon (query params: ?near=lat,lng&radius_km=...)
+        near = self.request.query_params.get('near', None)
+        if near:
+            try:
+                latitude, longitude, radius_km = parse_near(near, self.request.query_params.get('radius_km', 25))
+            except ValueError as e:
+                raise ValidationError({'near': str(e)})
+            queryset = filter_teams_near(queryset, latitude, longitude, radius_km)
+
+        # Recherche classée et tolérante aux fautes (query param: ?search=...)
         search = self.request.query_params.get('search', None)
         if search:
-            queryset = queryset.filter(name__icontains=search)
+            queryset = search_teams(queryset, search)
         
         return queryset
 
+    @conditional_get(team_version, last_modified=True)
+    def retrieve(self, request, *args, **kwargs):
+        """Détails d'une équipe ; 304 si ni l'équipe ni son tournoi n'ont changé"""
+        return super().retrieve(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         """Crée une équipe avec validation"""
         # La validation du tournoi et de l'organisateur est faite dans le serializer
@@ -255,23 +433,28 @@ class TeamViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("Vous n'êtes pas autorisé à supprimer cette équipe.")
         
         team.delete()
+        touch_tournaments(tournament_ids=[team.tournament_id])
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(detail=False, methods=['get'], url_path='search', permission_classes=[permissions.IsAuthenticated, IsPlayerOrOrganizer])
     def search(self, request):
         """
-        GET /api/teams/search/?tournament_id=...&available=true&search=...
+        GET /api/teams/search/?tournament_id=...&available=true&search=...&near=lat,lng&radius_km=...
         Recherche des équipes disponibles pour les joueurs
+        - Résultats paginés, triés par pertinence si ?search= est fourni,
+          sinon par distance si ?near= est fourni (radius_km: 25 par défaut)
         """
         queryset = self.get_queryset()
-        
-        # Par défaut, ne montrer que les équipes non pleines pour la recherche
-        available = request.query_params.get('available', 'true')
-        if available == 'true':
-            queryset = queryset.filter(current_capacity__lt=django_models.F('max_capacity'))
-        
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+
+        if not request.query_params.get('search'):
+            if request.query_params.get('near'):
+                queryset = queryset.order_by('distance_km', 'id')
+            else:
+                queryset = queryset.order_by('-created_at', 'id')
+
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @action(detail=True, methods=['get'], url_path='members', permission_classes=[permissions.IsAuthenticated, IsPlayerOrOrganizer])
     def members(self, request, pk=None):